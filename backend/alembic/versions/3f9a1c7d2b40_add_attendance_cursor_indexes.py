@@ -0,0 +1,38 @@
+"""add attendance cursor indexes
+
+Revision ID: 3f9a1c7d2b40
+Revises: 7ed7827fa89e
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+"""Composite indexes for cursor polling of event rosters and check-in history"""
+
+revision = "3f9a1c7d2b40"
+down_revision = "7ed7827fa89e"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+
+def upgrade():
+    # Built concurrently so a large attendances table stays writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_attendances_event_checked_in",
+            "attendances",
+            ["event_id", "checked_in_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_attendances_attendee_checked_in",
+            "attendances",
+            ["attendee_id", "checked_in_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_attendances_attendee_checked_in", table_name="attendances", postgresql_concurrently=True)
+        op.drop_index("ix_attendances_event_checked_in", table_name="attendances", postgresql_concurrently=True)
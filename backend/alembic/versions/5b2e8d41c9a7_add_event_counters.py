@@ -0,0 +1,33 @@
+"""add event counters
+
+Revision ID: 5b2e8d41c9a7
+Revises: 3f9a1c7d2b40
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+"""Denormalized attendance_count / member_count on events, backfilled from the source tables"""
+
+revision = "5b2e8d41c9a7"
+down_revision = "3f9a1c7d2b40"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column("events", sa.Column("attendance_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("events", sa.Column("member_count", sa.Integer(), nullable=False, server_default="0"))
+    op.execute(
+        """
+        UPDATE events SET
+            attendance_count = (SELECT count(*) FROM attendances WHERE attendances.event_id = events.id),
+            member_count = (SELECT count(*) FROM event_members WHERE event_members.event_id = events.id)
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("events", "member_count")
+    op.drop_column("events", "attendance_count")
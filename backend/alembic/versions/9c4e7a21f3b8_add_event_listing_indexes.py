@@ -0,0 +1,38 @@
+"""add event listing indexes
+
+Revision ID: 9c4e7a21f3b8
+Revises: 5b2e8d41c9a7
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+"""Composite indexes for keyset pagination of the admin event listing"""
+
+revision = "9c4e7a21f3b8"
+down_revision = "5b2e8d41c9a7"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+
+def upgrade():
+    # Built concurrently so events stays writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_events_start_time_id",
+            "events",
+            ["start_time", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_events_organizer_start_time",
+            "events",
+            ["organizer_id", "start_time", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_events_organizer_start_time", table_name="events", postgresql_concurrently=True)
+        op.drop_index("ix_events_start_time_id", table_name="events", postgresql_concurrently=True)
@@ -0,0 +1,44 @@
+"""add event soft delete
+
+Revision ID: a4d8e1c6b357
+Revises: f2a9c4d7b913
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+"""Background series deletes: events.deleted_at, and events.parent_id ->
+events.id ON DELETE CASCADE so a parent's sessions go with it.
+
+Sessions orphaned by earlier deletes are marked deleted, and the worker purges
+them on startup. The constraint is added NOT VALID, so those rows are not
+checked and the table is not scanned; every new or updated row is.
+"""
+
+revision = "a4d8e1c6b357"
+down_revision = "f2a9c4d7b913"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column("events", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE events SET deleted_at = now() "
+        "WHERE parent_id IS NOT NULL AND parent_id NOT IN (SELECT id FROM events)"
+    )
+    op.create_foreign_key(
+        "events_parent_id_fkey",
+        "events",
+        "events",
+        ["parent_id"],
+        ["id"],
+        ondelete="CASCADE",
+        postgresql_not_valid=True,
+    )
+
+
+def downgrade():
+    op.drop_constraint("events_parent_id_fkey", "events", type_="foreignkey")
+    op.drop_column("events", "deleted_at")
@@ -0,0 +1,48 @@
+"""cascade attendance event fk
+
+Revision ID: b8d3f5a2c614
+Revises: a4d8e1c6b357
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+"""Recreate attendances.event_id -> events.id with ON DELETE CASCADE.
+
+The initial schema created the constraint without an ON DELETE action, so the
+background event delete could fail on an attendance written after its chunk
+ran. The new constraint is added NOT VALID and validated separately, so
+check-ins are not blocked while existing rows are checked.
+"""
+
+revision = "b8d3f5a2c614"
+down_revision = "a4d8e1c6b357"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.drop_constraint("attendances_event_id_fkey", "attendances", type_="foreignkey")
+    op.create_foreign_key(
+        "attendances_event_id_fkey",
+        "attendances",
+        "events",
+        ["event_id"],
+        ["id"],
+        ondelete="CASCADE",
+        postgresql_not_valid=True,
+    )
+    op.execute("ALTER TABLE attendances VALIDATE CONSTRAINT attendances_event_id_fkey")
+
+
+def downgrade():
+    op.drop_constraint("attendances_event_id_fkey", "attendances", type_="foreignkey")
+    op.create_foreign_key(
+        "attendances_event_id_fkey",
+        "attendances",
+        "events",
+        ["event_id"],
+        ["id"],
+        ondelete=None,
+    )
@@ -0,0 +1,37 @@
+"""add lazy recurrence
+
+Revision ID: d6f1b3a8e270
+Revises: 9c4e7a21f3b8
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+"""Rule-only recurring series: lazy_sessions flag, the rule's timezone, and a
+unique (parent_id, start_time) index so sessions materialize idempotently"""
+
+revision = "d6f1b3a8e270"
+down_revision = "9c4e7a21f3b8"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column("events", sa.Column("lazy_sessions", sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column("events", sa.Column("recurrence_timezone", sa.String(length=64), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_events_parent_start_time",
+            "events",
+            ["parent_id", "start_time"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("uq_events_parent_start_time", table_name="events", postgresql_concurrently=True)
+    op.drop_column("events", "recurrence_timezone")
+    op.drop_column("events", "lazy_sessions")
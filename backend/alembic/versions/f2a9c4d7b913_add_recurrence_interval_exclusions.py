@@ -0,0 +1,26 @@
+"""add recurrence interval and exclusions
+
+Revision ID: f2a9c4d7b913
+Revises: d6f1b3a8e270
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+"""Every-n-weeks series and excluded dates/ranges stored on the series parent"""
+
+revision = "f2a9c4d7b913"
+down_revision = "d6f1b3a8e270"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column("events", sa.Column("recurrence_interval", sa.Integer(), nullable=False, server_default="1"))
+    op.add_column("events", sa.Column("recurrence_exclusions", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("events", "recurrence_exclusions")
+    op.drop_column("events", "recurrence_interval")
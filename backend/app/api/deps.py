@@ -2,11 +2,18 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.principal import Principal
 from app.db.session import SessionLocal
 from app.repositories.user_repo import UserRepository
+from app.repositories.loaders import Loaders
+from app.services.profile_writer import profile_writer
 import jwt
 import requests
-import json
+import dataclasses
+import hashlib
+import threading
+import time
 from jwt.algorithms import RSAAlgorithm
 from typing import Callable
 from app.models.user import User, UserRole
@@ -23,45 +30,139 @@ def get_db():
         db.close()
 
 
+def get_loaders(db: Session = Depends(get_db)) -> Loaders:
+    """Batch loaders sharing the request's session; memoized for this request only"""
+    return Loaders(db)
+
+
 def _fetch_jwks():
-    jwks_url = f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
+    jwks_url = settings.AUTH0_JWKS_URL or f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
     try:
         return requests.get(jwks_url, timeout=5).json()
     except Exception:
         raise ValueError("JWKS fetch failed")
 
 
-def _get_rsa_key_from_jwks(jwks, token: str):
-    try:
-        unverified_header = jwt.get_unverified_header(token)
-    except Exception:
-        raise ValueError("Invalid token header")
+class JWKSCache:
+    """Process-wide cache of parsed Auth0 signing keys, keyed by kid.
+
+    Keys are parsed once per fetch and trusted for ``ttl_seconds``. A kid that is
+    not in the cache triggers a refetch (key rotation), rate-limited by
+    ``min_refresh_seconds``. Concurrent misses wait on one lock so only a single
+    request goes out to the tenant. A failed fetch is not retried for
+    ``min_refresh_seconds`` either; the previous keys are served meanwhile.
+    """
+
+    def __init__(self, ttl_seconds: int, min_refresh_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        self._keys: dict = {}
+        self._fetched_at: float | None = None
+        self._failed_at: float | None = None
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.failures = 0
+
+    def _is_fresh(self, now: float) -> bool:
+        return self._fetched_at is not None and now - self._fetched_at < self.ttl_seconds
+
+    def _backing_off(self, now: float) -> bool:
+        return self._failed_at is not None and now - self._failed_at < self.min_refresh_seconds
+
+    def get_key(self, kid: str):
+        """Return the parsed public key for ``kid`` or None if the tenant does not publish it"""
+        now = time.monotonic()
+        if (self._is_fresh(now) or self._backing_off(now)) and kid in self._keys:
+            self.hits += 1
+            return self._keys[kid]
+
+        self.misses += 1
+        generation = self._generation
+        with self._lock:
+            now = time.monotonic()
+            if self._generation != generation and self._is_fresh(now):
+                # Another request refreshed while we waited
+                return self._keys.get(kid)
+            if self._is_fresh(now) and now - self._fetched_at < self.min_refresh_seconds:
+                # Fetched moments ago and the kid still isn't there
+                return None
+            if self._backing_off(now):
+                # The tenant failed moments ago; don't queue up more blocking fetches
+                if not self._keys:
+                    raise ValueError("JWKS fetch failed")
+                return self._keys.get(kid)
+            self._refresh(now)
+            return self._keys.get(kid)
+
+    def _refresh(self, now: float) -> None:
+        try:
+            jwks = _fetch_jwks()
+        except ValueError:
+            self._failed_at = now
+            self.failures += 1
+            if self._keys:
+                # Serve the previous key set rather than failing every request
+                return
+            raise
+        keys = {}
+        for key in jwks.get("keys", []):
+            kid = key.get("kid")
+            if kid is None:
+                continue
+            try:
+                keys[kid] = RSAAlgorithm.from_jwk(key)
+            except Exception:
+                keys[kid] = None
+        self._keys = keys
+        self._fetched_at = now
+        self._failed_at = None
+        self._generation += 1
+        self.fetches += 1
+
+    def stats(self) -> dict:
+        age = None if self._fetched_at is None else round(time.monotonic() - self._fetched_at, 1)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "keys": len(self._keys),
+            "age_seconds": age,
+        }
+
+
+jwks_cache = JWKSCache(settings.AUTH0_JWKS_CACHE_TTL_SECONDS, settings.AUTH0_JWKS_MIN_REFRESH_SECONDS)
+
+
+def _get_rsa_key(token: str, unverified_header: dict | None = None):
+    if unverified_header is None:
+        try:
+            unverified_header = jwt.get_unverified_header(token)
+        except Exception:
+            raise ValueError("Invalid token header")
 
     kid = unverified_header.get("kid")
     if kid is None:
         # Likely an HS256 token, indicate fallback
         raise ValueError("No kid in token")
 
-    for key in jwks.get("keys", []):
-        if key.get("kid") == kid:
-            jwk_json = json.dumps(key)
-            try:
-                return RSAAlgorithm.from_jwk(jwk_json)
-            except Exception:
-                return None
-
-    raise ValueError("No matching JWK")
+    return jwks_cache.get_key(kid)
 
 
-def verify_auth0_token(token: str):
+def verify_auth0_token(token: str, unverified_header: dict | None = None):
     """Validate an Auth0 RS256 token and return a dict with email, name, auth0_sub.
-    Raises ValueError on any validation problem so callers can fall back to HS256.
+    Raises ValueError on any validation problem.
     """
     if not (settings.AUTH0_DOMAIN and settings.AUTH0_AUDIENCE):
         raise ValueError("Auth0 not configured")
 
-    jwks = _fetch_jwks()
-    rsa_key = _get_rsa_key_from_jwks(jwks, token)
+    rsa_key = _get_rsa_key(token, unverified_header)
     if not rsa_key:
         raise ValueError("No matching JWK")
 
@@ -92,7 +193,7 @@ def verify_auth0_token(token: str):
     return {"email": email, "actual_email": actual_email, "actual_name": actual_name, "auth0_sub": auth0_sub}
 
 
-def verify_hs256_token(token: str):
+def verify_hs256_token(token: str, unverified_header: dict | None = None):
     """Validate an HS256 token (legacy local tokens) and return a dict with email.
     Raises ValueError on failure.
     """
@@ -106,108 +207,178 @@ def verify_hs256_token(token: str):
         raise ValueError("Invalid HS256 token")
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(reuse_oauth)):
-    # Try Auth0 RS256 validation first (if configured), fall back to HS256
-    # Set these to None so later update logic can reference them safely
-    actual_email = None
-    actual_name = None
-    auth0_sub = None
+# Verifier per JWS "alg" header value. Tokens are routed straight to the matching
+# verifier instead of trying Auth0 first and falling back on failure.
+TOKEN_VERIFIERS: dict[str, Callable[[str, dict], dict]] = {
+    "HS256": verify_hs256_token,
+    "RS256": verify_auth0_token,
+}
+
+# Successful decodes keyed by token hash, kept until the token's exp
+token_cache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE)
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def verify_token(token: str) -> dict:
+    """Validate a bearer token and return its claims dict (see the verifiers above).
+    Raises ValueError if the token is malformed, uses an unsupported algorithm or
+    fails verification.
+    """
+    key = _token_key(token)
+    claims = token_cache.get(key)
+    if claims is not None:
+        return claims
+
     try:
-        if settings.AUTH0_DOMAIN and settings.AUTH0_AUDIENCE:
-            try:
-                data = verify_auth0_token(token)
-                email = data.get("email")
-                actual_email = data.get("actual_email")
-                actual_name = data.get("actual_name")
-                auth0_sub = data.get("auth0_sub")
-            except ValueError:
-                # Fall back to HS256 if Auth0 validation fails
-                try:
-                    data = verify_hs256_token(token)
-                    email = data.get("email")
-                except ValueError:
-                    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        else:
-            # No Auth0 configured, use HS256 only
-            try:
-                data = verify_hs256_token(token)
-                email = data.get("email")
-            except ValueError:
-                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except HTTPException:
-        raise
+        header = jwt.get_unverified_header(token)
     except Exception:
+        raise ValueError("Invalid token header")
+
+    verifier = TOKEN_VERIFIERS.get(header.get("alg"))
+    if verifier is None:
+        raise ValueError("Unsupported token algorithm")
+    claims = verifier(token, header)
+
+    try:
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except Exception:
+        exp = None
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, claims, expires_at=exp)
+    return claims
+
+
+def _authenticate(token: str) -> dict:
+    try:
+        return verify_token(token)
+    except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = UserRepository().get_by_email(db, email)
+
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(reuse_oauth)) -> User:
+    """Full ORM user for the bearer token. Prefer get_current_principal unless the
+    handler needs the mapped object itself.
+    """
+    return _load_user(db, _authenticate(token))
+
+
+def _display_name(email: str, actual_name: str | None) -> str:
+    # Use Auth0 name if available, otherwise extract from email
+    if actual_name:
+        return actual_name
+    if "@" in email:
+        # Real email address - use the part before @
+        return email.split("@")[0]
+    # Auth0 subject ID - extract a friendlier name
+    if email.startswith("auth0|"):
+        return f"User_{email.split('|')[1][:8]}"  # Use first 8 chars of ID
+    return email[:20]  # Truncate long IDs
+
+
+def _profile_updates(current, data: dict) -> dict:
+    """Columns that should change so the stored profile matches the token claims.
+    ``current`` is a User or Principal; returns {} when nothing differs.
+    """
+    actual_email = data.get("actual_email")
+    actual_name = data.get("actual_name")
+    auth0_sub = data.get("auth0_sub")
+    changes: dict = {}
+
+    if current.email.startswith("auth0|") and actual_email and "@" in actual_email:
+        # Legacy auto-provisioned account: switch to the real email and name
+        changes["email"] = actual_email
+        changes["name"] = actual_name or actual_email.split("@")[0]
+    elif current.email.startswith("auth0|") and current.name.startswith("auth0|"):
+        # Improve the display name even if we don't have real email
+        changes["name"] = actual_name or f"User_{current.email.split('|')[1][:8]}"
+    elif auth0_sub and not current.auth0_sub and actual_name and not current.name.startswith("User_"):
+        changes["name"] = actual_name
+
+    if auth0_sub and not current.auth0_sub:
+        changes["auth0_sub"] = auth0_sub
+
+    return {k: v for k, v in changes.items() if getattr(current, k) != v}
+
+
+def _load_user(db: Session, data: dict) -> User:
+    """Find (or auto-provision) the local user for verified token claims.
+    Profile differences are queued on the write-behind queue rather than committed.
+    """
+    email = data.get("email")
+    auth0_sub = data.get("auth0_sub")
+
+    repo = UserRepository()
+    user = _find_user(db, repo, email, auth0_sub)
     if not user:
-        # Auto-provision a local user for Auth0-authenticated accounts
-        # Creates a user with default ATTENDEE role. Password is unused.
-        
-        # Use Auth0 name if available, otherwise extract from email
-        if 'actual_name' in locals() and actual_name:
-            display_name = actual_name
-        elif "@" in email:
-            # Real email address - use the part before @
-            display_name = email.split("@")[0]
-        else:
-            # Auth0 subject ID - extract a friendlier name
-            if email.startswith("auth0|"):
-                display_name = f"User_{email.split('|')[1][:8]}"  # Use first 8 chars of ID
-            else:
-                display_name = email[:20]  # Truncate long IDs
-        
-        user = UserRepository().create(
-            db, 
-            email=email, 
-            name=display_name, 
-            password_hash="",
-            auth0_sub=auth0_sub if 'auth0_sub' in locals() else None
+        # Auto-provision a local user for Auth0-authenticated accounts with the
+        # default ATTENDEE role (password unused). The upsert is a no-op when a
+        # concurrent first request won the race, so re-read whichever row exists.
+        repo.provision(
+            db,
+            email=email,
+            name=_display_name(email, data.get("actual_name")),
+            auth0_sub=auth0_sub,
         )
-        user.add_role(UserRole.ATTENDEE)
         db.commit()
-        db.refresh(user)
+        user = _find_user(db, repo, email, auth0_sub)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     else:
-        # Check if this is an existing Auth0 user that needs updating
-        if user.email.startswith("auth0|") and actual_email and "@" in actual_email:
-            # Update to use real email and actual name from Auth0
-            user.email = actual_email
-            if 'actual_name' in locals() and actual_name:
-                user.name = actual_name
-            else:
-                user.name = actual_email.split("@")[0]
-            # Store auth0_sub if we have it and it's missing
-            if 'auth0_sub' in locals() and not user.auth0_sub:
-                user.auth0_sub = auth0_sub
-            db.commit()
-            db.refresh(user)
-        elif user.email.startswith("auth0|") and user.name.startswith("auth0|"):
-            # Improve the display name even if we don't have real email
-            if user.email.startswith("auth0|"):
-                # Use Auth0 name if available, otherwise fallback to user ID
-                if 'actual_name' in locals() and actual_name:
-                    user.name = actual_name
-                else:
-                    user.name = f"User_{user.email.split('|')[1][:8]}"
-                # Store auth0_sub if we have it and it's missing
-                if 'auth0_sub' in locals() and not user.auth0_sub:
-                    user.auth0_sub = auth0_sub
-                db.commit()
-                db.refresh(user)
-        elif 'auth0_sub' in locals() and not user.auth0_sub:
-            # For any Auth0 user missing auth0_sub, add it (and update name if available)
-            user.auth0_sub = auth0_sub
-            if 'actual_name' in locals() and actual_name and not user.name.startswith("User_"):
-                user.name = actual_name
-            db.commit()
-            db.refresh(user)
+        profile_writer.submit(user.id, _profile_updates(user, data))
+
+    return user
+
 
+def _find_user(db: Session, repo: UserRepository, email: str, auth0_sub: str | None) -> User | None:
+    user = repo.get_by_auth0_sub(db, auth0_sub) if auth0_sub else None
+    if user is None:
+        user = repo.get_by_email(db, email)
     return user
 
 
-def require_any_role(*roles: UserRole) -> Callable[[User], User]:
+# Principals keyed by token subject. Entries are dropped on role changes and
+# deletions in this process; the TTL bounds staleness across workers.
+principal_cache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Forget cached principals for a user whose roles or existence changed"""
+    principal_cache.discard_where(lambda subject, principal: principal.id == user_id)
+
+
+def get_current_principal(db: Session = Depends(get_db), token: str = Depends(reuse_oauth)) -> Principal:
+    """Identity and roles for the bearer token, served from cache when possible.
+    Only a cache miss touches the database, and only to read: profile backfills
+    go through the write-behind queue and are reflected in the returned principal.
+    """
+    data = _authenticate(token)
+    subject = data.get("email")
+    principal = principal_cache.get(subject)
+    if principal is None:
+        user = _load_user(db, data)
+        principal = Principal.from_user(user)
+        # Show queued profile changes even before the writer flushes them
+        changes = profile_writer.pending(user.id)
+        if changes:
+            principal = dataclasses.replace(principal, **changes)
+        principal_cache.set(subject, principal)
+        return principal
+
+    # Claims changed since the principal was cached (e.g. Auth0 now sends a name)
+    changes = _profile_updates(principal, data)
+    if changes:
+        profile_writer.submit(principal.id, changes)
+        principal = dataclasses.replace(principal, **changes)
+        principal_cache.set(subject, principal)
+    return principal
+
+
+def require_any_role(*roles: UserRole) -> Callable[[Principal], Principal]:
     """Dependency that requires the current user to have at least one of the specified roles"""
-    def _dep(current_user: User = Depends(get_current_user)) -> User:
+    def _dep(current_user: Principal = Depends(get_current_principal)) -> Principal:
         if not current_user.has_any_role(roles):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         return current_user
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from app.core.config import settings
-from app.api.v1 import auth, events, users, audit_logs
+from app.api.v1 import auth, events, users, audit_logs, metrics
 from app.api import webhooks
 
 
@@ -9,4 +9,5 @@ api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(events.router, prefix="/events", tags=["events"])
 api_router.include_router(audit_logs.router, prefix="/audit_logs", tags=["audit-logs"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 api_router.include_router(webhooks.router, tags=["webhooks"])
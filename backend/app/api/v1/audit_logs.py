@@ -4,6 +4,7 @@ from typing import List
 from datetime import datetime
 
 from app.api.deps import get_db, require_any_role
+from app.core.principal import Principal
 from app.models.user import UserRole, User
 from app.models.audit_log import AuditLog
 
@@ -28,6 +29,6 @@ class AuditLogOut(BaseModel):
 
 # Real DB query for audit logs
 @router.get("/", response_model=List[AuditLogOut])
-def list_audit_logs(db: Session = Depends(get_db), admin: User = Depends(require_any_role(UserRole.ADMIN))):
+def list_audit_logs(db: Session = Depends(get_db), admin: Principal = Depends(require_any_role(UserRole.ADMIN))):
     logs = db.query(AuditLog).order_by(AuditLog.timestamp.desc()).all()
     return logs
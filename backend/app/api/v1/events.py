@@ -1,24 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, ConfigDict
 
-from typing import List
+from typing import Iterator, List, Literal
 from sqlalchemy.orm import Session
-from datetime import datetime, timezone, timedelta, date
+from datetime import datetime, timezone, timedelta, time
 from zoneinfo import ZoneInfo
+import asyncio
+import csv
+import io
+import queue
 import secrets
 import re
+import zlib
 
-from app.api.deps import get_db, get_current_user, require_any_role
+from app.api.deps import get_db, get_loaders, get_current_principal, require_any_role
+from app.core.principal import Principal
+from app.core import qr_tokens
 from app.repositories.audit_log_repo import AuditLogRepository
 from app.models.user import UserRole, User
 from app.repositories.event_repo import EventRepository
-from app.repositories.attendance_repo import AttendanceRepository
+from app.repositories.attendance_repo import AttendanceRepository, CheckInResult, CheckInStatus
 from app.repositories.event_member_repo import EventMemberRepository
+from app.repositories.base import encode_cursor, decode_cursor, MAX_PAGE_SIZE
+from app.repositories.loaders import Loaders
+from app.services.token_index import token_index, TokenWindow
+from app.services.checkin_batcher import checkin_batcher, stage_check_in_audit, stage_check_in_delta
+from app.services.attendance_stream import attendance_broker, make_delta
+from app.services.recurrence import parse_exclusions, parse_weekdays, series_occurrences
+from app.services.event_deleter import event_deleter
 
 from app.models.event import Event
-from app.models.attendance import Attendance
 from app.core.config import settings, is_testing_runtime, enforce_comment_runtime
-from app.models.event_member import EventMember
 from app.core.config import settings
 
 
@@ -29,6 +43,11 @@ att_repo = AttendanceRepository()
 event_member_repo = EventMemberRepository()
 
 
+def as_utc(dt: datetime) -> datetime:
+    """Stored datetimes are UTC; SQLite hands them back naive"""
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
 def serialize_datetime(dt: datetime) -> str:
     """Convert timezone-aware datetime to UTC ISO string with 'Z' suffix"""
     if dt.tzinfo is not None:
@@ -55,6 +74,11 @@ class EventCreate(BaseModel):
     parent_id: int | None = None
     attendance_threshold: int | None = None
     member_ids: List[int] | None = None  # New field for event members
+    # Store only the rule; sessions are written as their check-in windows approach
+    lazy_sessions: bool = False
+    # Every n weeks, skipping "YYYY-MM-DD" dates and "YYYY-MM-DD/YYYY-MM-DD" ranges
+    interval_weeks: int = Field(1, ge=1)
+    exclude_dates: List[str] | None = None
 
 class EventOut(BaseModel):
     id: int
@@ -74,23 +98,25 @@ class EventOut(BaseModel):
     organizer_name: str | None = None
     attendance_threshold: int | None = None
     member_count: int = 0
+    lazy_sessions: bool = False
 
 
     class Config:
         from_attributes = True
 
+# Sessions of a lazy series that have not been written yet have no id or token
 class SessionOut(BaseModel):
-    id: int
+    id: int | None
     start_time: datetime
     end_time: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
 class SessionListOut(BaseModel):
-    id: int
+    id: int | None
     start_time: str
     end_time: str
-    checkin_token: str
+    checkin_token: str | None
 
 
 class MemberAttendanceOut(BaseModel):
@@ -112,27 +138,45 @@ class EventFamilyOut(BaseModel):
         from_attributes = True
 
 
-def get_dates_between(start_date: date, end_date: date, weekdays: List[str]) -> List[date]:
-    """Helper function to get all dates between start and end that match given weekdays"""
-    # Convert weekday names to numbers (Monday = 0, Sunday = 6)
-    weekday_map = {
-        'Mon': 0, 'Monday': 0,
-        'Tue': 1, 'Tuesday': 1,
-        'Wed': 2, 'Wednesday': 2,
-        'Thu': 3, 'Thursday': 3,
-        'Fri': 4, 'Friday': 4,
-        'Sat': 5, 'Saturday': 5,
-        'Sun': 6, 'Sunday': 6
-    }
-    selected_weekdays = [weekday_map[day] for day in weekdays]
-    
-    dates = []
-    current = start_date
-    while current <= end_date:
-        if current.weekday() in selected_weekdays:
-            dates.append(current)
-        current += timedelta(days=1)
-    return dates
+def expand_lazy_series(db: Session, parents, children_by_parent: dict[int, list[Event]], now: datetime) -> None:
+    """Add the sessions of lazy series to ``children_by_parent``.
+    Sessions whose check-in window opens within RECURRENCE_MATERIALIZE_LEAD_MINUTES
+    (and has not closed) are written as rows so they get an id and token; the
+    rest are unsaved Event objects, rendered like any other session.
+    """
+    lead = now + timedelta(minutes=settings.RECURRENCE_MATERIALIZE_LEAD_MINUTES)
+    wrote = False
+    for parent in parents:
+        if not (parent.recurring and parent.lazy_sessions):
+            continue
+        children = children_by_parent.setdefault(parent.id, [])
+        existing = {as_utc(c.start_time) for c in children}
+        until = as_utc(parent.end_date) if parent.end_date else now + timedelta(days=settings.RECURRENCE_OPEN_ENDED_DAYS)
+        due, virtual = [], []
+        for start, end in series_occurrences(parent, until):
+            if start in existing:
+                continue
+            if start - timedelta(minutes=parent.checkin_open_minutes) <= lead and end >= now:
+                due.append((start, end))
+            else:
+                virtual.append(Event(
+                    name=parent.name,
+                    location=parent.location,
+                    start_time=start,
+                    end_time=end,
+                    notes=parent.notes,
+                    checkin_open_minutes=parent.checkin_open_minutes,
+                    recurring=True,
+                    parent_id=parent.id,
+                    organizer_id=parent.organizer_id,
+                ))
+        if due:
+            children += event_repo.materialize(db, parent, due)
+            wrote = True
+        children += virtual
+        children.sort(key=lambda c: as_utc(c.start_time))
+    if wrote:
+        db.commit()
 
 
 @router.post("/", response_model=EventOut)
@@ -140,7 +184,7 @@ def create_event(
     payload: EventCreate,
     comment: str | None = Query(None, description="Optional admin/organizer comment for audit log"),
     db: Session = Depends(get_db),
-    user: User = Depends(require_any_role(UserRole.ORGANIZER, UserRole.ADMIN)),
+    user: Principal = Depends(require_any_role(UserRole.ORGANIZER, UserRole.ADMIN)),
 ):
     
     try:
@@ -190,67 +234,52 @@ def create_event(
         )
         if payload.attendance_threshold is not None:
             parent_event.attendance_threshold = payload.attendance_threshold
+        if payload.recurring and payload.weekdays:
+            try:
+                parse_weekdays(payload.weekdays)
+                exclusions = parse_exclusions(payload.exclude_dates)
+            except (KeyError, ValueError) as e:
+                raise HTTPException(400, f"Invalid recurrence rule: {e}")
+            parent_event.recurrence_timezone = payload.timezone
+            parent_event.recurrence_interval = payload.interval_weeks
+            parent_event.recurrence_exclusions = [
+                f"{first}/{last}" if last != first else str(first) for first, last in exclusions
+            ] or None
+        lazy = bool(payload.recurring and payload.lazy_sessions and payload.weekdays)
+        if lazy:
+            parent_event.lazy_sessions = True
         
         db.flush()
 
-        # Add event members if provided
+        # Members belong to the series as a whole, so they are attached to the
+        # parent only, in one multi-row insert
         if payload.member_ids:
-            for member_id in payload.member_ids:
-                event_member_repo.add_member(
-                    db,
-                    parent_event.id,
-                    member_id
+            event_member_repo.add_members(db, parent_event.id, payload.member_ids)
+
+        if payload.recurring and payload.weekdays and payload.end_date and not lazy:
+            # Every session after the parent, inserted at once with tokens
+            # generated up front
+            sessions = [
+                dict(
+                    name=payload.name,
+                    location=payload.location,
+                    start_time=session_start,
+                    end_time=session_end,
+                    notes=payload.notes,
+                    checkin_open_minutes=parent_event.checkin_open_minutes,
+                    checkin_token=secrets.token_urlsafe(16),
+                    organizer_id=user.id,
+                    recurring=True,
+                    weekdays=payload.weekdays,
+                    end_date=end_date_utc,
+                    parent_id=parent_event.id,  # Link to parent event
+                    attendance_threshold=payload.attendance_threshold,
                 )
+                for session_start, session_end in series_occurrences(parent_event)
+            ]
+            event_repo.create_sessions(db, sessions)
 
-        if payload.recurring and payload.weekdays and payload.end_date:
-            # Create recurring events
-            start_date_only = start_local.date()
-            end_date_only = end_date_utc.date()
-            recurring_dates = get_dates_between(start_date_only, end_date_only, payload.weekdays)
-            #skip first date since it's already created
-            if len(recurring_dates) > 1:
-                for rd in recurring_dates[1:]:
-                    new_start_local = datetime.combine(rd, start_local.time(), tzinfo=user_timezone)
-                    new_end_local = datetime.combine(rd, end_local.time(), tzinfo=user_timezone)
-                    new_start_utc = new_start_local.astimezone(timezone.utc)
-                    new_end_utc = new_end_local.astimezone(timezone.utc)
-
-                    print(f"Creating recurring event on {rd} (local={new_start_local}, utc={new_start_utc})")
-
-
-                    child_event = event_repo.create(
-                        db,
-                        name=payload.name,
-                        location=payload.location,
-                        start_time=new_start_utc,
-                        end_time=new_end_utc,
-                        notes=payload.notes,
-                        checkin_open_minutes=payload.checkin_open_minutes or settings.DEFAULT_CHECKIN_OPEN_MINUTES,
-                        checkin_token=secrets.token_urlsafe(16),
-                        organizer_id=user.id,
-                        recurring=True,
-                        weekdays=payload.weekdays,
-                        end_date=end_date_utc,
-                        parent_id=parent_event.id  # Link to parent event
-                    )
-
-                    if payload.attendance_threshold is not None:
-                        child_event.attendance_threshold = payload.attendance_threshold
-
-                    db.flush()
-
-                    # Add event members to child event
-                    if payload.member_ids:
-                        for member_id in payload.member_ids:
-                            event_member_repo.add_member(
-                                db,
-                                child_event.id,
-                                member_id
-                            )
-        db.commit()
-        db.refresh(parent_event)
-
-        AuditLogRepository.log_audit(
+        AuditLogRepository.add_audit(
             db,
             action="create_event",
             user_email=user.email,
@@ -260,6 +289,9 @@ def create_event(
             details=f"Created event: {parent_event.name}",
             comment=comment
         )
+        db.commit()
+        db.refresh(parent_event)
+
         #returns parent event only for now
         return EventOut(
             id=parent_event.id,
@@ -275,7 +307,8 @@ def create_event(
             weekdays=parent_event.weekdays,
             end_date=serialize_datetime(parent_event.end_date) if parent_event.end_date else None,
             parent_id=parent_event.parent_id,
-            member_count=len(event_member_repo.list_members(db, parent_event.id))
+            member_count=parent_event.member_count,
+            lazy_sessions=parent_event.lazy_sessions
         )
 
     except ValueError as e:
@@ -286,14 +319,40 @@ def create_event(
         raise HTTPException(500, f"Error creating event: {str(e)}")
 
 @router.get("/", response_model=List[EventOut])
-def list_all_events(db: Session = Depends(get_db), admin: User = Depends(require_any_role(UserRole.ADMIN))):
-    """List all events (admin only)"""
-    events = db.query(Event).all()
+def list_all_events(
+    response: Response,
+    organizer_id: int | None = Query(None, description="Only events run by this organizer"),
+    start_from: datetime | None = Query(None, description="Only events starting at or after this time"),
+    start_to: datetime | None = Query(None, description="Only events starting before this time"),
+    kind: Literal["recurring", "solo"] | None = Query(None, description="Only recurring sessions or only one-off events"),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    include_total: bool = Query(False, description="Send an approximate number of matches in X-Total-Count"),
+    db: Session = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders),
+    admin: Principal = Depends(require_any_role(UserRole.ADMIN)),
+):
+    """List events, newest first (admin only).
+    Pages are keyed on (start_time, id); pass X-Next-Cursor back as ``cursor``
+    for the next one. The header is absent on the last page.
+    """
+    stmt = event_repo.filtered(
+        organizer_id=organizer_id,
+        start_from=as_utc(start_from) if start_from else None,
+        start_to=as_utc(start_to) if start_to else None,
+        recurring=None if kind is None else kind == "recurring",
+    )
+    events, next_cursor = event_repo.page(
+        db, Event.start_time, stmt, after=_parse_cursor(cursor), limit=limit, descending=True
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if include_total:
+        response.headers["X-Total-Count"] = str(event_repo.estimate_count(db, stmt))
+    organizers = loaders.users.load_many(e.organizer_id for e in events)
     result = []
-    for e in events:
-        attendance_count = att_repo.count_for_event(db, e.id)
-        organizer = db.query(User).filter(User.id == e.organizer_id).first()
-        organizer_name = organizer.name if organizer else "Unknown"
+    for e, organizer in zip(events, organizers):
+        organizer_name = organizer.value.name if organizer.value else "Unknown"
         result.append(EventOut(
             id=e.id,
             name=e.name,
@@ -303,7 +362,7 @@ def list_all_events(db: Session = Depends(get_db), admin: User = Depends(require
             notes=e.notes,
             checkin_open_minutes=e.checkin_open_minutes,
             checkin_token=e.checkin_token,
-            attendance_count=attendance_count,
+            attendance_count=e.attendance_count,
             recurring=e.recurring,
             weekdays=e.weekdays,
             end_date=serialize_datetime(e.end_date) if e.end_date else None,
@@ -313,7 +372,7 @@ def list_all_events(db: Session = Depends(get_db), admin: User = Depends(require
     return result
 
 @router.get("/mine/upcoming", response_model=List[EventOut])
-def my_upcoming(db: Session = Depends(get_db), user = Depends(get_current_user)):
+def my_upcoming(db: Session = Depends(get_db), user: Principal = Depends(get_current_principal)):
     items = event_repo.upcoming_for_organizer(db, user.id)
     return [EventOut(
         id=e.id,
@@ -324,7 +383,7 @@ def my_upcoming(db: Session = Depends(get_db), user = Depends(get_current_user))
         notes=e.notes,
         checkin_open_minutes=e.checkin_open_minutes,
         checkin_token=e.checkin_token,
-        attendance_count=att_repo.count_for_event(db, e.id),
+        attendance_count=e.attendance_count,
         recurring=e.recurring,
         weekdays=e.weekdays,
         end_date=serialize_datetime(e.end_date) if e.end_date else None,
@@ -333,7 +392,7 @@ def my_upcoming(db: Session = Depends(get_db), user = Depends(get_current_user))
 
 
 @router.get("/mine/past", response_model=List[EventOut])
-def my_past(db: Session = Depends(get_db), user = Depends(get_current_user)):
+def my_past(db: Session = Depends(get_db), user: Principal = Depends(get_current_principal)):
     items = event_repo.past_for_organizer(db, user.id)
     return [EventOut(
         id=e.id,
@@ -344,7 +403,7 @@ def my_past(db: Session = Depends(get_db), user = Depends(get_current_user)):
         notes=e.notes,
         checkin_open_minutes=e.checkin_open_minutes,
         checkin_token=e.checkin_token,
-        attendance_count=att_repo.count_for_event(db, e.id),
+        attendance_count=e.attendance_count,
         recurring=e.recurring,
         weekdays=e.weekdays,
         end_date=serialize_datetime(e.end_date) if e.end_date else None,
@@ -366,6 +425,23 @@ class AttendanceOut(BaseModel):
         from_attributes = True
 
 
+class BatchCheckInRecord(BaseModel):
+    event_token: str
+    attendee_id: int | None = None
+    email: str | None = None
+    scanned_at: datetime
+
+
+class BatchCheckInRequest(BaseModel):
+    records: List[BatchCheckInRecord] = Field(..., max_length=20000)
+
+
+class BatchCheckInOut(BaseModel):
+    # One status per submitted record, in the same order
+    statuses: List[str]
+    counts: dict[str, int]
+
+
 class MyCheckInOut(BaseModel):
     id: int
     event_id: int
@@ -389,10 +465,32 @@ class AttendeeOut(BaseModel):
         from_attributes = True
 
 
+def _parse_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
+
 @router.get("/my-checkins", response_model=List[MyCheckInOut])
-def my_checkins(db: Session = Depends(get_db), user = Depends(get_current_user)):
-    """Get current user's check-in history"""
-    checkins = att_repo.get_by_attendee(db, user.id)
+def my_checkins(
+    response: Response,
+    since: str | None = Query(None, description="Cursor from X-Next-Cursor: only newer check-ins"),
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_principal),
+):
+    """Get current user's check-in history (newest first).
+    The X-Next-Cursor header can be passed back as ``since`` to fetch only new
+    check-ins. This is best-effort: a check-in stamped before the cursor that
+    commits after it is only returned by a request without ``since``.
+    """
+    checkins = att_repo.get_by_attendee(db, user.id, _parse_cursor(since))
+    if checkins:
+        response.headers["X-Next-Cursor"] = encode_cursor(checkins[0].checked_in_at, checkins[0].id)
+    elif since:
+        response.headers["X-Next-Cursor"] = since
     return [
         MyCheckInOut(
             id=att.id,
@@ -405,57 +503,148 @@ def my_checkins(db: Session = Depends(get_db), user = Depends(get_current_user))
     ]
 
 
+def _check_in_now(db: Session, token: str, user: Principal, now: datetime) -> CheckInResult:
+    result = att_repo.check_in(db, token, user.id, now)
+    if result.status is CheckInStatus.CHECKED_IN:
+        # Audit row rides in the same transaction as the attendance insert
+        stage_check_in_audit(db, user.email, result)
+        stage_check_in_delta(db, user.id, user.name, result, now)
+        db.commit()
+    return result
+
+
+async def _check_in_grouped(db: Session, token: str, user: Principal, now: datetime) -> CheckInResult:
+    """Group commit: the writer inserts and audits this check-in with others.
+    The wait is awaited on the event loop, so queued check-ins are not capped by
+    the worker thread pool; a full queue or a stalled writer is a 503.
+    """
+    try:
+        pending = await run_in_threadpool(checkin_batcher.submit, db, token, user.id, user.email, now, user.name)
+        if isinstance(pending, CheckInResult):
+            return pending
+        # shield: giving up on the wait must not cancel the queued write
+        return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(pending)), checkin_batcher.result_timeout)
+    except (queue.Full, asyncio.TimeoutError):
+        raise HTTPException(503, "Check-in is busy, please try again", headers={"Retry-After": "1"})
+
+
 @router.post("/checkin", response_model=AttendanceOut)
-def check_in(
+async def check_in(
     req: CheckInRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(require_any_role(UserRole.ATTENDEE, UserRole.ORGANIZER, UserRole.ADMIN)),
+    user: Principal = Depends(require_any_role(UserRole.ATTENDEE, UserRole.ORGANIZER, UserRole.ADMIN)),
 ):
-    event = event_repo.get_by_token(db, req.event_token)
-    if not event:
-        raise HTTPException(404, "Event not found")
-
     now = datetime.now(timezone.utc)
-    start = event.start_time
-    end = event.end_time
-    if start.tzinfo is None:
-        start = start.replace(tzinfo=timezone.utc)
-    if end.tzinfo is None:
-        end = end.replace(tzinfo=timezone.utc)
-    open_at = start - timedelta(minutes=event.checkin_open_minutes)
-    if not (open_at <= now <= end):
+    if settings.CHECKIN_BURST_MODE:
+        result = await _check_in_grouped(db, req.event_token, user, now)
+    else:
+        result = await run_in_threadpool(_check_in_now, db, req.event_token, user, now)
+    if result.status is CheckInStatus.NOT_FOUND:
+        raise HTTPException(404, "Event not found")
+    if result.status is CheckInStatus.NOT_OPEN:
         raise HTTPException(400, "Check-in not open for this event")
-
-    # Check if user has already checked in
-    existing_attendance = att_repo.get_by_event_and_user(db, event.id, user.id)
-    if existing_attendance:
+    if result.status is CheckInStatus.DUPLICATE:
         raise HTTPException(400, "You have already checked in for this event")
 
-    # Upsert-like: unique constraint prevents duplicates; try to create
-    att = att_repo.create(
-        db,
-        event_id=event.id,
+    return AttendanceOut(
+        id=result.attendance_id,
+        event_id=result.event_id,
         attendee_id=user.id,
         checked_in_at=now,
-        source_ip=None,
-        user_agent=None,
     )
-    db.commit()
-    AuditLogRepository.log_audit(
+
+
+@router.post("/checkin/batch", response_model=BatchCheckInOut)
+def batch_check_in(
+    req: BatchCheckInRequest,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(require_any_role(UserRole.ORGANIZER, UserRole.ADMIN)),
+):
+    """Upload scans collected offline by an organizer kiosk.
+    Organizers may only check attendees into their own events.
+    """
+    organizer_id = None if user.has_role(UserRole.ADMIN) else user.id
+    statuses = att_repo.check_in_many(db, req.records, organizer_id)
+    counts: dict[str, int] = {}
+    for st in statuses:
+        counts[st.value] = counts.get(st.value, 0) + 1
+
+    AuditLogRepository.add_audit(
         db,
-        action="check_in",
+        action="batch_check_in",
         user_email=user.email,
         timestamp=datetime.utcnow(),
         resource_type="attendance",
-        resource_id=str(att.id),
-        details=f"Checked in to event: {event.name}"
+        details=f"Batch check-in of {len(statuses)} records: "
+        + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())),
     )
-    db.refresh(att)
-    return att
+    db.commit()
+    return BatchCheckInOut(statuses=[st.value for st in statuses], counts=counts)
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() == "gzip":
+            q = params.strip().lower().removeprefix("q=")
+            try:
+                return float(q or 1) > 0
+            except ValueError:
+                return True
+    return False
+
+
+def _csv_location(location: str) -> str:
+    # Normalize location to insert comma before 2-letter state if missing (e.g. "Spartanburg SC" -> "Spartanburg, SC")
+    if location and "," not in location:
+        m = re.match(r"^(?P<city>.+?)\s(?P<state>[A-Z]{2})(?:,\s*USA)?$", location)
+        if m:
+            return f"{m.group('city').rstrip()}, {m.group('state')}"
+    return location
+
+
+def _attendance_csv(db: Session, event: Event, organizer_name: str, compress: bool) -> Iterator[bytes]:
+    """CSV body streamed one yield_per batch at a time, then the summary footer.
+    Rows come from a server-side cursor, so memory does not grow with the roster.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    compressor = zlib.compressobj(wbits=31) if compress else None  # 31: gzip container
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    try:
+        writer.writerow(["Event Name", "Event Location", "Attendee ID", "Attendee Name", "Attendee Email", "Date/Time Checked In"])
+        location = _csv_location(event.location or "")
+        total = 0
+        for batch in att_repo.export_rows(db, event.id, settings.CSV_EXPORT_YIELD_PER):
+            for attendee_id, checked_in_at, name, email in batch:
+                writer.writerow([event.name or "", location, attendee_id, name or "", email or "", checked_in_at.isoformat()])
+            total += len(batch)
+            chunk = drain()
+            if chunk:
+                yield chunk
+
+        # Blank line, then the summary in columns
+        buffer.write("\n")
+        writer.writerow(["Organizer Name:", organizer_name])
+        writer.writerow(["Total Attendance:", total])
+        yield drain() + (compressor.flush() if compressor else b"")
+    finally:
+        db.close()
 
 
 @router.get("/{event_id}/attendance.csv")
-def export_csv(event_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+def export_csv(
+    event_id: int,
+    accept_encoding: str | None = Header(None),
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_principal),
+):
     event = event_repo.get(db, event_id)
     if not event:
         raise HTTPException(404, "Event not found")
@@ -468,69 +657,25 @@ def export_csv(event_id: int, db: Session = Depends(get_db), user: User = Depend
     if not (is_admin or is_event_organizer):
         raise HTTPException(403, "Forbidden")
 
-    # EXCLUDE organizer (do not list the event creator in the CSV)
-    records = (
-        db.query(Attendance, User)
-        .join(User, Attendance.attendee_id == User.id)
-        .filter(
-            Attendance.event_id == event_id
-        )
-        .order_by(Attendance.checked_in_at.asc())
-        .all()
-    )
-
-    def esc(val: str | None):
-        if val is None:
-            return ""
-        s = str(val)
-        if '"' in s:
-            s = s.replace('"', '""')
-        if ',' in s or '"' in s:
-            return f'"{s}"'
-        return s
-
-    header = "Event Name,Event Location,Attendee ID,Attendee Name,Attendee Email,Date/Time Checked In\n"
-    ev_name = esc(getattr(event, "name", "") or "")
-    ev_loc = esc(getattr(event, "location", "") or "")  # existing line (kept)
-
-    # ADD: Normalize location to insert comma before 2‑letter state if missing (e.g. "Spartanburg SC" -> "Spartanburg, SC")
-    raw_location = getattr(event, "location", "") or ""
-    if raw_location and "," not in raw_location:
-        m = re.match(r"^(?P<city>.+?)\s(?P<state>[A-Z]{2})(?:,\s*USA)?$", raw_location)
-        if m:
-            formatted = f"{m.group('city').rstrip()}, {m.group('state')}"
-            ev_loc = esc(formatted)
-
-    lines: list[str] = []
-    for att, usr in records:
-        lines.append(
-            f"{ev_name},{ev_loc},{att.attendee_id},{esc(usr.name)},{esc(usr.email)},{att.checked_in_at.isoformat()}"
-        )
-
-    # Get organizer information
-    organizer = db.query(User).filter(User.id == event.organizer_id).first()
+    organizer = db.get(User, event.organizer_id)
     organizer_name = organizer.name if organizer else "Unknown"
-    total_attendance = len(records)
 
-    # Build CSV with summary at the end
-    csv_body = header + "\n".join(lines)
-    if lines:
-        csv_body += "\n"
-    
-    # Add blank line and summary in columns
-    csv_body += "\n"
-    csv_body += f"Organizer Name:,{esc(organizer_name)}\n"
-    csv_body += f"Total Attendance:,{total_attendance}\n"
-
-    return Response(content=csv_body, media_type="text/csv")
+    compress = _accepts_gzip(accept_encoding)
+    headers = {"Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        _attendance_csv(db, event, organizer_name, compress),
+        media_type="text/csv",
+        headers=headers,
+    )
 
 
 @router.get("/by-token/{token}", response_model=EventOut)
-def get_by_token(token: str, db: Session = Depends(get_db), user = Depends(get_current_user)):
+def get_by_token(token: str, db: Session = Depends(get_db), user: Principal = Depends(get_current_principal)):
     e = event_repo.get_by_token(db, token)
     if not e:
         raise HTTPException(404, "Event not found")
-    count = att_repo.count_for_event(db, e.id)
     return EventOut(
         id=e.id,
         name=e.name,
@@ -539,8 +684,9 @@ def get_by_token(token: str, db: Session = Depends(get_db), user = Depends(get_c
         end_time=serialize_datetime(e.end_time),
         notes=e.notes,
         checkin_open_minutes=e.checkin_open_minutes,
-        checkin_token=e.checkin_token,
-        attendance_count=count,
+        # Never hand the static token to someone who scanned a rotating one
+        checkin_token=token if qr_tokens.is_signed(token) else e.checkin_token,
+        attendance_count=e.attendance_count,
         recurring=e.recurring,
         weekdays=e.weekdays,
         end_date=serialize_datetime(e.end_date) if e.end_date else None,
@@ -549,7 +695,7 @@ def get_by_token(token: str, db: Session = Depends(get_db), user = Depends(get_c
 
 
 @router.get("/{event_id}", response_model=EventOut)
-def get_event_by_id(event_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+def get_event_by_id(event_id: int, db: Session = Depends(get_db), user: Principal = Depends(get_current_principal)):
     """Get event details by ID"""
     event = event_repo.get(db, event_id)
     if not event:
@@ -563,7 +709,6 @@ def get_event_by_id(event_id: int, db: Session = Depends(get_db), user: User = D
     if not (is_admin or is_event_organizer):
         raise HTTPException(403, "Forbidden")
     
-    count = att_repo.count_for_event(db, event.id)
     return EventOut(
         id=event.id,
         name=event.name,
@@ -573,7 +718,7 @@ def get_event_by_id(event_id: int, db: Session = Depends(get_db), user: User = D
         notes=event.notes,
         checkin_open_minutes=event.checkin_open_minutes,
         checkin_token=event.checkin_token,
-        attendance_count=count,
+        attendance_count=event.attendance_count,
         recurring=event.recurring,
         weekdays=event.weekdays,
         end_date=serialize_datetime(event.end_date) if event.end_date else None,
@@ -581,9 +726,231 @@ def get_event_by_id(event_id: int, db: Session = Depends(get_db), user: User = D
     )
 
 
+class QrTokenOut(BaseModel):
+    token: str
+    expires_at: str
+    rotation_seconds: int
+
+
+@router.get("/{event_id}/qr-token", response_model=QrTokenOut)
+def get_qr_token(event_id: int, db: Session = Depends(get_db), user: Principal = Depends(get_current_principal)):
+    """Current signed rotating check-in token for the event's QR display.
+    Clients should fetch a new one every ``rotation_seconds``.
+    """
+    event = event_repo.get(db, event_id)
+    if not event:
+        raise HTTPException(404, "Event not found")
+    if not (user.has_role(UserRole.ADMIN) or event.organizer_id == user.id):
+        raise HTTPException(403, "Forbidden")
+
+    window = TokenWindow.from_event(event)
+    token, expires_at = qr_tokens.issue(
+        event.id,
+        window.opens_at,
+        window.closes_at,
+        datetime.now(timezone.utc),
+        settings.QR_TOKEN_SECRET,
+        settings.QR_TOKEN_ROTATION_SECONDS,
+    )
+    return QrTokenOut(
+        token=token,
+        expires_at=serialize_datetime(expires_at),
+        rotation_seconds=settings.QR_TOKEN_ROTATION_SECONDS,
+    )
+
+
+class SessionMaterializeIn(BaseModel):
+    start_time: datetime
+
+
+@router.post("/{parent_id}/sessions", response_model=SessionListOut)
+def materialize_session(
+    parent_id: int,
+    req: SessionMaterializeIn,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_principal),
+):
+    """Write one session of a lazy series ahead of time, e.g. to show its QR
+    code early. Idempotent: an existing session is returned as is.
+    """
+    parent = event_repo.get(db, parent_id)
+    if not parent or not parent.lazy_sessions:
+        raise HTTPException(404, "Lazy series not found")
+    if not (user.has_role(UserRole.ADMIN) or parent.organizer_id == user.id):
+        raise HTTPException(403, "Forbidden")
+
+    start = as_utc(req.start_time)
+    occurrence = next(((s, e) for s, e in series_occurrences(parent, start) if s == start), None)
+    if occurrence is None:
+        raise HTTPException(400, "Not a session of this series")
+    session = event_repo.materialize(db, parent, [occurrence])[0]
+    db.commit()
+    return SessionListOut(
+        id=session.id,
+        start_time=serialize_datetime(session.start_time),
+        end_time=serialize_datetime(session.end_time),
+        checkin_token=session.checkin_token,
+    )
+
+
+class SeriesUpdate(BaseModel):
+    # "this" edits session_id only; "following" edits session_id and every later
+    # session (every session not yet started when session_id is omitted)
+    scope: Literal["this", "following", "all"] = "all"
+    session_id: int | None = None
+    name: str | None = None
+    location: str | None = None
+    notes: str | None = None
+    checkin_open_minutes: int | None = Field(None, ge=0)
+    attendance_threshold: int | None = None
+    # Wall-clock times in the series' timezone, applied on each session's own date
+    start_time: time | None = None
+    end_time: time | None = None
+
+
+class SeriesUpdateOut(BaseModel):
+    scope: str
+    updated: int
+
+
+@router.patch("/{parent_id}/series", response_model=SeriesUpdateOut)
+def update_series(
+    parent_id: int,
+    payload: SeriesUpdate,
+    comment: str | None = Query(None, description="Optional admin/organizer comment for audit log"),
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_principal),
+):
+    """Edit sessions of a series in place with set-based UPDATEs, keeping
+    their ids and check-in tokens (printed QR codes stay valid).
+    """
+    parent = event_repo.get(db, parent_id)
+    if not parent or not parent.recurring or parent.parent_id is not None:
+        raise HTTPException(404, "Series not found")
+    if not (user.has_role(UserRole.ADMIN) or parent.organizer_id == user.id):
+        raise HTTPException(403, "Forbidden")
+    if not is_testing_runtime() and enforce_comment_runtime():
+        if comment is None or comment.strip() == "":
+            raise HTTPException(400, "Comment is required for this action")
+
+    values = payload.model_dump(
+        include={"name", "location", "notes", "checkin_open_minutes", "attendance_threshold"},
+        exclude_none=True,
+    )
+    retime = payload.start_time is not None or payload.end_time is not None
+    if not values and not retime:
+        raise HTTPException(400, "Nothing to update")
+
+    session = None
+    if payload.session_id is not None:
+        session = event_repo.get(db, payload.session_id)
+        if not session or parent.id not in (session.id, session.parent_id):
+            raise HTTPException(404, "Session not found in this series")
+    elif payload.scope == "this":
+        raise HTTPException(400, "session_id is required for scope 'this'")
+
+    if parent.lazy_sessions:
+        # Unwritten sessions are generated from the parent, so a lazy series
+        # cannot be split: edit it as a whole or one written session at a time
+        if payload.scope == "following" or (payload.scope == "this" and (session.id == parent.id or retime)):
+            raise HTTPException(400, "Lazy series can only be edited as a whole or one session's details at a time")
+
+    if payload.scope == "this":
+        condition = event_repo.series_scope(parent.id, session_id=session.id)
+    elif payload.scope == "following":
+        since = session.start_time if session else datetime.now(timezone.utc)
+        condition = event_repo.series_scope(parent.id, since=since)
+    else:
+        condition = event_repo.series_scope(parent.id)
+
+    if retime:
+        tz = ZoneInfo(parent.recurrence_timezone or "UTC")
+        try:
+            ids = event_repo.retime_where(db, condition, tz, payload.start_time, payload.end_time, values)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+    else:
+        ids = event_repo.update_where(db, condition, values)
+
+    AuditLogRepository.add_audit(
+        db,
+        action="update_series",
+        user_email=user.email,
+        timestamp=datetime.utcnow(),
+        resource_type="event",
+        resource_id=str(parent.id),
+        details=f"Updated {len(ids)} session(s) of {parent.name} ({payload.scope}): {', '.join(sorted(values) + (['times'] if retime else []))}",
+        comment=comment,
+    )
+    db.commit()
+    # Check-in windows and names are cached per session
+    token_index.invalidate(event_ids=ids)
+    return SeriesUpdateOut(scope=payload.scope, updated=len(ids))
+
+
+def _authorize_event_view(db: Session, event_id: int, user: Principal) -> None:
+    event = event_repo.get(db, event_id)
+    if not event:
+        raise HTTPException(404, "Event not found")
+    if not (user.has_role(UserRole.ADMIN) or event.organizer_id == user.id):
+        raise HTTPException(403, "Forbidden")
+
+
+def _stream_start(db: Session, event_id: int, after_id: int | None):
+    count, last_id, counted, rows = att_repo.stream_snapshot(db, event_id, after_id)
+    backlog = [make_delta(r.id, event_id, r.attendee_id, r.name, r.checked_in_at) for r in rows]
+    return count, last_id, counted, backlog
+
+
+@router.get("/{event_id}/attendance/stream")
+async def stream_attendance(
+    event_id: int,
+    request: Request,
+    last_event_id: int | None = Header(None),
+    after: int | None = Query(None, description="Resume after this attendance id (for clients that cannot send Last-Event-ID)"),
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_principal),
+):
+    """Live check-ins as Server-Sent Events (organizer or admin).
+    Sends a ``count`` event, then one ``checkin`` event per committed check-in
+    with the highest attendance id sent as the event id and the running count
+    in the data. A reconnect with Last-Event-ID gets the check-ins after it.
+    """
+    await run_in_threadpool(_authorize_event_view, db, event_id, user)
+    # Subscribe before reading the snapshot so nothing committed in between is lost
+    sub = attendance_broker.subscribe(event_id)
+    try:
+        after_id = last_event_id if last_event_id is not None else after
+        count, last_id, counted, backlog = await run_in_threadpool(_stream_start, db, event_id, after_id)
+    except BaseException:
+        attendance_broker.unsubscribe(sub)
+        raise
+    finally:
+        # get_db's cleanup only runs once the stream ends; don't hold a pooled
+        # connection for the dashboard's lifetime
+        await run_in_threadpool(db.close)
+    return StreamingResponse(
+        attendance_broker.stream(sub, count, last_id, counted, backlog, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{event_id}/attendees", response_model=List[AttendeeOut])
-def get_event_attendees(event_id: int, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    """Get all attendees for a specific event"""
+def get_event_attendees(
+    event_id: int,
+    response: Response,
+    since: str | None = Query(None, description="Cursor from X-Next-Cursor: only later check-ins"),
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_principal),
+):
+    """Get all attendees for a specific event, in check-in order.
+    The X-Next-Cursor header can be passed back as ``since`` to fetch only the
+    attendances after it. Positions are (checked_in_at, id), and check-ins
+    commit out of that order (batch uploads keep their scan time), so polling
+    with ``since`` is best-effort; reload without it, or use the attendance
+    stream, for an exact roster.
+    """
     event = event_repo.get(db, event_id)
     if not event:
         raise HTTPException(404, "Event not found")
@@ -597,13 +964,12 @@ def get_event_attendees(event_id: int, db: Session = Depends(get_db), user: User
         raise HTTPException(403, "Forbidden")
 
     # Get attendance records with user information
-    records = (
-        db.query(Attendance, User)
-        .join(User, Attendance.attendee_id == User.id)
-        .filter(Attendance.event_id == event_id)
-        .order_by(Attendance.checked_in_at.asc())
-        .all()
-    )
+    records = att_repo.roster(db, event_id, _parse_cursor(since))
+    if records:
+        last = records[-1][0]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.checked_in_at, last.id)
+    elif since:
+        response.headers["X-Next-Cursor"] = since
 
     return [
         AttendeeOut(
@@ -616,13 +982,17 @@ def get_event_attendees(event_id: int, db: Session = Depends(get_db), user: User
     ]
 
 # --- Event Deletion: Admin or Organizer ---
-@router.delete("/{event_id}")
+@router.delete("/{event_id}", status_code=status.HTTP_202_ACCEPTED)
 def delete_event(
     event_id: int,
     comment: str | None = Query(None, description="Optional admin/organizer comment for audit log"),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user)
+    user: Principal = Depends(get_current_principal)
 ):
+    """Hide the event (for a series parent, every session too) at once and
+    purge it with its attendance and members in the background.
+    Poll GET /events/delete-jobs/{job_id} for progress.
+    """
     event = event_repo.get(db, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -634,19 +1004,42 @@ def delete_event(
     if not is_testing_runtime() and enforce_comment_runtime():
         if comment is None or (isinstance(comment, str) and comment.strip() == ""):
             raise HTTPException(status_code=400, detail="Comment is required for this action")
-    db.delete(event)
-    db.commit()
-    AuditLogRepository.log_audit(
+
+    if event.parent_id is None:
+        condition = event_repo.series_scope(event.id)
+    else:
+        condition = event_repo.series_scope(event.parent_id, session_id=event.id)
+        parent = event_repo.get(db, event.parent_id)
+        if parent is not None and parent.lazy_sessions:
+            # Otherwise the rule would write the session again when it comes due
+            tz = ZoneInfo(parent.recurrence_timezone or "UTC")
+            day = as_utc(event.start_time).astimezone(tz).date().isoformat()
+            parent.recurrence_exclusions = [*(parent.recurrence_exclusions or []), day]
+    deleted = event_deleter.mark_deleted(db, condition)
+    AuditLogRepository.add_audit(
         db,
         action="delete_event",
         user_email=user.email,
         timestamp=datetime.utcnow(),
         resource_type="event",
         resource_id=str(event.id),
-        details=f"Deleted event: {event.name}",
+        details=f"Deleted event: {event.name}" + (f" and {len(deleted) - 1} session(s)" if len(deleted) > 1 else ""),
         comment=comment
     )
-    return {"detail": "Event deleted"}
+    db.commit()
+    token_index.invalidate(event_ids=deleted)
+    # Sessions first so deleting the parent does not cascade over them
+    job = event_deleter.submit(sorted(deleted, key=lambda i: i == event.id))
+    return {"detail": "Event deletion scheduled", "job_id": job.id, "events": len(deleted)}
+
+
+@router.get("/delete-jobs/{job_id}")
+def get_delete_job(job_id: str, user: Principal = Depends(get_current_principal)):
+    """Progress of a background event delete accepted by this worker"""
+    job = event_deleter.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Delete job not found")
+    return job.as_dict()
 
 @router.get("/{parent_id}/family", response_model=EventFamilyOut)
 def get_event_family(parent_id: int, db: Session = Depends(get_db)):
@@ -659,13 +1052,14 @@ def get_event_family(parent_id: int, db: Session = Depends(get_db)):
     if parent.start_time.tzinfo is None:
         parent.start_time = parent.start_time.replace(tzinfo=timezone.utc)
 
-    # Fetch children
+    # Fetch children (plus the not yet written sessions of a lazy series)
     children = (
         db.query(Event)
         .filter(Event.parent_id == parent_id)
         .order_by(Event.start_time)
         .all()
     )
+    expand_lazy_series(db, [parent], {parent.id: children}, now)
 
     for child in children:
         if child.start_time.tzinfo is None:
@@ -676,18 +1070,14 @@ def get_event_family(parent_id: int, db: Session = Depends(get_db)):
 
     # Count total past sessions (parent counts as one if in the past)
     total_past_sessions = len(past_children)
-    if parent.start_time < now:
+    if as_utc(parent.start_time) < now:
         total_past_sessions += 1
 
-    # Get parent members
-    members = event_member_repo.list_members_for_parent(db, parent_id)
+    # Parent members with their attended counts, in one grouped query
+    members = event_member_repo.member_attendance_for_series(db, parent_id)
 
     member_summaries = []
-    for m in members:
-        attended = event_member_repo.get_member_attendance_count(
-            db, parent_id, m.user_id
-        )
-
+    for m, attended in members:
         missed = max(total_past_sessions - attended, 0)
 
         is_flagged = (
@@ -714,14 +1104,15 @@ def get_event_family(parent_id: int, db: Session = Depends(get_db)):
         notes=parent.notes,
         checkin_open_minutes=parent.checkin_open_minutes,
         checkin_token=parent.checkin_token,
-        attendance_count = att_repo.count_for_event(db, parent.id),      
+        attendance_count=parent.attendance_count,
         recurring=parent.recurring,
         weekdays=parent.weekdays,
         end_date=serialize_datetime(parent.end_date) if parent.end_date else None,
         parent_id=parent.parent_id,
         organizer_name=parent.organizer.name if parent.organizer else None,
         attendance_threshold=parent.attendance_threshold,
-        member_count=len(members)
+        member_count=parent.member_count,
+        lazy_sessions=parent.lazy_sessions
     )
 
     # ---- SessionOut for children ----
@@ -782,37 +1173,18 @@ class DashboardRecurringGroup(BaseModel):
 @router.get("/dashboard/events", response_model=DashboardEventsOut)
 def get_dashboard_events(
     db: Session = Depends(get_db),
-    user: User = Depends(require_any_role(UserRole.ORGANIZER, UserRole.ADMIN)),
+    user: Principal = Depends(require_any_role(UserRole.ORGANIZER, UserRole.ADMIN)),
 ):
     now = datetime.now(timezone.utc)
 
     # ----------------------------------------
-    # 1. Fetch solo parents (not recurring)
+    # 1. Fetch all parents and every child session in bulk
+    #    (counts come from the denormalized event columns)
     # ----------------------------------------
-    solo_events = (
-        db.query(Event)
-        .filter(
-            Event.organizer_id == user.id,
-            Event.parent_id == None,
-            Event.recurring == False,
-        )
-        .order_by(Event.start_time)
-        .all()
-    )
-
-    # ----------------------------------------
-    # 2. Fetch recurring parents
-    # ----------------------------------------
-    recurring_parents = (
-        db.query(Event)
-        .filter(
-            Event.organizer_id == user.id,
-            Event.parent_id == None,
-            Event.recurring == True,
-        )
-        .order_by(Event.start_time)
-        .all()
-    )
+    parents, children_by_parent = event_repo.series_for_organizer(db, user.id)
+    expand_lazy_series(db, parents, children_by_parent, now)
+    solo_events = [p for p in parents if not p.recurring]
+    recurring_parents = [p for p in parents if p.recurring]
 
     # ----------------------------------------
     # Prepare output buckets
@@ -821,7 +1193,7 @@ def get_dashboard_events(
     past_list = []
 
     # ----------------------------------------
-    # 3. Process solo events
+    # 2. Process solo events
     # ----------------------------------------
     for ev in solo_events:
         wrapped = DashboardSoloEvent(
@@ -834,42 +1206,37 @@ def get_dashboard_events(
                 notes=ev.notes,
                 checkin_open_minutes=ev.checkin_open_minutes,
                 checkin_token=ev.checkin_token,
-                attendance_count=att_repo.count_for_event(db, ev.id),
+                attendance_count=ev.attendance_count,
                 recurring=ev.recurring,
                 weekdays=ev.weekdays,
                 end_date=serialize_datetime(ev.end_date) if ev.end_date else None,
                 parent_id=ev.parent_id,
-                member_count=len(event_member_repo.list_members(db, ev.id))
+                member_count=ev.member_count
             )
         )
 
-        if ev.end_time >= now:
+        if as_utc(ev.end_time) >= now:
             upcoming_list.append(wrapped)
         else:
             past_list.append(wrapped)
 
     # ----------------------------------------
-    # 4. Process recurring groups
+    # 3. Process recurring groups
     # ----------------------------------------
     for parent in recurring_parents:
 
-        children = (
-            db.query(Event)
-            .filter(Event.parent_id == parent.id)
-            .order_by(Event.start_time)
-            .all()
-        )
+        children = children_by_parent[parent.id]
 
         # Convert children → SessionOut list
         children_out = [SessionOut.model_validate(ch) for ch in children]
 
         # Split by time
-        past_children = [ch for ch in children if ch.start_time < now]
-        upcoming_children = [ch for ch in children if ch.start_time >= now]
+        past_children = [ch for ch in children if as_utc(ch.start_time) < now]
+        upcoming_children = [ch for ch in children if as_utc(ch.start_time) >= now]
 
         # Total past sessions includes parent session
         total_past_sessions = len(past_children)
-        if parent.start_time < now:
+        if as_utc(parent.start_time) < now:
             total_past_sessions += 1
 
         # --------------------------------------------------
@@ -880,11 +1247,11 @@ def get_dashboard_events(
         all_sessions = [parent] + children
 
         # Sort by start time
-        all_sorted = sorted(all_sessions, key=lambda e: e.start_time)
+        all_sorted = sorted(all_sessions, key=lambda e: as_utc(e.start_time))
 
         # 1. Check for a currently active session
         active_raw = next(
-            (ev for ev in all_sorted if ev.start_time <= now <= ev.end_time),
+            (ev for ev in all_sorted if as_utc(ev.start_time) <= now <= as_utc(ev.end_time)),
             None
         )
 
@@ -893,7 +1260,7 @@ def get_dashboard_events(
         else:
             # 2. First session in the future
             next_session_raw = next(
-                (ev for ev in all_sorted if ev.start_time >= now),
+                (ev for ev in all_sorted if as_utc(ev.start_time) >= now),
                 None
             )
 
@@ -918,12 +1285,12 @@ def get_dashboard_events(
                 notes=parent.notes,
                 checkin_open_minutes=parent.checkin_open_minutes,
                 checkin_token=parent.checkin_token,
-                attendance_count=att_repo.count_for_event(db, parent.id),
+                attendance_count=parent.attendance_count,
                 recurring=parent.recurring,
                 weekdays=parent.weekdays,
                 end_date=serialize_datetime(parent.end_date) if parent.end_date else None,
                 parent_id=parent.parent_id,
-                member_count=len(event_member_repo.list_members(db, parent.id)),
+                member_count=parent.member_count,
                 attendance_threshold=parent.attendance_threshold
             ),
             children=children_out,
@@ -969,52 +1336,35 @@ class MyEventsOut(BaseModel):
 @router.get("/attendee/my-events", response_model=MyEventsOut)
 def get_my_events(
     db: Session = Depends(get_db),
-    user: User = Depends(require_any_role(UserRole.ATTENDEE, UserRole.ORGANIZER, UserRole.ADMIN)),
+    user: Principal = Depends(require_any_role(UserRole.ATTENDEE, UserRole.ORGANIZER, UserRole.ADMIN)),
 ):
     now = datetime.now(timezone.utc)
 
-    # 1. Get ALL event_members rows for this user
-    memberships = event_member_repo.get_events_for_user(db, user.id)
-    if not memberships:
+    # 1. The user's recurring series and all their sessions, then the set of
+    #    sessions the user attended; everything else is computed in memory
+    parents, children_by_parent = event_repo.series_for_member(db, user.id)
+    expand_lazy_series(db, parents, children_by_parent, now)
+    if not parents:
         return MyEventsOut(events=[])
+    attended_ids = att_repo.attended_in_series(db, user.id, [p.id for p in parents])
 
     results = []
 
-    for mem in memberships:
-        event = db.get(Event, mem.event_id)
-
-        # Skip solo events or child events
-        if not event or not event.recurring or event.parent_id is not None:
-            continue
-
-        parent = event
-
-        # -----------------------------
-        # Load children
-        # -----------------------------
-        children = (
-            db.query(Event)
-            .filter(Event.parent_id == parent.id)
-            .order_by(Event.start_time)
-            .all()
-        )
-
-        children_out = [SessionOut.model_validate(c) for c in children]
+    for parent in parents:
+        children = children_by_parent[parent.id]
 
         # -----------------------------
         # Past / upcoming
         # -----------------------------
-        past_children = [c for c in children if c.start_time < now]
-        upcoming_children = [c for c in children if c.start_time >= now]
+        past_children = [c for c in children if as_utc(c.start_time) < now]
+        upcoming_children = [c for c in children if as_utc(c.start_time) >= now]
 
         total_past_sessions = len(past_children)
-        if parent.start_time < now:
+        if as_utc(parent.start_time) < now:
             total_past_sessions += 1
 
         # Attendance for THIS user
-        attended_count = event_member_repo.get_member_attendance_count(
-            db, parent.id, user.id
-        )
+        attended_count = sum(1 for e in [parent, *children] if e.id in attended_ids)
         missed_count = max(total_past_sessions - attended_count, 0)
 
         flagged = (
@@ -1027,7 +1377,7 @@ def get_my_events(
         # -----------------------------
         next_session_raw = None
 
-        if parent.start_time >= now:
+        if as_utc(parent.start_time) >= now:
             next_session_raw = parent
         elif upcoming_children:
             next_session_raw = upcoming_children[0]
@@ -1049,12 +1399,12 @@ def get_my_events(
             notes=parent.notes,
             checkin_open_minutes=parent.checkin_open_minutes,
             checkin_token=parent.checkin_token,
-            attendance_count=att_repo.count_for_event(db, parent.id),
+            attendance_count=parent.attendance_count,
             recurring=parent.recurring,
             weekdays=parent.weekdays,
             end_date=serialize_datetime(parent.end_date) if parent.end_date else None,
             parent_id=parent.parent_id,
-            member_count=len(event_member_repo.list_members(db, parent.id)),
+            member_count=parent.member_count,
             attendance_threshold=parent.attendance_threshold
         )
 
@@ -1092,7 +1442,7 @@ class MyEventDetails(BaseModel):
 def get_attendee_event_details(
     parent_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(require_any_role(UserRole.ATTENDEE, UserRole.ORGANIZER, UserRole.ADMIN)),
+    user: Principal = Depends(require_any_role(UserRole.ATTENDEE, UserRole.ORGANIZER, UserRole.ADMIN)),
 ):
     now = datetime.now(timezone.utc)
 
@@ -1103,24 +1453,17 @@ def get_attendee_event_details(
     if not parent.recurring or parent.parent_id is not None:
         raise HTTPException(400, "Not a recurring parent event")
 
-    # Confirm membership
-    membership = (
-        db.query(EventMember)
-        .filter(EventMember.user_id == user.id, EventMember.event_id == parent_id)
-        .first()
-    )
-    if not membership:
-        raise HTTPException(403, "Not a member of this event")
-
     # -----------------------------------------------------------
-    # Load child sessions
+    # Confirm membership and load child sessions
     # -----------------------------------------------------------
-    children = (
-        db.query(Event)
-        .filter(Event.parent_id == parent.id)
-        .order_by(Event.start_time)
-        .all()
-    )
+    series, children_by_parent = event_repo.series_for_member(db, user.id, parent_id)
+    expand_lazy_series(db, series, children_by_parent, now)
+    if not series:
+        raise HTTPException(403, "Not a member of this event")
+    children = children_by_parent[parent.id]
+
+    # Every session of the series the user checked in to
+    attended_ids = att_repo.attended_in_series(db, user.id, [parent.id])
 
     # Helper for SessionOut
     def make_session_out(e: Event) -> SessionOut:
@@ -1134,7 +1477,7 @@ def get_attendee_event_details(
 
     # Helper: Did user attend this event?
     def did_attend(e: Event) -> bool:
-        return att_repo.get_by_event_and_user(db, e.id, user.id) is not None
+        return e.id in attended_ids
 
 
     # -----------------------------------------------------------
@@ -1154,24 +1497,22 @@ def get_attendee_event_details(
     # -----------------------------------------------------------
     past_sessions = [
         w for w in wrapped_children
-        if w.session.start_time < now
+        if as_utc(w.session.start_time) < now
     ]
 
     upcoming_sessions = [
         w for w in wrapped_children
-        if w.session.start_time >= now
+        if as_utc(w.session.start_time) >= now
     ]
 
     # -----------------------------------------------------------
     # Attendance counts across the entire series
     # -----------------------------------------------------------
     total_past_sessions = len(past_sessions)
-    if parent.start_time < now:
+    if as_utc(parent.start_time) < now:
         total_past_sessions += 1  # parent session counts as first
 
-    attended_count = event_member_repo.get_member_attendance_count(
-        db, parent.id, user.id
-    )
+    attended_count = len(attended_ids)
 
     missed_count = max(total_past_sessions - attended_count, 0)
 
@@ -1183,7 +1524,7 @@ def get_attendee_event_details(
     # -----------------------------------------------------------
     # Next session (parent might be upcoming)
     # -----------------------------------------------------------
-    if parent.start_time >= now:
+    if as_utc(parent.start_time) >= now:
         next_session = make_session_out(parent)
     elif upcoming_sessions:
         next_session = upcoming_sessions[0].session
@@ -1207,7 +1548,7 @@ def get_attendee_event_details(
         checkin_open_minutes=parent.checkin_open_minutes,
         notes=parent.notes,
         checkin_token=parent.checkin_token,
-        attendance_count=att_repo.count_for_event(db, parent.id),
+        attendance_count=parent.attendance_count,
     )
 
     # -----------------------------------------------------------
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+
+from app.api.deps import require_any_role, jwks_cache, token_cache, principal_cache
+from app.core.principal import Principal
+from app.models.user import UserRole
+from app.services.profile_writer import profile_writer
+from app.services.audit_sink import audit_sink
+from app.services.token_index import token_index
+from app.services.checkin_batcher import checkin_batcher
+from app.services.attendance_stream import attendance_broker
+from app.services.recurrence import recurrence
+from app.services.event_deleter import event_deleter
+
+router = APIRouter()
+
+
+@router.get("/")
+def get_metrics(admin: Principal = Depends(require_any_role(UserRole.ADMIN))):
+    """In-process cache and queue counters for this worker (admin only)"""
+    return {
+        "jwks_cache": jwks_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "profile_writes": profile_writer.stats(),
+        "audit_sink": audit_sink.stats(),
+        "checkin_token_index": token_index.stats(),
+        "checkin_batcher": checkin_batcher.stats(),
+        "attendance_stream": attendance_broker.stats(),
+        "recurrence_cache": recurrence.stats(),
+        "event_deletes": event_deleter.stats(),
+    }
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from app.api.deps import get_current_user, get_db, require_any_role
+from app.api.deps import get_current_principal, get_db, require_any_role, invalidate_principal
+from app.core.principal import Principal
 from app.models.user import User, UserRole
 from app.repositories.user_repo import UserRepository
 from app.repositories.audit_log_repo import AuditLogRepository
@@ -30,7 +31,7 @@ class UserCreate(BaseModel):
 
 
 @router.get("/me", response_model=MeResponse)
-def me(user = Depends(get_current_user)):
+def me(user: Principal = Depends(get_current_principal)):
     all_roles = sorted([r.value for r in user.roles()])
     primary_role = user.primary_role().value
     
@@ -55,7 +56,7 @@ class UserOut(BaseModel):
 @router.get("/", response_model=list[UserOut])
 def list_users(
     db: Session = Depends(get_db),
-    admin: User = Depends(require_any_role(UserRole.ADMIN, UserRole.ORGANIZER))
+    admin: Principal = Depends(require_any_role(UserRole.ADMIN, UserRole.ORGANIZER))
 ):
     users = db.query(User).all()
     return [
@@ -73,7 +74,7 @@ def promote_to_organizer(
     user_id: int,
     comment: str | None = Query(None, description="Optional admin comment for audit log"),
     db: Session = Depends(get_db),
-    admin: User = Depends(require_any_role(UserRole.ADMIN))
+    admin: Principal = Depends(require_any_role(UserRole.ADMIN))
 ):
     user = db.query(User).get(user_id)
     if not user:
@@ -82,8 +83,7 @@ def promote_to_organizer(
         if comment is None or (isinstance(comment, str) and comment.strip() == ""):
             raise HTTPException(status_code=400, detail="Comment is required for this action")
     user.add_role(UserRole.ORGANIZER)
-    db.commit()
-    AuditLogRepository.log_audit(
+    AuditLogRepository.add_audit(
         db,
         action="promote_to_organizer",
         user_email=admin.email,
@@ -93,6 +93,8 @@ def promote_to_organizer(
         details=f"Promoted to organizer: {user.email}",
         comment=comment
     )
+    db.commit()
+    invalidate_principal(user.id)
     return {"detail": "User promoted to organizer"}
 
 
@@ -101,7 +103,7 @@ def revoke_organizer(
     user_id: int,
     comment: str | None = Query(None, description="Optional admin comment for audit log"),
     db: Session = Depends(get_db),
-    admin: User = Depends(require_any_role(UserRole.ADMIN))
+    admin: Principal = Depends(require_any_role(UserRole.ADMIN))
 ):
     user = db.query(User).get(user_id)
     if not user:
@@ -110,8 +112,7 @@ def revoke_organizer(
         if comment is None or (isinstance(comment, str) and comment.strip() == ""):
             raise HTTPException(status_code=400, detail="Comment is required for this action")
     user.remove_role(UserRole.ORGANIZER)
-    db.commit()
-    AuditLogRepository.log_audit(
+    AuditLogRepository.add_audit(
         db,
         action="revoke_organizer",
         user_email=admin.email,
@@ -121,6 +122,8 @@ def revoke_organizer(
         details=f"Revoked organizer: {user.email}",
         comment=comment
     )
+    db.commit()
+    invalidate_principal(user.id)
     return {"detail": "Organizer role revoked"}
 
 
@@ -129,7 +132,7 @@ def delete_user(
     user_id: int,
     comment: str | None = Query(None, description="Optional admin comment for audit log"),
     db: Session = Depends(get_db),
-    admin: User = Depends(require_any_role(UserRole.ADMIN))
+    admin: Principal = Depends(require_any_role(UserRole.ADMIN))
 ):
     user = db.query(User).get(user_id)
     if not user:
@@ -137,9 +140,8 @@ def delete_user(
     if not is_testing_runtime() and enforce_comment_runtime():
         if comment is None or (isinstance(comment, str) and comment.strip() == ""):
             raise HTTPException(status_code=400, detail="Comment is required for this action")
-    db.delete(user)
-    db.commit()
-    AuditLogRepository.log_audit(
+    UserRepository().delete(db, user.id)
+    AuditLogRepository.add_audit(
         db,
         action="delete_user",
         user_email=admin.email,
@@ -149,6 +151,8 @@ def delete_user(
         details=f"Deleted user: {user.email}",
         comment=comment
     )
+    db.commit()
+    invalidate_principal(user_id)
     return {"detail": "User deleted"}
 
 @router.post("/", status_code=201)
@@ -156,7 +160,7 @@ def create_user(
     user_in: UserCreate,
     comment: str | None = Query(None, description="Optional admin comment for audit log"),
     db: Session = Depends(get_db),
-    admin: User = Depends(require_any_role(UserRole.ADMIN))
+    admin: Principal = Depends(require_any_role(UserRole.ADMIN))
 ):
     # Check if user already exists
     if db.query(User).filter(User.email == user_in.email).first():
@@ -173,10 +177,7 @@ def create_user(
     for role in user_in.roles:
         user.add_role(role)
         
-    db.commit()
-    db.refresh(user)
-
-    AuditLogRepository.log_audit(
+    AuditLogRepository.add_audit(
         db,
         action="create_user",
         user_email=admin.email,
@@ -186,4 +187,6 @@ def create_user(
         details=f"Created user: {user.email}",
         comment=comment
     )
+    db.commit()
+    db.refresh(user)
     return {"id": user.id, "email": user.email, "name": user.name, "roles": [r.role for r in user.role_assignments]}
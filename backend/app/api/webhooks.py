@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 import logging
 
-from app.api.deps import get_db
+from app.api.deps import get_db, invalidate_principal
 from app.repositories.user_repo import UserRepository
 
 logger = logging.getLogger(__name__)
@@ -43,6 +43,7 @@ async def auth0_user_deleted(
         # Delete the user from local database
         user_repo.delete(db, user.id)
         db.commit()
+        invalidate_principal(user.id)
         
         logger.info(f"Successfully deleted user {user.email} (ID: {user.id}) from local database")
         
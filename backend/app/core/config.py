@@ -21,6 +21,54 @@ class Settings(BaseModel):
     # access tokens using the tenant JWKS and require the configured audience.
     AUTH0_DOMAIN: str = os.getenv("AUTH0_DOMAIN", "")  # e.g. dev-xxx.us.auth0.com
     AUTH0_AUDIENCE: str = os.getenv("AUTH0_AUDIENCE", "")  # e.g. https://attendance-api
+    # JWKS endpoint override (defaults to https://<AUTH0_DOMAIN>/.well-known/jwks.json)
+    AUTH0_JWKS_URL: str = os.getenv("AUTH0_JWKS_URL", "")
+    # How long fetched signing keys are trusted before the JWKS is refetched
+    AUTH0_JWKS_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH0_JWKS_CACHE_TTL_SECONDS", "600"))
+    # Minimum gap between refetches triggered by an unknown kid (guards against kid spraying)
+    AUTH0_JWKS_MIN_REFRESH_SECONDS: int = int(os.getenv("AUTH0_JWKS_MIN_REFRESH_SECONDS", "30"))
+    # Verified tokens cached (by hash) until their exp claim
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    # Authenticated principals (id, email, name, roles) cached per token subject
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+    # Auth0 profile backfills are queued and written in batches this often
+    PROFILE_WRITE_FLUSH_SECONDS: float = float(os.getenv("PROFILE_WRITE_FLUSH_SECONDS", "5"))
+    # Audit durability: "transaction" (commit with the action), "async" (batched
+    # background writes) or "drop" (async, dropping rows when the queue is full)
+    AUDIT_MODE: str = os.getenv("AUDIT_MODE", "async")
+    AUDIT_QUEUE_SIZE: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_SECONDS: float = float(os.getenv("AUDIT_FLUSH_SECONDS", "1"))
+    # Check-in token -> event window index (per process)
+    CHECKIN_TOKEN_INDEX_SIZE: int = int(os.getenv("CHECKIN_TOKEN_INDEX_SIZE", "50000"))
+    CHECKIN_TOKEN_INDEX_TTL_SECONDS: int = int(os.getenv("CHECKIN_TOKEN_INDEX_TTL_SECONDS", "300"))
+    CHECKIN_TOKEN_NEGATIVE_CACHE_SIZE: int = int(os.getenv("CHECKIN_TOKEN_NEGATIVE_CACHE_SIZE", "10000"))
+    CHECKIN_TOKEN_NEGATIVE_TTL_SECONDS: int = int(os.getenv("CHECKIN_TOKEN_NEGATIVE_TTL_SECONDS", "60"))
+    # Events starting within this many hours are indexed at startup
+    CHECKIN_TOKEN_PRELOAD_HOURS: int = int(os.getenv("CHECKIN_TOKEN_PRELOAD_HOURS", "24"))
+    # Burst mode: check-ins are queued and committed in groups by one writer
+    CHECKIN_BURST_MODE: bool = os.getenv("CHECKIN_BURST_MODE", "").lower() in ("1", "true", "yes")
+    CHECKIN_BATCH_MAX_SIZE: int = int(os.getenv("CHECKIN_BATCH_MAX_SIZE", "200"))
+    CHECKIN_BATCH_MAX_WAIT_MS: float = float(os.getenv("CHECKIN_BATCH_MAX_WAIT_MS", "10"))
+    # Signed rotating QR tokens: HMAC key (defaults to SECRET_KEY) and rotation period
+    QR_TOKEN_SECRET: str = os.getenv("QR_TOKEN_SECRET", "") or os.getenv("SECRET_KEY", "dev-secret-key-change")
+    QR_TOKEN_ROTATION_SECONDS: int = int(os.getenv("QR_TOKEN_ROTATION_SECONDS", "30"))
+    # Live attendance streams (SSE): per-stream queue bound, idle keepalive, and the
+    # PostgreSQL LISTEN/NOTIFY bridge that fans check-ins out across workers
+    ATTENDANCE_STREAM_QUEUE_SIZE: int = int(os.getenv("ATTENDANCE_STREAM_QUEUE_SIZE", "1000"))
+    ATTENDANCE_STREAM_HEARTBEAT_SECONDS: float = float(os.getenv("ATTENDANCE_STREAM_HEARTBEAT_SECONDS", "15"))
+    ATTENDANCE_STREAM_PG_NOTIFY: bool = os.getenv("ATTENDANCE_STREAM_PG_NOTIFY", "").lower() in ("1", "true", "yes")
+    # Lazy recurring series: sessions whose check-in window opens within this many
+    # minutes are written as rows; open-ended series are shown this many days ahead
+    RECURRENCE_MATERIALIZE_LEAD_MINUTES: int = int(os.getenv("RECURRENCE_MATERIALIZE_LEAD_MINUTES", "60"))
+    RECURRENCE_OPEN_ENDED_DAYS: int = int(os.getenv("RECURRENCE_OPEN_ENDED_DAYS", "120"))
+    # Memoized recurrence rule expansions (per process)
+    RECURRENCE_CACHE_SIZE: int = int(os.getenv("RECURRENCE_CACHE_SIZE", "1024"))
+    # Rows removed per transaction when purging deleted events in the background
+    EVENT_DELETE_CHUNK_SIZE: int = int(os.getenv("EVENT_DELETE_CHUNK_SIZE", "5000"))
+    # Attendance rows fetched per server-side cursor batch (and per streamed chunk) in CSV exports
+    CSV_EXPORT_YIELD_PER: int = int(os.getenv("CSV_EXPORT_YIELD_PER", "1000"))
     # Testing flag: explicit TESTING env wins; otherwise infer from pytest
     TESTING: bool = (
         os.getenv("TESTING").lower() in ("1", "true", "yes")
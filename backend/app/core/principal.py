@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Iterable
+from app.models.user import User, UserRole
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Authenticated caller: identity and roles, detached from any DB session.
+
+    Mirrors the read-only parts of ``User`` (``roles()``, ``has_any_role()``,
+    ``primary_role()``) so route handlers can use either.
+    """
+
+    id: int
+    email: str
+    name: str
+    role_set: frozenset[UserRole]
+    auth0_sub: str | None = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            role_set=frozenset(user.roles()),
+            auth0_sub=user.auth0_sub,
+        )
+
+    def roles(self) -> frozenset[UserRole]:
+        return self.role_set
+
+    def has_role(self, role: UserRole) -> bool:
+        return role in self.role_set
+
+    def has_any_role(self, roles: Iterable[UserRole]) -> bool:
+        return any(r in self.role_set for r in roles)
+
+    def primary_role(self) -> UserRole:
+        """Get primary role with precedence: admin > organizer > attendee"""
+        if UserRole.ADMIN in self.role_set:
+            return UserRole.ADMIN
+        if UserRole.ORGANIZER in self.role_set:
+            return UserRole.ORGANIZER
+        return UserRole.ATTENDEE
@@ -0,0 +1,76 @@
+"""Signed, rotating check-in QR tokens.
+
+A signed token carries everything a scan needs to be rejected: the event id,
+the check-in window bounds and the rotation epoch, protected by an HMAC over
+the payload. Forged, stale and out-of-window scans are turned away without a
+database lookup. The epoch advances every QR_TOKEN_ROTATION_SECONDS, so a
+screenshot stops working shortly after it is taken; the previous epoch is still
+accepted to cover a scan that races a rotation.
+
+Format: ``q1.<event_id>.<opens_at>.<closes_at>.<epoch>.<signature>``, with the
+bounds as Unix seconds and the signature a truncated base64url HMAC-SHA256.
+Static ``secrets.token_urlsafe`` tokens never contain a ``.``, so both formats
+can share the same endpoints.
+"""
+import base64
+import hashlib
+import hmac
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+PREFIX = "q1."
+
+# Bytes of the HMAC kept in the token; 128 bits keeps the QR code small
+_SIGNATURE_BYTES = 16
+
+
+@dataclass(frozen=True, slots=True)
+class SignedToken:
+    event_id: int
+    opens_at: int
+    closes_at: int
+    epoch: int
+
+    def is_current(self, now: datetime, rotation_seconds: int) -> bool:
+        current = int(now.timestamp()) // rotation_seconds
+        return current - 1 <= self.epoch <= current
+
+    def is_open(self, now: datetime) -> bool:
+        return self.opens_at <= now.timestamp() <= self.closes_at
+
+
+def is_signed(token: str) -> bool:
+    return token.startswith(PREFIX)
+
+
+def _sign(payload: str, secret: str) -> str:
+    digest = hmac.new(secret.encode(), payload.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:_SIGNATURE_BYTES]).rstrip(b"=").decode()
+
+
+def issue(
+    event_id: int,
+    opens_at: datetime,
+    closes_at: datetime,
+    now: datetime,
+    secret: str,
+    rotation_seconds: int,
+) -> tuple[str, datetime]:
+    """Signed token for the current epoch and the time it stops being accepted"""
+    epoch = int(now.timestamp()) // rotation_seconds
+    payload = f"{PREFIX}{event_id}.{int(opens_at.timestamp())}.{int(closes_at.timestamp())}.{epoch}"
+    expires_at = datetime.fromtimestamp((epoch + 2) * rotation_seconds, timezone.utc)
+    return f"{payload}.{_sign(payload, secret)}", expires_at
+
+
+def decode(token: str, secret: str) -> SignedToken | None:
+    """Verify the signature and parse the claims; None for anything malformed or forged"""
+    payload, _, signature = token.rpartition(".")
+    # Compared as bytes: compare_digest raises TypeError on non-ASCII str
+    if not payload.startswith(PREFIX) or not hmac.compare_digest(signature.encode(), _sign(payload, secret).encode()):
+        return None
+    try:
+        event_id, opens_at, closes_at, epoch = (int(p) for p in payload[len(PREFIX):].split("."))
+    except ValueError:
+        return None
+    return SignedToken(event_id, opens_at, closes_at, epoch)
@@ -8,6 +8,12 @@ from sqlalchemy.orm import Session
 from app.models.user import User, UserRole
 from app.models.user_role import UserRoleAssignment
 from app.core.security import get_password_hash
+from app.services.profile_writer import profile_writer
+from app.services.audit_sink import audit_sink
+from app.services.token_index import token_index
+from app.services.checkin_batcher import checkin_batcher
+from app.services.attendance_stream import attendance_broker
+from app.services.event_deleter import event_deleter
 
 
 app = FastAPI(title=settings.PROJECT_NAME)
@@ -18,6 +24,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursors for incremental polling and paged listings, and the approximate
+    # total sent with the admin event listing
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 app.include_router(api_router)
@@ -63,3 +72,30 @@ def on_startup():
     except Exception as e:
         print(f"⚠️  Startup seeding failed: {e}")
         print("   Make sure to run 'alembic upgrade head' to create tables first!")
+
+    try:
+        # Warm the check-in token index for today's events before the first scans
+        with Session(bind=engine) as db:
+            token_index.preload(db, settings.CHECKIN_TOKEN_PRELOAD_HOURS)
+    except Exception as e:
+        print(f"⚠️  Check-in token preload failed: {e}")
+
+    profile_writer.start()
+    audit_sink.start()
+    attendance_broker.start(settings.DATABASE_URL)
+
+    try:
+        # Finish deletes interrupted by the last shutdown
+        event_deleter.resume()
+    except Exception as e:
+        print(f"⚠️  Resuming event deletes failed: {e}")
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # Persist queued profile backfills, grouped check-ins and audit rows before exit
+    profile_writer.stop()
+    checkin_batcher.stop()
+    audit_sink.stop()
+    attendance_broker.stop()
+    event_deleter.stop()
@@ -1,12 +1,17 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import String, ForeignKey, DateTime, UniqueConstraint, Index
 from app.models.base import Base, IDMixin
 from datetime import datetime
 
 
 class Attendance(IDMixin, Base):
     __tablename__ = "attendances"
-    __table_args__ = (UniqueConstraint("event_id", "attendee_id", name="uq_event_attendee"),)
+    __table_args__ = (
+        UniqueConstraint("event_id", "attendee_id", name="uq_event_attendee"),
+        # Cursor polling: roster deltas per event and check-in history per attendee
+        Index("ix_attendances_event_checked_in", "event_id", "checked_in_at", "id"),
+        Index("ix_attendances_attendee_checked_in", "attendee_id", "checked_in_at", "id"),
+    )
 
     event_id: Mapped[int] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
     attendee_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
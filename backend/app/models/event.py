@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey, DateTime, Integer, Boolean, JSON
+from sqlalchemy import String, ForeignKey, DateTime, Integer, Boolean, JSON, Index, false
 from typing import List
 from app.models.base import Base, IDMixin
 from datetime import datetime
@@ -7,6 +7,13 @@ from datetime import datetime
 
 class Event(IDMixin, Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pages of the admin listing, overall and per organizer
+        Index("ix_events_start_time_id", "start_time", "id"),
+        Index("ix_events_organizer_start_time", "organizer_id", "start_time", "id"),
+        # One row per session of a series; lets lazy series materialize idempotently
+        Index("uq_events_parent_start_time", "parent_id", "start_time", unique=True),
+    )
 
     name: Mapped[str] = mapped_column(String(255))
     location: Mapped[str] = mapped_column(String(255))
@@ -20,14 +27,30 @@ class Event(IDMixin, Base):
     recurring: Mapped[bool] = mapped_column(Boolean, default=False)
     weekdays: Mapped[List[str] | None] = mapped_column(JSON, default=None)
     end_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
-    parent_id: Mapped[int | None] = mapped_column(Integer, default=None)
+    parent_id: Mapped[int | None] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"), default=None)
+    # Lazy series store only the rule (weekdays, end_date, the parent's local
+    # times in this IANA zone); session rows are written as they come due
+    lazy_sessions: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
+    recurrence_timezone: Mapped[str | None] = mapped_column(String(64), default=None)
+    # Every n weeks, and "YYYY-MM-DD" / "YYYY-MM-DD/YYYY-MM-DD" dates the series skips
+    recurrence_interval: Mapped[int] = mapped_column(Integer, default=1, server_default="1", nullable=False)
+    recurrence_exclusions: Mapped[List[str] | None] = mapped_column(JSON, default=None)
 
     #attendance threshold
     attendance_threshold: Mapped[int | None] = mapped_column(Integer, default=None)
+
+    # Denormalized counters, kept in step by app.services.event_counters
+    attendance_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    member_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+
+    # Set when a delete is accepted; hidden from ORM queries until
+    # app.services.event_deleter purges the row
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
     
 
     organizer_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     organizer = relationship("User", back_populates="events", passive_deletes=True)
-    members = relationship("EventMember", back_populates="event", cascade="all, delete-orphan")
+    # Removed by the database (ON DELETE CASCADE), never loaded just to be deleted
+    members = relationship("EventMember", back_populates="event", cascade="all, delete-orphan", passive_deletes=True)
 
-    attendances = relationship("Attendance", back_populates="event", cascade="all, delete-orphan")
+    attendances = relationship("Attendance", back_populates="event", cascade="all, delete-orphan", passive_deletes=True)
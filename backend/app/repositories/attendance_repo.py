@@ -1,7 +1,37 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import enum
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, func
-from app.repositories.base import BaseRepository
+from sqlalchemy import select, update, func, and_, literal, tuple_, DateTime, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from app.repositories.base import BaseRepository, is_postgres, dialect_insert, chunked
 from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.user import User
+from app.services.token_index import token_index, TokenWindow, UNKNOWN_TOKEN, WINDOW_COLUMNS
+from app.services.attendance_stream import attendance_broker
+from app.services import event_counters
+from app.core import qr_tokens
+from app.core.config import settings
+
+
+class CheckInStatus(str, enum.Enum):
+    CHECKED_IN = "checked_in"
+    DUPLICATE = "duplicate"
+    NOT_FOUND = "not_found"
+    NOT_OPEN = "not_open"
+    # Batch check-in only
+    UNKNOWN_USER = "unknown_user"
+    FORBIDDEN = "forbidden"
+
+
+@dataclass(frozen=True)
+class CheckInResult:
+    status: CheckInStatus
+    event_id: int | None = None
+    event_name: str | None = None
+    attendance_id: int | None = None
 
 
 class AttendanceRepository(BaseRepository[Attendance]):
@@ -14,17 +44,331 @@ class AttendanceRepository(BaseRepository[Attendance]):
     def list_for_event(self, db: Session, event_id: int):
         return db.execute(select(Attendance).where(Attendance.event_id == event_id)).scalars().all()
 
-    def get_by_attendee(self, db: Session, attendee_id: int):
-        """Get all check-ins for a specific attendee with event details"""
-        return db.execute(
+    def stream_snapshot(self, db: Session, event_id: int, after_id: int | None):
+        """Starting point for a live attendance stream: (count, last_id, counted, backlog).
+        ``counted`` holds the ids of every attendance committed so far, so a live
+        delta is recognised as already counted by id even when it committed out
+        of id order. Without ``after_id`` the count covers them all and last_id is
+        the highest. With it (a resumed stream) the (id, attendee_id, name,
+        checked_in_at) rows after that id, oldest first, are the backlog and the
+        count is of the rest; last_id is ``after_id``.
+        """
+        counted = set(db.execute(select(Attendance.id).where(Attendance.event_id == event_id)).scalars())
+        if after_id is None:
+            return len(counted), max(counted, default=0), counted, []
+        backlog = db.execute(
+            select(Attendance.id, Attendance.attendee_id, User.name, Attendance.checked_in_at)
+            .join(User, Attendance.attendee_id == User.id)
+            .where(Attendance.event_id == event_id, Attendance.id > after_id)
+            .order_by(Attendance.id)
+        ).all()
+        # A backlog row committed after the id query is counted through the backlog
+        counted.update(r.id for r in backlog)
+        return len(counted) - len(backlog), after_id, counted, backlog
+
+    def roster(self, db: Session, event_id: int, after: tuple[datetime, int] | None = None):
+        """(Attendance, User) rows for an event in check-in order. With ``after``,
+        only rows past that (checked_in_at, id) cursor position: an index range
+        scan on ix_attendances_event_checked_in. The cursor is best-effort for
+        live polling: checked_in_at is set before commit (and is the scan time
+        for batch uploads), so a row committed after a later one was read sits
+        behind the cursor and only appears on a full reload.
+        """
+        stmt = (
+            select(Attendance, User)
+            .join(User, Attendance.attendee_id == User.id)
+            .where(Attendance.event_id == event_id)
+            .order_by(Attendance.checked_in_at, Attendance.id)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Attendance.checked_in_at, Attendance.id) > tuple_(*after))
+        return db.execute(stmt).all()
+
+    def export_rows(self, db: Session, event_id: int, batch_size: int):
+        """(attendee_id, checked_in_at, name, email) for an event in check-in
+        order, as batches of ``batch_size`` rows read from a server-side cursor
+        (yield_per), so the roster is never held in memory at once.
+        """
+        result = db.execute(
+            select(Attendance.attendee_id, Attendance.checked_in_at, User.name, User.email)
+            .join(User, Attendance.attendee_id == User.id)
+            .where(Attendance.event_id == event_id)
+            .order_by(Attendance.checked_in_at, Attendance.id)
+            .execution_options(yield_per=batch_size)
+        )
+        return result.partitions()
+
+    def get_by_attendee(self, db: Session, attendee_id: int, after: tuple[datetime, int] | None = None):
+        """Get all check-ins for a specific attendee with event details, newest
+        first; with ``after``, only those past a (checked_in_at, id) cursor.
+        Best-effort like ``roster``: a row that commits behind the cursor is missed.
+        """
+        stmt = (
             select(Attendance)
             .options(joinedload(Attendance.event))
             .where(Attendance.attendee_id == attendee_id)
-            .order_by(Attendance.checked_in_at.desc())
-        ).scalars().all()
+            .order_by(Attendance.checked_in_at.desc(), Attendance.id.desc())
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Attendance.checked_in_at, Attendance.id) > tuple_(*after))
+        return db.execute(stmt).scalars().all()
+
+    def attended_in_series(self, db: Session, user_id: int, parent_ids) -> set[int]:
+        """Ids of the sessions of the given series (parents included) the user checked in to"""
+        attended: set[int] = set()
+        for chunk in chunked(list(parent_ids)):
+            attended.update(db.execute(
+                select(Attendance.event_id)
+                .join(Event, Event.id == Attendance.event_id)
+                .where(
+                    Attendance.attendee_id == user_id,
+                    func.coalesce(Event.parent_id, Event.id).in_(chunk),
+                )
+            ).scalars())
+        return attended
+
     def get_by_event_and_user(self, db: Session, event_id: int, user_id: int):
         """Get attendance record for a specific event and user"""
         return db.execute(
             select(Attendance)
             .where(Attendance.event_id == event_id, Attendance.attendee_id == user_id)
         ).scalar_one_or_none()
+
+    def check_in(self, db: Session, token: str, user_id: int, now: datetime) -> CheckInResult:
+        """Validate the token and check-in window and insert the attendance.
+        Does not commit, so the caller can add the audit row to the same transaction.
+        Tokens resolve through the in-memory token index: unknown tokens and closed
+        windows are answered without touching the database and an open window costs
+        one INSERT ... SELECT ... ON CONFLICT DO NOTHING, which only inserts while the
+        event is not (soft-)deleted. On an index miss PostgreSQL resolves
+        and inserts in a single statement; other dialects read the window first.
+        Signed QR tokens are verified in CPU before anything else.
+        """
+        if qr_tokens.is_signed(token):
+            window = self.resolve_window(db, token, now)
+            if isinstance(window, CheckInResult):
+                return window
+        else:
+            window = token_index.get(token)
+            if window is UNKNOWN_TOKEN:
+                return CheckInResult(CheckInStatus.NOT_FOUND)
+            if window is None:
+                if is_postgres(db):
+                    return self._check_in_unindexed(db, token, user_id, now)
+                window = token_index.load(db, token)
+                if window is None:
+                    return CheckInResult(CheckInStatus.NOT_FOUND)
+            if not window.is_open(now):
+                return CheckInResult(CheckInStatus.NOT_OPEN, window.event_id, window.name)
+
+        try:
+            # INSERT ... SELECT from the live event row: a window cached before
+            # the event was (soft-)deleted inserts nothing
+            attendance_id = db.execute(
+                dialect_insert(db, Attendance)
+                .from_select(
+                    ["event_id", "attendee_id", "checked_in_at"],
+                    select(Event.id, literal(user_id, Integer), literal(now, DateTime(timezone=True)))
+                    .where(Event.id == window.event_id, Event.deleted_at.is_(None))
+                    .with_for_update(read=True),
+                )
+                .on_conflict_do_nothing(index_elements=["event_id", "attendee_id"])
+                .returning(Attendance.id)
+            ).scalar_one_or_none()
+        except IntegrityError:
+            # Event deleted (by another worker) after it was indexed
+            db.rollback()
+            token_index.invalidate(token, event_ids=[window.event_id])
+            return CheckInResult(CheckInStatus.NOT_FOUND)
+        if attendance_id is None:
+            if not self.live_events(db, [window.event_id]):
+                token_index.invalidate(token, event_ids=[window.event_id])
+                return CheckInResult(CheckInStatus.NOT_FOUND)
+            return CheckInResult(CheckInStatus.DUPLICATE, window.event_id, window.name)
+        event_counters.bump(db, event_counters.ATTENDANCE, {window.event_id: 1})
+        return CheckInResult(CheckInStatus.CHECKED_IN, window.event_id, window.name, attendance_id)
+
+    def resolve_window(self, db: Session, token: str, now: datetime) -> TokenWindow | CheckInResult:
+        """The open check-in window for a static or signed token, or the rejection.
+        A signed token is only resolved against the event once its signature,
+        rotation epoch and embedded window have all been checked.
+        """
+        if qr_tokens.is_signed(token):
+            claims = qr_tokens.decode(token, settings.QR_TOKEN_SECRET)
+            if claims is None:
+                return CheckInResult(CheckInStatus.NOT_FOUND)
+            if not (claims.is_current(now, settings.QR_TOKEN_ROTATION_SECONDS) and claims.is_open(now)):
+                return CheckInResult(CheckInStatus.NOT_OPEN, claims.event_id)
+            window = token_index.lookup_event(db, claims.event_id)
+        else:
+            window = token_index.lookup(db, token)
+        if window is None:
+            return CheckInResult(CheckInStatus.NOT_FOUND)
+        if not window.is_open(now):
+            return CheckInResult(CheckInStatus.NOT_OPEN, window.event_id, window.name)
+        return window
+
+    def live_events(self, db: Session, event_ids) -> set[int]:
+        """The given events that are not soft-deleted. On PostgreSQL the rows are
+        share-locked until commit, so a concurrent delete waits for attendances
+        written against them and its purge then removes those too.
+        """
+        live: set[int] = set()
+        for chunk in chunked(sorted(set(event_ids))):
+            live.update(db.execute(
+                select(Event.id)
+                .where(Event.id.in_(chunk), Event.deleted_at.is_(None))
+                .order_by(Event.id)
+                .with_for_update(read=True)
+            ).scalars())
+        return live
+
+    def check_in_many(self, db: Session, records, organizer_id: int | None) -> list[CheckInStatus]:
+        """Check in many scanned records at once (kiosk / offline upload).
+        Each record has event_token, attendee_id or email, and scanned_at; events
+        and users are resolved with IN queries and all attendances are inserted
+        with ON CONFLICT DO NOTHING. ``organizer_id`` limits writes to that
+        organizer's events (None for admins). Returns one status per record, in
+        order. Does not commit; new check-ins are streamed once the caller does.
+        """
+        tokens = list({r.event_token for r in records})
+        events = {}
+        for chunk in chunked(tokens):
+            for row in db.execute(
+                select(Event.checkin_token, Event.organizer_id, *WINDOW_COLUMNS)
+                .where(Event.checkin_token.in_(chunk), Event.deleted_at.is_(None))
+                .with_for_update(read=True)
+            ):
+                events[row.checkin_token] = (row.organizer_id, TokenWindow.from_row(*row[2:]))
+
+        ids = list({r.attendee_id for r in records if r.attendee_id is not None})
+        emails = list({r.email for r in records if r.attendee_id is None and r.email})
+        names: dict[int, str] = {}
+        by_email: dict[str, int] = {}
+        for chunk in chunked(ids):
+            names.update(db.execute(select(User.id, User.name).where(User.id.in_(chunk))).all())
+        for chunk in chunked(emails):
+            for user_id, email, name in db.execute(
+                select(User.id, User.email, User.name).where(User.email.in_(chunk))
+            ):
+                by_email[email] = user_id
+                names[user_id] = name
+
+        statuses: list[CheckInStatus | None] = []
+        pending: dict[tuple[int, int], list[int]] = {}
+        rows = []
+        for i, r in enumerate(records):
+            event = events.get(r.event_token)
+            user_id = r.attendee_id if r.attendee_id in names else by_email.get(r.email)
+            scanned_at = r.scanned_at if r.scanned_at.tzinfo else r.scanned_at.replace(tzinfo=timezone.utc)
+            if event is None:
+                statuses.append(CheckInStatus.NOT_FOUND)
+            elif organizer_id is not None and event[0] != organizer_id:
+                statuses.append(CheckInStatus.FORBIDDEN)
+            elif user_id is None:
+                statuses.append(CheckInStatus.UNKNOWN_USER)
+            elif not event[1].is_open(scanned_at):
+                statuses.append(CheckInStatus.NOT_OPEN)
+            else:
+                statuses.append(None)
+                key = (event[1].event_id, user_id)
+                if key not in pending:
+                    rows.append({"event_id": key[0], "attendee_id": key[1], "checked_in_at": scanned_at})
+                pending.setdefault(key, []).append(i)
+
+        inserted: set[tuple[int, int]] = set()
+        if rows:
+            # executemany on the table: SQLAlchemy batches it into multi-row
+            # VALUES pages ("insertmanyvalues") without recompiling per page
+            table = Attendance.__table__
+            for row in db.execute(
+                dialect_insert(db, table)
+                .on_conflict_do_nothing(index_elements=["event_id", "attendee_id"])
+                .returning(table.c.id, table.c.event_id, table.c.attendee_id, table.c.checked_in_at),
+                rows,
+            ):
+                inserted.add((row.event_id, row.attendee_id))
+                attendance_broker.stage(
+                    db,
+                    attendance_id=row.id,
+                    event_id=row.event_id,
+                    attendee_id=row.attendee_id,
+                    attendee_name=names.get(row.attendee_id),
+                    checked_in_at=row.checked_in_at,
+                )
+        added: dict[int, int] = {}
+        for event_id, _ in inserted:
+            added[event_id] = added.get(event_id, 0) + 1
+        event_counters.bump(db, event_counters.ATTENDANCE, added)
+        for key, positions in pending.items():
+            first, *repeats = positions
+            statuses[first] = CheckInStatus.CHECKED_IN if key in inserted else CheckInStatus.DUPLICATE
+            for i in repeats:
+                statuses[i] = CheckInStatus.DUPLICATE
+        return statuses
+
+    def _check_in_unindexed(self, db: Session, token: str, user_id: int, now: datetime) -> CheckInResult:
+        row = db.execute(self._check_in_statement(token, user_id, now)).first()
+        if row is None:
+            token_index.put_unknown(token)
+            return CheckInResult(CheckInStatus.NOT_FOUND)
+        token_index.put(
+            token,
+            TokenWindow.from_row(row.id, row.name, row.start_time, row.end_time, row.checkin_open_minutes),
+        )
+        if not row.is_open:
+            return CheckInResult(CheckInStatus.NOT_OPEN, row.id, row.name)
+        if row.attendance_id is None:
+            return CheckInResult(CheckInStatus.DUPLICATE, row.id, row.name)
+        return CheckInResult(CheckInStatus.CHECKED_IN, row.id, row.name, row.attendance_id)
+
+    def _check_in_statement(self, token: str, user_id: int, now: datetime):
+        """PostgreSQL: look up the event, test the window and insert in one round trip.
+        Returns the window columns plus is_open and attendance_id; no row means an
+        unknown token and a
+        NULL attendance_id on an open event means the user had already checked in.
+        """
+        now_param = literal(now, DateTime(timezone=True))
+        opens_at = Event.start_time - func.make_interval(0, 0, 0, 0, 0, Event.checkin_open_minutes)
+        ev = (
+            select(
+                Event.id,
+                Event.name,
+                Event.start_time,
+                Event.end_time,
+                Event.checkin_open_minutes,
+                and_(opens_at <= now_param, Event.end_time >= now_param).label("is_open"),
+            )
+            .where(Event.checkin_token == token, Event.deleted_at.is_(None))
+            .with_for_update(read=True)
+            .cte("ev")
+        )
+        ins = (
+            pg_insert(Attendance)
+            .from_select(
+                ["event_id", "attendee_id", "checked_in_at"],
+                select(ev.c.id, literal(user_id, Integer), now_param).where(ev.c.is_open),
+            )
+            .on_conflict_do_nothing(index_elements=["event_id", "attendee_id"])
+            .returning(Attendance.id, Attendance.event_id)
+            .cte("ins")
+        )
+        counted = (
+            update(Event)
+            .where(Event.id.in_(select(ins.c.event_id)))
+            .values(attendance_count=Event.attendance_count + 1)
+            .cte("counted")
+        )
+        return (
+            select(
+                ev.c.id,
+                ev.c.name,
+                ev.c.start_time,
+                ev.c.end_time,
+                ev.c.checkin_open_minutes,
+                ev.c.is_open,
+                ins.c.id.label("attendance_id"),
+            )
+            .select_from(ev.outerjoin(ins, ins.c.event_id == ev.c.id))
+            .add_cte(counted)
+        )
@@ -1,8 +1,40 @@
 from app.models.audit_log import AuditLog
+from app.services.audit_sink import audit_sink
 from sqlalchemy.orm import Session
 from typing import Optional
 
 class AuditLogRepository:
+    @staticmethod
+    def add_audit(
+        db: Session,
+        *,
+        action: str,
+        user_email: str,
+        timestamp: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        details: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        comment: Optional[str] = None,
+    ):
+        """Stage an audit row with the caller's transaction (call before its commit).
+        Depending on AUDIT_MODE the row is written in that transaction or queued
+        for the batched writer once it commits; returns the row only in the former.
+        """
+        return audit_sink.stage(
+            db,
+            dict(
+                action=action,
+                user_email=user_email,
+                timestamp=timestamp,
+                resource_type=resource_type,
+                resource_id=resource_id,
+                details=details,
+                ip_address=ip_address,
+                comment=comment,
+            ),
+        )
+
     @staticmethod
     def log_audit(
         db: Session,
@@ -16,6 +48,7 @@ class AuditLogRepository:
         ip_address: Optional[str] = None,
         comment: Optional[str] = None,
     ):
+        """Write an audit row immediately in its own commit, bypassing the sink"""
         log = AuditLog(
             action=action,
             user_email=user_email,
@@ -1,9 +1,59 @@
-from typing import Generic, TypeVar, Type
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+from typing import Generic, Iterator, Sequence, TypeVar, Type
+from sqlalchemy import Select, func, select, tuple_
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
 from app.models.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Keeps IN lists and multi-row VALUES under SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 5000
+
+# Largest page a keyset listing returns, whatever the caller asks for
+MAX_PAGE_SIZE = 500
+
+
+def is_postgres(db: Session) -> bool:
+    """True when the session is bound to a PostgreSQL engine"""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def dialect_insert(db: Session, model):
+    """Return an INSERT construct that supports ON CONFLICT for the session's dialect.
+    PostgreSQL in production, SQLite in tests.
+    """
+    if is_postgres(db):
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+def chunked(items: Sequence, size: int = IN_CHUNK_SIZE) -> Iterator[Sequence]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def encode_cursor(at: datetime, id: int) -> str:
+    """Opaque keyset cursor for a (timestamp, id) position"""
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    return base64.urlsafe_b64encode(f"{at.isoformat()}|{id}".encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_cursor (UTC-aware timestamp); ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    at, sep, id = raw.partition("|")
+    if not sep:
+        raise ValueError("Invalid cursor")
+    return datetime.fromisoformat(at).replace(tzinfo=timezone.utc), int(id)
+
 
 class BaseRepository(Generic[ModelType]):
     def __init__(self, model: Type[ModelType]):
@@ -15,6 +65,49 @@ class BaseRepository(Generic[ModelType]):
     def list(self, db: Session, skip: int = 0, limit: int = 100):
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def page(
+        self,
+        db: Session,
+        sort_column,
+        stmt: Select | None = None,
+        after: tuple[datetime, int] | None = None,
+        limit: int = 100,
+        descending: bool = False,
+    ) -> tuple[Sequence[ModelType], str | None]:
+        """One page of ``stmt`` (default: every row) in a stable (sort_column, id)
+        order, seeking past the ``after`` position instead of using OFFSET.
+        ``sort_column`` is a timestamp column. Returns the rows and the cursor
+        for the next page, None on the last one.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        stmt = select(self.model) if stmt is None else stmt
+        key = tuple_(sort_column, self.model.id)
+        if after is not None:
+            stmt = stmt.where(key < tuple_(*after) if descending else key > tuple_(*after))
+        order = (sort_column.desc(), self.model.id.desc()) if descending else (sort_column, self.model.id)
+        # One extra row tells us whether another page follows
+        rows = db.execute(stmt.order_by(*order).limit(limit + 1)).scalars().all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(getattr(last, sort_column.key), last.id)
+
+    def estimate_count(self, db: Session, stmt: Select | None = None) -> int:
+        """Approximate number of rows ``stmt`` matches, without counting them.
+        PostgreSQL answers from the planner's estimate; other databases (the
+        SQLite test suite) fall back to an exact COUNT. ORM execute hooks do not
+        see the EXPLAIN, so ``stmt`` must carry all of its own criteria.
+        """
+        stmt = select(self.model) if stmt is None else stmt
+        if not is_postgres(db):
+            return db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one()
+        compiled = stmt.compile(dialect=db.get_bind().dialect)
+        plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     def create(self, db: Session, **kwargs) -> ModelType:
         obj = self.model(**kwargs)
         db.add(obj)
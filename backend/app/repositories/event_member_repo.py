@@ -1,8 +1,10 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select
-from app.repositories.base import BaseRepository
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import select, delete, func, or_
+from app.repositories.base import BaseRepository, dialect_insert
 from app.models.event_member import EventMember
 from app.models.event import Event
+from app.models.attendance import Attendance
+from app.services import event_counters
 
 class EventMemberRepository(BaseRepository[EventMember]):
     def __init__(self):
@@ -13,18 +15,35 @@ class EventMemberRepository(BaseRepository[EventMember]):
         member = EventMember(event_id=event_id, user_id=user_id)
         db.add(member)
         db.flush()
+        event_counters.bump(db, event_counters.MEMBERS, {event_id: 1})
         return member
 
+    def add_members(self, db: Session, event_id: int, user_ids) -> list[int]:
+        """Add many users as members in one multi-row INSERT ... RETURNING.
+        Users who are already members are skipped; returns the ids added.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return []
+        stmt = dialect_insert(db, EventMember).on_conflict_do_nothing(
+            index_elements=["event_id", "user_id"]
+        )
+        added = db.execute(
+            stmt.returning(EventMember.user_id),
+            [{"event_id": event_id, "user_id": user_id} for user_id in user_ids],
+        ).scalars().all()
+        event_counters.bump(db, event_counters.MEMBERS, {event_id: len(added)})
+        return added
+
     def remove_member(self, db: Session, event_id: int, user_id: int) -> None:
         """Remove a user from event members"""
-        member = db.execute(
-            select(EventMember).where(
+        removed = db.execute(
+            delete(EventMember).where(
                 (EventMember.event_id == event_id) & 
                 (EventMember.user_id == user_id)
             )
-        ).scalars().first()
-        if member:
-            db.delete(member)
+        ).rowcount
+        event_counters.bump(db, event_counters.MEMBERS, {event_id: -removed})
 
     def list_members(self, db: Session, event_id: int):
         """Get all members of an event"""
@@ -76,3 +95,25 @@ class EventMemberRepository(BaseRepository[EventMember]):
         return db.execute(
             select(EventMember).where(EventMember.event_id == parent_id)
         ).scalars().all()
+
+    def member_attendance_for_series(self, db: Session, parent_id: int) -> list[tuple[EventMember, int]]:
+        """Every member of a series with the number of its sessions they attended.
+        One grouped query; members who never attended come back with 0, and
+        ``EventMember.user`` is already loaded.
+        """
+        series_ids = select(Event.id).where(or_(Event.id == parent_id, Event.parent_id == parent_id))
+        attended = (
+            select(Attendance.attendee_id, func.count(Attendance.id).label("attended"))
+            .where(Attendance.event_id.in_(series_ids))
+            .group_by(Attendance.attendee_id)
+            .subquery()
+        )
+        rows = db.execute(
+            select(EventMember, func.coalesce(attended.c.attended, 0))
+            .join(EventMember.user)
+            .outerjoin(attended, attended.c.attendee_id == EventMember.user_id)
+            .options(contains_eager(EventMember.user))
+            .where(EventMember.event_id == parent_id)
+            .order_by(EventMember.id)
+        ).all()
+        return [(member, count) for member, count in rows]
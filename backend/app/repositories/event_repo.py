@@ -1,8 +1,14 @@
+import secrets
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from datetime import datetime, timezone
-from app.repositories.base import BaseRepository
+from sqlalchemy import ColumnElement, Select, insert, or_, select, update
+from datetime import datetime, time, timezone
+from zoneinfo import ZoneInfo
+from app.repositories.base import BaseRepository, chunked, dialect_insert
 from app.models.event import Event
+from app.models.event_member import EventMember
+from app.services.token_index import token_index, TokenWindow, UNKNOWN_TOKEN
+from app.core import qr_tokens
+from app.core.config import settings
 
 
 class EventRepository(BaseRepository[Event]):
@@ -10,7 +16,145 @@ class EventRepository(BaseRepository[Event]):
         super().__init__(Event)
 
     def get_by_token(self, db: Session, token: str) -> Event | None:
-        return db.execute(select(Event).where(Event.checkin_token == token)).scalar_one_or_none()
+        """Tokens the index knows to be unknown are rejected without a query;
+        otherwise the loaded event seeds the index for the check-in that follows.
+        Signed QR tokens must verify and be from a current rotation epoch.
+        """
+        if qr_tokens.is_signed(token):
+            claims = qr_tokens.decode(token, settings.QR_TOKEN_SECRET)
+            now = datetime.now(timezone.utc)
+            if claims is None or not claims.is_current(now, settings.QR_TOKEN_ROTATION_SECONDS):
+                return None
+            return self.get(db, claims.event_id)
+        if token_index.get(token) is UNKNOWN_TOKEN:
+            return None
+        event = db.execute(select(Event).where(Event.checkin_token == token)).scalar_one_or_none()
+        if event is None:
+            token_index.put_unknown(token)
+        else:
+            token_index.put(token, TokenWindow.from_event(event))
+        return event
+
+    def create_sessions(self, db: Session, rows: list[dict]) -> list[int]:
+        """Insert many events with multi-row INSERT ... RETURNING (batched by
+        SQLAlchemy's insertmanyvalues) and return their ids, in no particular
+        order. Tokens must already be set.
+        """
+        if not rows:
+            return []
+        return db.execute(insert(Event).returning(Event.id), rows).scalars().all()
+
+    def materialize(self, db: Session, parent: Event, occurrences: list[tuple[datetime, datetime]]) -> list[Event]:
+        """Session rows of a lazy series for the given (start, end) occurrences,
+        inserting any that do not exist yet. Safe to race: a session another
+        request wrote first is kept as is.
+        """
+        if not occurrences:
+            return []
+        stmt = dialect_insert(db, Event).on_conflict_do_nothing(index_elements=["parent_id", "start_time"])
+        db.execute(stmt, [
+            dict(
+                name=parent.name,
+                location=parent.location,
+                start_time=start,
+                end_time=end,
+                notes=parent.notes,
+                checkin_open_minutes=parent.checkin_open_minutes,
+                checkin_token=secrets.token_urlsafe(16),
+                organizer_id=parent.organizer_id,
+                recurring=True,
+                weekdays=parent.weekdays,
+                end_date=parent.end_date,
+                parent_id=parent.id,
+                attendance_threshold=parent.attendance_threshold,
+            )
+            for start, end in occurrences
+        ])
+        return db.execute(
+            select(Event)
+            .where(Event.parent_id == parent.id, Event.start_time.in_([start for start, _ in occurrences]))
+            .order_by(Event.start_time)
+        ).scalars().all()
+
+    def series_scope(
+        self,
+        parent_id: int,
+        session_id: int | None = None,
+        since: datetime | None = None,
+    ) -> ColumnElement[bool]:
+        """Condition selecting a series' live (not deleted) sessions, the parent included: just
+        ``session_id``, those starting at or after ``since``, or all of them"""
+        if session_id is not None:
+            return (Event.id == session_id) & Event.deleted_at.is_(None)
+        condition = or_(Event.id == parent_id, Event.parent_id == parent_id) & Event.deleted_at.is_(None)
+        if since is not None:
+            condition = condition & (Event.start_time >= since)
+        return condition
+
+    def update_where(self, db: Session, condition: ColumnElement[bool], values: dict) -> list[int]:
+        """Apply ``values`` to every matching event with one UPDATE ... RETURNING
+        and return the ids changed. Nothing is loaded into the session.
+        """
+        return db.execute(
+            update(Event).where(condition).values(**values).returning(Event.id),
+            execution_options={"synchronize_session": False},
+        ).scalars().all()
+
+    def retime_where(
+        self,
+        db: Session,
+        condition: ColumnElement[bool],
+        tz: ZoneInfo,
+        start: time | None = None,
+        end: time | None = None,
+        values: dict | None = None,
+    ) -> list[int]:
+        """Move every matching event to new wall-clock ``start``/``end`` times in
+        ``tz``, each on its own local date (so DST is respected), together with
+        any other ``values``. Reads only ids and times, then writes every row in
+        one executemany UPDATE by primary key. Raises ValueError if a session
+        would end before it starts.
+        """
+        rows = []
+        for event_id, old_start, old_end in db.execute(
+            select(Event.id, Event.start_time, Event.end_time).where(condition)
+        ):
+            local_start = _as_utc(old_start).astimezone(tz)
+            local_end = _as_utc(old_end).astimezone(tz)
+            new_start = datetime.combine(local_start.date(), start or local_start.time(), tzinfo=tz)
+            new_end = datetime.combine(local_end.date(), end or local_end.time(), tzinfo=tz)
+            if new_end <= new_start:
+                raise ValueError("Start time must be before end time")
+            rows.append({
+                **(values or {}),
+                "id": event_id,
+                "start_time": new_start.astimezone(timezone.utc),
+                "end_time": new_end.astimezone(timezone.utc),
+            })
+        if rows:
+            db.execute(update(Event), rows, execution_options={"synchronize_session": False})
+        return [row["id"] for row in rows]
+
+    def filtered(
+        self,
+        organizer_id: int | None = None,
+        start_from: datetime | None = None,
+        start_to: datetime | None = None,
+        recurring: bool | None = None,
+    ) -> Select:
+        """Live events matching the admin listing filters; start_to is exclusive"""
+        # Explicit rather than left to the soft-delete ORM filter, which
+        # estimate_count's EXPLAIN does not go through
+        stmt = select(Event).where(Event.deleted_at.is_(None))
+        if organizer_id is not None:
+            stmt = stmt.where(Event.organizer_id == organizer_id)
+        if start_from is not None:
+            stmt = stmt.where(Event.start_time >= start_from)
+        if start_to is not None:
+            stmt = stmt.where(Event.start_time < start_to)
+        if recurring is not None:
+            stmt = stmt.where(Event.recurring.is_(recurring))
+        return stmt
 
     def upcoming_for_organizer(self, db: Session, organizer_id: int):
         now = datetime.now(timezone.utc)
@@ -21,3 +165,43 @@ class EventRepository(BaseRepository[Event]):
         now = datetime.now(timezone.utc)
         stmt = select(Event).where(Event.organizer_id == organizer_id, Event.end_time < now).order_by(Event.start_time.desc())
         return db.execute(stmt).scalars().all()
+
+    def series_for_organizer(self, db: Session, organizer_id: int):
+        """Every top-level event of an organizer and the sessions of its recurring
+        ones, in two queries: (parents, {parent_id: children}), both by start time.
+        """
+        parents = db.execute(
+            select(Event)
+            .where(Event.organizer_id == organizer_id, Event.parent_id.is_(None))
+            .order_by(Event.start_time)
+        ).scalars().all()
+        return parents, self._children_of(db, [p.id for p in parents if p.recurring])
+
+    def series_for_member(self, db: Session, user_id: int, parent_id: int | None = None):
+        """The recurring series a user is a member of (optionally just ``parent_id``)
+        and their sessions, in two queries: (parents, {parent_id: children}).
+        """
+        stmt = (
+            select(Event)
+            .join(EventMember, EventMember.event_id == Event.id)
+            .where(EventMember.user_id == user_id, Event.recurring.is_(True), Event.parent_id.is_(None))
+            .order_by(EventMember.id)
+        )
+        if parent_id is not None:
+            stmt = stmt.where(Event.id == parent_id)
+        parents = db.execute(stmt).scalars().all()
+        return parents, self._children_of(db, [p.id for p in parents])
+
+    def _children_of(self, db: Session, parent_ids: list[int]) -> dict[int, list[Event]]:
+        children: dict[int, list[Event]] = {pid: [] for pid in parent_ids}
+        for chunk in chunked(parent_ids):
+            for child in db.execute(
+                select(Event).where(Event.parent_id.in_(chunk)).order_by(Event.start_time)
+            ).scalars():
+                children[child.parent_id].append(child)
+        return children
+
+
+def _as_utc(dt: datetime) -> datetime:
+    # SQLite hands stored UTC datetimes back naive
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
@@ -0,0 +1,93 @@
+"""Request-scoped batch loaders (DataLoader style).
+
+A handler asks for rows it needs while walking a list, and every key it asked
+for is fetched with one ``IN (...)`` query the first time any result is read:
+
+    organizers = [(e, loaders.users.load(e.organizer_id)) for e in events]
+    names = [u.value.name for _, u in organizers]  # one query for all events
+
+Results are memoized for the life of the ``Loaders`` instance, which
+``get_loaders`` creates per request, so nothing is shared between requests
+or outlives the session it was loaded with.
+"""
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.repositories.base import chunked
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class Deferred(Generic[V]):
+    """Result of ``BatchLoader.load``; reading ``value`` resolves every pending key"""
+
+    __slots__ = ("_loader", "_key")
+
+    def __init__(self, loader: "BatchLoader", key):
+        self._loader = loader
+        self._key = key
+
+    @property
+    def value(self) -> V:
+        return self._loader.get(self._key)
+
+
+class BatchLoader(Generic[K, V]):
+    """Collects keys and resolves them with ``batch_fn(db, keys) -> {key: value}``.
+    Keys missing from the result resolve to ``default``.
+    """
+
+    def __init__(self, db: Session, batch_fn: Callable[[Session, list], dict], default: V | None = None):
+        self.db = db
+        self.batch_fn = batch_fn
+        self.default = default
+        self._cache: dict = {}
+        self._pending: dict = {}
+        self.batches = 0
+
+    def load(self, key: K) -> Deferred[V]:
+        if key not in self._cache:
+            self._pending[key] = None
+        return Deferred(self, key)
+
+    def load_many(self, keys: Iterable[K]) -> list[Deferred[V]]:
+        return [self.load(key) for key in keys]
+
+    def prime(self, key: K, value: V) -> None:
+        """Seed a value already in hand so it is never queried"""
+        self._cache[key] = value
+        self._pending.pop(key, None)
+
+    def get(self, key: K) -> V:
+        if key not in self._cache:
+            self._pending[key] = None
+            self.resolve()
+        return self._cache[key]
+
+    def resolve(self) -> None:
+        keys = list(self._pending)
+        self._pending.clear()
+        if not keys:
+            return
+        for chunk in chunked(keys):
+            found = self.batch_fn(self.db, list(chunk))
+            self.batches += 1
+            for key in chunk:
+                self._cache[key] = found.get(key, self.default)
+
+
+def _users(db: Session, user_ids: list[int]) -> dict[int, User]:
+    return {u.id: u for u in db.execute(select(User).where(User.id.in_(user_ids))).scalars()}
+
+
+class Loaders:
+    """Batch loaders scoped to a request's session; ``users`` loads users by
+    id (None when missing).
+    """
+
+    def __init__(self, db: Session):
+        self.users: BatchLoader[int, User | None] = BatchLoader(db, _users)
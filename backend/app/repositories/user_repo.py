@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from app.repositories.base import BaseRepository
-from app.models.user import User
+from sqlalchemy import select, literal, String
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.repositories.base import BaseRepository, is_postgres, dialect_insert
+from app.models.user import User, UserRole
+from app.models.user_role import UserRoleAssignment
+from app.services import event_counters
 
 
 class UserRepository(BaseRepository[User]):
@@ -15,10 +18,56 @@ class UserRepository(BaseRepository[User]):
         """Get user by Auth0 subject ID."""
         return db.execute(select(User).where(User.auth0_sub == auth0_sub)).scalar_one_or_none()
 
+    def provision(
+        self,
+        db: Session,
+        *,
+        email: str,
+        name: str,
+        auth0_sub: str | None = None,
+        role: UserRole = UserRole.ATTENDEE,
+    ) -> int | None:
+        """Insert a user together with its initial role, doing nothing if the email or
+        auth0_sub is already taken (e.g. by a concurrent first request). Returns the
+        new user id, or None on conflict. Does not commit.
+        """
+        values = {"email": email, "name": name, "password_hash": "", "auth0_sub": auth0_sub}
+        if is_postgres(db):
+            return db.execute(self._provision_statement(values, role)).scalar_one_or_none()
+
+        user_id = db.execute(
+            dialect_insert(db, User).values(**values).on_conflict_do_nothing().returning(User.id)
+        ).scalar_one_or_none()
+        if user_id is not None:
+            db.execute(
+                dialect_insert(db, UserRoleAssignment)
+                .values(user_id=user_id, role=role.value)
+                .on_conflict_do_nothing()
+            )
+        return user_id
+
+    def _provision_statement(self, values: dict, role: UserRole):
+        """PostgreSQL: insert the user and its role assignment in one statement"""
+        ins = (
+            pg_insert(User)
+            .values(**values)
+            .on_conflict_do_nothing()
+            .returning(User.id)
+            .cte("ins")
+        )
+        role_ins = (
+            pg_insert(UserRoleAssignment)
+            .from_select(["user_id", "role"], select(ins.c.id, literal(role.value, String)))
+            .on_conflict_do_nothing()
+            .cte("role_ins")
+        )
+        return select(ins.c.id).add_cte(role_ins)
+
     def delete(self, db: Session, user_id: int) -> bool:
-        """Delete user by ID."""
+        """Delete user by ID, releasing the event counters its rows held."""
         user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
         if user:
+            event_counters.release_user(db, user.id)
             db.delete(user)
             return True
         return False
@@ -0,0 +1,273 @@
+"""Live check-in deltas for organizer dashboards (Server-Sent Events).
+
+Check-ins are staged on the writing session and published only once its
+transaction commits, the same way audit rows are. The in-process broker fans
+each delta out to every stream subscribed to that event.
+
+With ATTENDANCE_STREAM_PG_NOTIFY on PostgreSQL the deltas are sent with
+pg_notify inside the check-in transaction instead, and a LISTEN thread in each
+worker feeds its own broker, so a dashboard connected to any uvicorn worker
+sees check-ins written by all of them. Without it, a stream only sees
+check-ins handled by its own worker until the client reconnects.
+
+A client that reconnects with Last-Event-ID (the highest attendance id it was
+sent) is sent the check-ins after that id, read from the database, and a fresh
+count. Check-ins commit out of id order, so a live delta is matched against
+the ids the snapshot counted rather than against a cutoff id; one that
+commits below Last-Event-ID while the client is away is in the new count but
+is not replayed.
+"""
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repositories.base import chunked, is_postgres
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "attendance_checkins"
+
+# Session.info key holding deltas staged in the current transaction
+_STAGED = "attendance_stream.staged"
+
+# Deltas per NOTIFY; keeps payloads well under PostgreSQL's 8000 byte limit
+_NOTIFY_BATCH = 40
+
+
+def _iso(dt: datetime) -> str:
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat() + "Z"
+
+
+def make_delta(
+    attendance_id: int,
+    event_id: int,
+    attendee_id: int,
+    attendee_name: str | None,
+    checked_in_at: datetime,
+) -> dict:
+    return {
+        "id": attendance_id,
+        "event_id": event_id,
+        "attendee_id": attendee_id,
+        "attendee_name": attendee_name,
+        "checked_in_at": _iso(checked_in_at),
+    }
+
+
+def format_sse(event_name: str, data: dict, event_id: int | None = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event_name}", f"data: {json.dumps(data)}"]
+    return "\n".join(lines) + "\n\n"
+
+
+class _Subscriber:
+    def __init__(self, event_id: int, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.event_id = event_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def offer(self, delta: dict) -> None:
+        # Runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(delta)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class AttendanceBroker:
+    def __init__(self, queue_size: int, heartbeat_seconds: float, notify: bool):
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.notify = notify
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, set[_Subscriber]] = {}
+        self._stop = threading.Event()
+        self._listener: threading.Thread | None = None
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+        self.notified = 0
+
+    # -- publishing (any thread) --
+
+    def stage(
+        self,
+        db: Session,
+        *,
+        attendance_id: int,
+        event_id: int,
+        attendee_id: int,
+        attendee_name: str | None,
+        checked_in_at: datetime,
+    ) -> None:
+        """Record a check-in to publish once ``db``'s transaction commits"""
+        if not db.in_transaction():
+            db.begin()
+        db.info.setdefault(_STAGED, []).append(
+            make_delta(attendance_id, event_id, attendee_id, attendee_name, checked_in_at)
+        )
+
+    def _before_commit(self, db: Session) -> None:
+        if not (self.notify and db.info.get(_STAGED) and is_postgres(db)):
+            return
+        # Delivered by PostgreSQL only if this transaction commits
+        staged = db.info.pop(_STAGED)
+        for batch in chunked(staged, _NOTIFY_BATCH):
+            db.execute(select(func.pg_notify(CHANNEL, json.dumps(batch))))
+        self.notified += len(staged)
+
+    def _after_commit(self, db: Session) -> None:
+        staged = db.info.pop(_STAGED, None)
+        if staged:
+            self.publish(staged)
+
+    def _after_soft_rollback(self, db: Session, previous_transaction) -> None:
+        if not previous_transaction.nested:
+            db.info.pop(_STAGED, None)
+
+    def publish(self, deltas: list[dict]) -> None:
+        with self._lock:
+            targets = [(d, list(self._subscribers.get(d["event_id"], ()))) for d in deltas]
+        self.published += len(deltas)
+        for delta, subscribers in targets:
+            for sub in subscribers:
+                try:
+                    sub.loop.call_soon_threadsafe(sub.offer, delta)
+                    self.delivered += 1
+                except RuntimeError:
+                    # Event loop already closed
+                    self.unsubscribe(sub)
+
+    # -- subscribing (event loop) --
+
+    def subscribe(self, event_id: int) -> _Subscriber:
+        sub = _Subscriber(event_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(event_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: _Subscriber) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.event_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.event_id]
+
+    async def stream(
+        self,
+        sub: _Subscriber,
+        count: int,
+        last_id: int,
+        counted: set[int],
+        backlog: list[dict],
+        is_disconnected: Callable[[], Awaitable[bool]],
+    ) -> AsyncIterator[str]:
+        """SSE body: the current count, any backlog, then live deltas.
+        ``sub`` must be subscribed before the snapshot is read so nothing
+        committed in between is missed; live deltas whose id is in ``counted``
+        (the snapshot's and backlog's ids) are already counted and skipped. The
+        SSE id is the highest attendance id sent so far, starting at ``last_id``.
+        Ends when the client goes away or falls a full queue behind (it resumes
+        with Last-Event-ID).
+        """
+        try:
+            yield "retry: 3000\n\n" + format_sse("count", {"count": count})
+            for delta in backlog:
+                count += 1
+                last_id = max(last_id, delta["id"])
+                yield format_sse("checkin", {**delta, "count": count}, last_id)
+            while not sub.overflowed:
+                try:
+                    delta = await asyncio.wait_for(sub.queue.get(), self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                if delta["id"] in counted:
+                    continue
+                counted.add(delta["id"])
+                count += 1
+                last_id = max(last_id, delta["id"])
+                yield format_sse("checkin", {**delta, "count": count}, last_id)
+            self.overflows += 1
+        finally:
+            self.unsubscribe(sub)
+
+    # -- LISTEN/NOTIFY bridge --
+
+    def _listen(self, dsn: str) -> None:
+        import psycopg
+
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {CHANNEL}")
+                    while not self._stop.is_set():
+                        for note in conn.notifies(timeout=1.0):
+                            self.publish(json.loads(note.payload))
+            except Exception as e:
+                logger.warning(f"Attendance LISTEN connection failed, retrying: {e}")
+                self._stop.wait(5)
+
+    def start(self, database_url: str) -> None:
+        """Start the LISTEN thread when the PostgreSQL bridge is enabled"""
+        if not self.notify or not database_url.startswith("postgresql"):
+            return
+        if self._listener is not None and self._listener.is_alive():
+            return
+        dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self._stop.clear()
+        self._listener = threading.Thread(target=self._listen, args=(dsn,), name="attendance-listen", daemon=True)
+        self._listener.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=5)
+            self._listener = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._subscribers.clear()
+        self._reset_counters()
+
+    def stats(self) -> dict:
+        with self._lock:
+            streams = sum(len(s) for s in self._subscribers.values())
+            events = len(self._subscribers)
+        return {
+            "streams": streams,
+            "events": events,
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+            "notified": self.notified,
+            "listening": self._listener is not None and self._listener.is_alive(),
+        }
+
+
+attendance_broker = AttendanceBroker(
+    settings.ATTENDANCE_STREAM_QUEUE_SIZE,
+    settings.ATTENDANCE_STREAM_HEARTBEAT_SECONDS,
+    settings.ATTENDANCE_STREAM_PG_NOTIFY,
+)
+
+event.listen(Session, "before_commit", lambda db: attendance_broker._before_commit(db))
+event.listen(Session, "after_commit", lambda db: attendance_broker._after_commit(db))
+event.listen(Session, "after_soft_rollback", lambda db, tx: attendance_broker._after_soft_rollback(db, tx))
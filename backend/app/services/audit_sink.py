@@ -0,0 +1,201 @@
+"""Audit log sink with a configurable durability mode (AUDIT_MODE).
+
+- "transaction": the audit row is added to the caller's session and committed
+  together with the business change.
+- "async": rows are handed to a bounded in-process queue once the caller's
+  transaction commits and a background thread bulk-inserts them in batches of
+  AUDIT_BATCH_SIZE or every AUDIT_FLUSH_SECONDS. If the queue is full the row
+  is written inline, so nothing is lost.
+- "drop": like "async", but rows that do not fit in the queue are dropped and
+  counted instead of slowing the request down.
+
+Rows staged in a transaction that rolls back are never queued.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+AUDIT_MODES = ("transaction", "async", "drop")
+
+# Session.info key holding rows staged in the current transaction
+_STAGED = "audit_sink.staged"
+
+
+class AuditSink:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        mode: str,
+        max_queue: int,
+        batch_size: int,
+        flush_interval: float,
+    ):
+        if mode not in AUDIT_MODES:
+            raise ValueError(f"Unknown audit mode {mode!r}, expected one of {AUDIT_MODES}")
+        self.session_factory = session_factory
+        self.mode = mode
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: deque[tuple[float, dict]] = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.inline_writes = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_lag_seconds: float | None = None
+
+    def stage(self, db: Session, fields: dict) -> AuditLog | None:
+        """Record an audit row as part of ``db``'s current transaction.
+        Returns the ORM row in "transaction" mode, None when it is queued.
+        """
+        if self.mode == "transaction":
+            log = AuditLog(**fields)
+            db.add(log)
+            return log
+        if fields.get("timestamp") is None:
+            # Stamp the action time now rather than when the batch is written
+            fields = {**fields, "timestamp": datetime.now(timezone.utc)}
+        if not db.in_transaction():
+            # Make sure a rollback before any other work still discards the row
+            db.begin()
+        db.info.setdefault(_STAGED, []).append(fields)
+        return None
+
+    def _after_commit(self, db: Session) -> None:
+        staged = db.info.pop(_STAGED, None)
+        if staged:
+            self.enqueue(staged)
+
+    def _after_soft_rollback(self, db: Session, previous_transaction) -> None:
+        # A savepoint rollback leaves the outer transaction (and its audits) alive
+        if not previous_transaction.nested:
+            db.info.pop(_STAGED, None)
+
+    def enqueue(self, rows: list[dict]) -> None:
+        now = time.time()
+        overflow: list[dict] = []
+        with self._cond:
+            for row in rows:
+                if len(self._queue) < self.max_queue:
+                    self._queue.append((now, row))
+                    self.enqueued += 1
+                elif self.mode == "drop":
+                    self.dropped += 1
+                else:
+                    overflow.append(row)
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        if overflow:
+            # Queue full in "async" mode: apply back-pressure by writing inline
+            self.inline_writes += len(overflow)
+            self._write([(now, row) for row in overflow])
+
+    def _write(self, batch: list[tuple[float, dict]]) -> int:
+        db = self.session_factory()
+        try:
+            db.execute(insert(AuditLog), [row for _, row in batch])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.failed += len(batch)
+            logger.error(f"Audit batch of {len(batch)} rows failed: {e}")
+            return 0
+        finally:
+            db.close()
+        self.written += len(batch)
+        self.batches += 1
+        self.last_lag_seconds = round(time.time() - batch[0][0], 3)
+        return len(batch)
+
+    def flush(self) -> int:
+        """Write everything queued so far in batches; returns the number of rows written"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    n = min(self.batch_size, len(self._queue))
+                    batch = [self._queue.popleft() for _ in range(n)]
+                if not batch:
+                    return written
+                written += self._write(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                if len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+            self.flush()
+
+    def start(self) -> None:
+        if self.mode == "transaction" or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer thread and flush what is left"""
+        self._stop.set()
+        if self._thread is not None:
+            with self._cond:
+                self._cond.notify()
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def clear(self) -> None:
+        with self._cond:
+            self._queue.clear()
+            self._reset_counters()
+
+    def stats(self) -> dict:
+        with self._cond:
+            depth = len(self._queue)
+            oldest = self._queue[0][0] if self._queue else None
+        return {
+            "mode": self.mode,
+            "queue_depth": depth,
+            "queue_max": self.max_queue,
+            "oldest_queued_seconds": round(time.time() - oldest, 3) if oldest is not None else None,
+            "last_batch_lag_seconds": self.last_lag_seconds,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "inline_writes": self.inline_writes,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+audit_sink = AuditSink(
+    SessionLocal,
+    settings.AUDIT_MODE,
+    settings.AUDIT_QUEUE_SIZE,
+    settings.AUDIT_BATCH_SIZE,
+    settings.AUDIT_FLUSH_SECONDS,
+)
+
+# Staged rows are released to the queue only once the owning transaction commits
+event.listen(Session, "after_commit", lambda db: audit_sink._after_commit(db))
+event.listen(Session, "after_soft_rollback", lambda db, tx: audit_sink._after_soft_rollback(db, tx))
@@ -0,0 +1,267 @@
+"""Group-commit check-in writer for burst traffic (CHECKIN_BURST_MODE).
+
+Requests are validated in-process (signature or token index) and then
+queued. One writer thread drains the queue into groups of up to
+CHECKIN_BATCH_MAX_SIZE check-ins, waiting at most CHECKIN_BATCH_MAX_WAIT_MS
+for a group to fill. Each group is one multi-row INSERT ... ON CONFLICT DO
+NOTHING plus its audit rows in a single commit. Every caller gets its own
+result once its group commits, duplicates included; the check-in endpoint
+awaits it on the event loop rather than parking a worker thread per request.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.attendance import Attendance
+from app.repositories.attendance_repo import AttendanceRepository, CheckInResult, CheckInStatus
+from app.repositories.audit_log_repo import AuditLogRepository
+from app.repositories.base import dialect_insert
+from app.services.attendance_stream import attendance_broker
+from app.services.token_index import token_index
+from app.services import event_counters
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def stage_check_in_audit(db: Session, user_email: str, result: CheckInResult) -> None:
+    """Stage the audit row for a successful check-in in ``db``'s transaction"""
+    AuditLogRepository.add_audit(
+        db,
+        action="check_in",
+        user_email=user_email,
+        timestamp=datetime.utcnow(),
+        resource_type="attendance",
+        resource_id=str(result.attendance_id),
+        details=f"Checked in to event: {result.event_name}"
+    )
+
+
+def stage_check_in_delta(db: Session, user_id: int, user_name: str | None, result: CheckInResult, now: datetime) -> None:
+    """Stream a successful check-in to live dashboards once ``db`` commits"""
+    attendance_broker.stage(
+        db,
+        attendance_id=result.attendance_id,
+        event_id=result.event_id,
+        attendee_id=user_id,
+        attendee_name=user_name,
+        checked_in_at=now,
+    )
+
+
+@dataclass
+class _PendingCheckIn:
+    token: str
+    event_id: int
+    event_name: str
+    user_id: int
+    user_email: str
+    user_name: str | None
+    checked_in_at: datetime
+    enqueued_at: float = field(default_factory=time.monotonic)
+    future: Future = field(default_factory=Future)
+
+
+class CheckInBatcher:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_batch: int,
+        max_wait_ms: float,
+        result_timeout: float = 30,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.result_timeout = result_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=max_batch * 50)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.fallbacks = 0
+        self.rejected = 0
+        self.last_commit_ms: float | None = None
+
+    def submit(
+        self,
+        db: Session,
+        token: str,
+        user_id: int,
+        user_email: str,
+        now: datetime,
+        user_name: str | None = None,
+    ) -> CheckInResult | Future:
+        """Validate the token and window and queue the check-in. Returns the
+        rejection, or a future resolved with the result once the group commits.
+        ``db`` is only used to resolve a token the index has not seen yet.
+        Raises queue.Full when the writer is too far behind to accept more.
+        """
+        window = AttendanceRepository().resolve_window(db, token, now)
+        if isinstance(window, CheckInResult):
+            return window
+
+        self._ensure_started()
+        item = _PendingCheckIn(token, window.event_id, window.name, user_id, user_email, user_name, now)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.rejected += 1
+            raise
+        return item.future
+
+    def check_in(
+        self,
+        db: Session,
+        token: str,
+        user_id: int,
+        user_email: str,
+        now: datetime,
+        user_name: str | None = None,
+    ) -> CheckInResult:
+        """``submit`` and block until the group commits (result_timeout at most)"""
+        pending = self.submit(db, token, user_id, user_email, now, user_name)
+        if isinstance(pending, CheckInResult):
+            return pending
+        return pending.result(timeout=self.result_timeout)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="checkin-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            stopping = False
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                try:
+                    nxt = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stopping = True
+                    break
+                batch.append(nxt)
+            self._commit(batch)
+            if stopping:
+                return
+
+    def _commit(self, batch: list[_PendingCheckIn]) -> None:
+        started = time.monotonic()
+        db = self.session_factory()
+        try:
+            # Windows were resolved from the token index, which may predate a delete
+            event_ids = {i.event_id for i in batch}
+            live = AttendanceRepository().live_events(db, event_ids)
+            token_index.invalidate(event_ids=event_ids - live)
+            unique = {(i.event_id, i.user_id): i for i in reversed(batch) if i.event_id in live}
+            returned = db.execute(
+                dialect_insert(db, Attendance)
+                .values([
+                    {"event_id": i.event_id, "attendee_id": i.user_id, "checked_in_at": i.checked_in_at}
+                    for i in unique.values()
+                ])
+                .on_conflict_do_nothing(index_elements=["event_id", "attendee_id"])
+                .returning(Attendance.id, Attendance.event_id, Attendance.attendee_id)
+            ).all() if unique else []
+            inserted = {(r.event_id, r.attendee_id): r.id for r in returned}
+            added: dict[int, int] = {}
+            for event_id, _ in inserted:
+                added[event_id] = added.get(event_id, 0) + 1
+            event_counters.bump(db, event_counters.ATTENDANCE, added)
+
+            results = []
+            for item in batch:
+                # pop: a repeated scan within the same group is a duplicate
+                attendance_id = inserted.pop((item.event_id, item.user_id), None)
+                if item.event_id not in live:
+                    result = CheckInResult(CheckInStatus.NOT_FOUND)
+                elif attendance_id is None:
+                    result = CheckInResult(CheckInStatus.DUPLICATE, item.event_id, item.event_name)
+                else:
+                    result = CheckInResult(CheckInStatus.CHECKED_IN, item.event_id, item.event_name, attendance_id)
+                    stage_check_in_audit(db, item.user_email, result)
+                    stage_check_in_delta(db, item.user_id, item.user_name, result, item.checked_in_at)
+                results.append(result)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Check-in group of {len(batch)} failed, retrying individually: {e}")
+            self._commit_individually(db, batch)
+            return
+        finally:
+            db.close()
+
+        for item, result in zip(batch, results):
+            item.future.set_result(result)
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self.last_commit_ms = round((time.monotonic() - started) * 1000, 3)
+
+    def _commit_individually(self, db: Session, batch: list[_PendingCheckIn]) -> None:
+        """Slow path after a failed group (e.g. an event deleted mid-burst)"""
+        self.fallbacks += 1
+        repo = AttendanceRepository()
+        for item in batch:
+            try:
+                result = repo.check_in(db, item.token, item.user_id, item.checked_in_at)
+                if result.status is CheckInStatus.CHECKED_IN:
+                    stage_check_in_audit(db, item.user_email, result)
+                    stage_check_in_delta(db, item.user_id, item.user_name, result, item.checked_in_at)
+                db.commit()
+                item.future.set_result(result)
+            except Exception as e:
+                db.rollback()
+                item.future.set_exception(e)
+
+    def stop(self) -> None:
+        """Commit whatever is queued and stop the writer"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout=self.result_timeout)
+
+    def clear(self) -> None:
+        self.stop()
+        self._reset_counters()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.CHECKIN_BURST_MODE,
+            "queue_depth": self._queue.qsize(),
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch": round(self.items / self.batches, 2) if self.batches else None,
+            "largest_batch": self.largest_batch,
+            "fallbacks": self.fallbacks,
+            "rejected": self.rejected,
+            "last_commit_ms": self.last_commit_ms,
+        }
+
+
+checkin_batcher = CheckInBatcher(SessionLocal, settings.CHECKIN_BATCH_MAX_SIZE, settings.CHECKIN_BATCH_MAX_WAIT_MS)
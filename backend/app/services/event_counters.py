@@ -0,0 +1,88 @@
+"""Denormalized per-event counters: events.attendance_count and events.member_count.
+
+Every writer bumps the counters in the same transaction as the rows it adds
+or removes, so listing endpoints read them instead of running a COUNT per
+event. ``reconcile`` recomputes both from the source tables in one set-based
+UPDATE to repair drift from writes that bypass the application:
+
+    cd backend && python -m app.services.event_counters
+"""
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.event_member import EventMember
+
+ATTENDANCE = "attendance_count"
+MEMBERS = "member_count"
+
+_events = Event.__table__
+
+
+def bump(db: Session, column: str, deltas: dict[int, int]) -> None:
+    """Add ``deltas[event_id]`` to ``column`` for each event"""
+    rows = [{"b_id": event_id, "b_n": n} for event_id, n in sorted(deltas.items()) if n]
+    if not rows:
+        return
+    # Sorted by id so concurrent writers lock event rows in the same order
+    db.execute(
+        update(_events)
+        .where(_events.c.id == bindparam("b_id"))
+        .values({column: _events.c[column] + bindparam("b_n")}),
+        rows,
+    )
+
+
+def release_user(db: Session, user_id: int) -> None:
+    """Decrement counters for the attendances and memberships a user delete is about to cascade away"""
+    for column, table, user_column in (
+        (ATTENDANCE, Attendance, Attendance.attendee_id),
+        (MEMBERS, EventMember, EventMember.user_id),
+    ):
+        db.execute(
+            update(_events)
+            .where(_events.c.id.in_(select(table.event_id).where(user_column == user_id)))
+            .values({column: _events.c[column] - 1})
+        )
+
+
+def _attendance_total():
+    return (
+        select(func.count()).select_from(Attendance)
+        .where(Attendance.event_id == _events.c.id)
+        .scalar_subquery()
+    )
+
+
+def _member_total():
+    return (
+        select(func.count()).select_from(EventMember)
+        .where(EventMember.event_id == _events.c.id)
+        .scalar_subquery()
+    )
+
+
+def reconcile(db: Session, event_ids=None) -> int:
+    """Recompute both counters from attendances and event_members.
+    Only rows that drifted are written; returns how many were corrected.
+    Does not commit.
+    """
+    attended, members = _attendance_total(), _member_total()
+    stmt = (
+        update(_events)
+        .where(or_(_events.c.attendance_count != attended, _events.c.member_count != members))
+        .values(attendance_count=attended, member_count=members)
+    )
+    if event_ids is not None:
+        stmt = stmt.where(_events.c.id.in_(list(event_ids)))
+    return db.execute(stmt).rowcount
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as session:
+        fixed = reconcile(session)
+        session.commit()
+    print(f"Reconciled event counters: {fixed} event(s) corrected")
@@ -0,0 +1,226 @@
+"""Background deletes for events and whole series.
+
+Deleting an event used to load every attendance and membership row into the
+session before removing them, inside the request, and left the sessions of a
+deleted series behind. Now a delete only stamps ``events.deleted_at`` on the
+event (and, for a series parent, every session) and returns a job id; the
+rows disappear from every ORM query at once through the filter below.
+
+One worker thread then removes attendances and memberships in chunks of
+EVENT_DELETE_CHUNK_SIZE rows, each in its own short transaction, and finally
+the events themselves. ON DELETE CASCADE on event_members, attendances and
+events.parent_id removes anything written after its chunk ran, and check-in
+writes only insert against events not marked deleted, so a token window cached
+before the delete (in this or another process) adds nothing. Jobs are kept
+in memory; events still marked deleted when a worker starts (e.g. after a
+restart mid-delete) are purged by ``resume``.
+"""
+import logging
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import ColumnElement, delete, event, select, update
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.event_member import EventMember
+from app.repositories.base import chunked
+
+logger = logging.getLogger(__name__)
+
+# Execution option that lets a SELECT see soft-deleted events
+INCLUDE_DELETED = "include_deleted"
+
+_STOP = object()
+
+
+def _hide_deleted(state: ORMExecuteState) -> None:
+    if (
+        state.is_select
+        and not state.is_column_load
+        and not state.is_relationship_load
+        and not state.execution_options.get(INCLUDE_DELETED, False)
+    ):
+        state.statement = state.statement.options(
+            with_loader_criteria(Event, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
+
+
+event.listen(Session, "do_orm_execute", _hide_deleted)
+
+
+@dataclass
+class DeleteJob:
+    id: str
+    event_ids: list[int]
+    status: str = "queued"  # queued, running, done, failed
+    attendances: int = 0
+    members: int = 0
+    events: int = 0
+    error: str | None = None
+    finished: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def as_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "event_ids": len(self.event_ids),
+            "deleted": {"attendances": self.attendances, "members": self.members, "events": self.events},
+            "error": self.error,
+        }
+
+
+class EventDeleter:
+    def __init__(self, session_factory: Callable[[], Session], chunk_size: int, max_jobs: int = 1000):
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.max_jobs = max_jobs
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, DeleteJob] = OrderedDict()
+        self._thread: threading.Thread | None = None
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.chunks = 0
+
+    # -- request side --
+
+    def mark_deleted(self, db: Session, condition: ColumnElement[bool]) -> list[int]:
+        """Soft-delete the matching events and return their ids. Does not commit."""
+        return db.execute(
+            update(Event)
+            .where(condition, Event.deleted_at.is_(None))
+            .values(deleted_at=datetime.now(timezone.utc))
+            .returning(Event.id),
+            execution_options={"synchronize_session": False},
+        ).scalars().all()
+
+    def submit(self, event_ids: list[int]) -> DeleteJob:
+        """Queue soft-deleted events for purging; call after the soft delete commits"""
+        job = DeleteJob(uuid.uuid4().hex, list(event_ids))
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+            self.submitted += 1
+        self._ensure_started()
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id: str) -> DeleteJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> bool:
+        job = self.get(job_id)
+        return job is not None and job.finished.wait(timeout)
+
+    # -- worker --
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="event-deleter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            self.run(job)
+
+    def run(self, job: DeleteJob) -> None:
+        """Purge a job's events and everything attached to them, chunk by chunk"""
+        job.status = "running"
+        db = self.session_factory()
+        try:
+            for ids in chunked(job.event_ids):
+                job.attendances += self._purge(db, Attendance, ids)
+                job.members += self._purge(db, EventMember, ids)
+                # Sessions are listed before their parent; anything left cascades
+                job.events += db.execute(
+                    delete(Event).where(Event.id.in_(ids)),
+                    execution_options={"synchronize_session": False},
+                ).rowcount
+                db.commit()
+                self.chunks += 1
+            job.status = "done"
+            self.completed += 1
+        except Exception as e:
+            db.rollback()
+            job.status = "failed"
+            job.error = str(e)
+            self.failed += 1
+            logger.error(f"Event delete job {job.id} failed: {e}")
+        finally:
+            db.close()
+            job.finished.set()
+
+    def _purge(self, db: Session, model, event_ids) -> int:
+        deleted = 0
+        while True:
+            batch = select(model.id).where(model.event_id.in_(event_ids)).limit(self.chunk_size)
+            n = db.execute(
+                delete(model).where(model.id.in_(batch.scalar_subquery())),
+                execution_options={"synchronize_session": False},
+            ).rowcount
+            db.commit()
+            self.chunks += 1
+            deleted += n
+            if n < self.chunk_size:
+                return deleted
+
+    def resume(self) -> DeleteJob | None:
+        """Queue events left soft-deleted by an interrupted worker"""
+        with self.session_factory() as db:
+            ids = db.execute(
+                select(Event.id).where(Event.deleted_at.is_not(None)).order_by(Event.parent_id.is_(None), Event.id),
+                execution_options={INCLUDE_DELETED: True},
+            ).scalars().all()
+        return self.submit(ids) if ids else None
+
+    def stop(self, timeout: float = 30) -> None:
+        """Finish queued jobs and stop the worker"""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+        self._thread = None
+
+    def clear(self) -> None:
+        self.stop()
+        # Drop jobs queued while no worker was running
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        with self._lock:
+            self._jobs.clear()
+        self._reset_counters()
+
+    def stats(self) -> dict:
+        with self._lock:
+            active = sum(1 for j in self._jobs.values() if j.status in ("queued", "running"))
+        return {
+            "active_jobs": active,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "chunks": self.chunks,
+        }
+
+
+event_deleter = EventDeleter(SessionLocal, settings.EVENT_DELETE_CHUNK_SIZE)
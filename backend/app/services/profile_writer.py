@@ -0,0 +1,123 @@
+"""Write-behind queue for Auth0 profile backfills (email, name, auth0_sub).
+
+The auth dependency only detects that a user's stored profile differs from the
+token claims; the UPDATE is queued here and applied by a background thread every
+PROFILE_WRITE_FLUSH_SECONDS, so authenticated GETs never commit. Repeated
+updates for the same user before a flush are merged into one row write.
+"""
+import logging
+import threading
+from typing import Callable
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileWriteBehind:
+    def __init__(self, session_factory: Callable[[], Session], flush_interval: float):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: dict[int, dict] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.deferred = 0
+        self.coalesced = 0
+        self.written = 0
+        self.failed = 0
+
+    def submit(self, user_id: int, changes: dict) -> None:
+        """Queue column changes for a user, merging with any pending ones"""
+        if not changes:
+            return
+        with self._lock:
+            self.deferred += 1
+            pending = self._pending.get(user_id)
+            if pending is None:
+                self._pending[user_id] = dict(changes)
+            else:
+                pending.update(changes)
+                self.coalesced += 1
+
+    def pending(self, user_id: int) -> dict:
+        with self._lock:
+            return dict(self._pending.get(user_id, {}))
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of users updated"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            written = 0
+            db = self.session_factory()
+            try:
+                for user_id, changes in batch.items():
+                    # Savepoint per user: one conflicting row (e.g. an email now
+                    # owned by another account) must not drop the whole batch
+                    try:
+                        with db.begin_nested():
+                            db.execute(update(User).where(User.id == user_id).values(**changes))
+                        written += 1
+                    except Exception as e:
+                        self.failed += 1
+                        logger.warning(f"Profile update for user {user_id} failed: {e}")
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                self.failed += len(batch) - written
+                written = 0
+                logger.error(f"Profile write-behind flush failed: {e}")
+            finally:
+                db.close()
+            self.written += written
+            return written
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profile-write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and flush what is left"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self.deferred = 0
+            self.coalesced = 0
+            self.written = 0
+            self.failed = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            queued = len(self._pending)
+        return {
+            "queued_users": queued,
+            "deferred": self.deferred,
+            "coalesced": self.coalesced,
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+
+profile_writer = ProfileWriteBehind(SessionLocal, settings.PROFILE_WRITE_FLUSH_SECONDS)
@@ -0,0 +1,169 @@
+"""Recurrence rules for event series.
+
+A rule is a set of weekdays repeated every ``interval`` weeks from the week of
+its first date, up to and including its last date, minus excluded dates and
+ranges (holidays, spring break). Dates are computed arithmetically per
+weekday, so expanding a multi-year rule costs one step per occurrence rather
+than one per calendar day. Expansions are memoized per rule.
+
+Times are anchored in the series' local zone: every session starts at the
+same wall-clock time, and each one is converted to UTC on its own date, so
+sessions on either side of a DST change keep their local time.
+"""
+import bisect
+import heapq
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+from zoneinfo import ZoneInfo
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+WEEKDAY_NUMBERS = {
+    "Mon": 0, "Monday": 0,
+    "Tue": 1, "Tuesday": 1,
+    "Wed": 2, "Wednesday": 2,
+    "Thu": 3, "Thursday": 3,
+    "Fri": 4, "Friday": 4,
+    "Sat": 5, "Saturday": 5,
+    "Sun": 6, "Sunday": 6,
+}
+
+
+def parse_weekdays(names) -> tuple[int, ...]:
+    """Weekday numbers (Monday = 0) for names like "Mon" or "Monday"; raises KeyError"""
+    return tuple(sorted({WEEKDAY_NUMBERS[name] for name in names}))
+
+
+def parse_exclusions(values) -> tuple[tuple[date, date], ...]:
+    """Inclusive date ranges from "YYYY-MM-DD" or "YYYY-MM-DD/YYYY-MM-DD" strings.
+    Raises ValueError for malformed or reversed ranges.
+    """
+    ranges = []
+    for value in values or ():
+        first, _, last = value.partition("/")
+        start = date.fromisoformat(first)
+        end = date.fromisoformat(last) if last else start
+        if end < start:
+            raise ValueError(f"Exclusion range ends before it starts: {value}")
+        ranges.append((start, end))
+    return tuple(sorted(ranges))
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    weekdays: tuple[int, ...]
+    start: date
+    until: date
+    interval: int = 1
+    exclusions: tuple[tuple[date, date], ...] = ()
+
+
+def _weekday_dates(rule: RecurrenceRule, weekday: int) -> range:
+    """Ordinals of every ``weekday`` the rule hits, as an arithmetic range"""
+    step = 7 * rule.interval
+    week_start = rule.start.toordinal() - rule.start.weekday()
+    anchor = week_start + weekday
+    first = max(0, -(-(rule.start.toordinal() - anchor) // step))
+    last = (rule.until.toordinal() - anchor) // step
+    return range(anchor + first * step, anchor + last * step + 1, step)
+
+
+def _merge_exclusions(exclusions) -> tuple[list[int], list[int]]:
+    starts: list[int] = []
+    ends: list[int] = []
+    for first, last in sorted(exclusions):
+        if starts and first.toordinal() <= ends[-1] + 1:
+            ends[-1] = max(ends[-1], last.toordinal())
+        else:
+            starts.append(first.toordinal())
+            ends.append(last.toordinal())
+    return starts, ends
+
+
+class RecurrenceEngine:
+    def __init__(self, cache_size: int):
+        self._cache = TTLCache(maxsize=cache_size)
+
+    def dates(self, rule: RecurrenceRule) -> tuple[date, ...]:
+        """Every date of the rule in order (memoized)"""
+        cached = self._cache.get(rule)
+        if cached is not None:
+            return cached
+        if rule.until < rule.start or rule.interval < 1:
+            result: tuple[date, ...] = ()
+        else:
+            ordinals = heapq.merge(*(_weekday_dates(rule, wd) for wd in rule.weekdays))
+            starts, ends = _merge_exclusions(rule.exclusions)
+            if starts:
+                # Keep an ordinal unless the last exclusion starting at or before it covers it
+                ordinals = (
+                    o for o in ordinals
+                    if (i := bisect.bisect_right(starts, o) - 1) < 0 or o > ends[i]
+                )
+            result = tuple(map(date.fromordinal, ordinals))
+        self._cache.set(rule, result)
+        return result
+
+    def occurrences(
+        self,
+        rule: RecurrenceRule,
+        start_time: time,
+        end_time: time,
+        tz: ZoneInfo,
+    ) -> list[tuple[datetime, datetime]]:
+        """UTC (start, end) of each date at the given local wall-clock times"""
+        return [
+            (
+                datetime.combine(d, start_time, tzinfo=tz).astimezone(timezone.utc),
+                datetime.combine(d, end_time, tzinfo=tz).astimezone(timezone.utc),
+            )
+            for d in self.dates(rule)
+        ]
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+recurrence = RecurrenceEngine(settings.RECURRENCE_CACHE_SIZE)
+
+
+def series_rule(parent, until: datetime | None = None) -> RecurrenceRule:
+    """The rule stored on a series' parent event, optionally cut off at ``until``.
+    Open-ended series must be given ``until``.
+    """
+    tz = ZoneInfo(parent.recurrence_timezone or "UTC")
+    start = _as_utc(parent.start_time).astimezone(tz).date()
+    last = _as_utc(parent.end_date).astimezone(tz).date() if parent.end_date else None
+    if until is not None:
+        cutoff = _as_utc(until).astimezone(tz).date()
+        last = cutoff if last is None else min(last, cutoff)
+    return RecurrenceRule(
+        weekdays=parse_weekdays(parent.weekdays or ()),
+        start=start,
+        until=last,
+        interval=parent.recurrence_interval or 1,
+        exclusions=parse_exclusions(parent.recurrence_exclusions),
+    )
+
+
+def series_occurrences(parent, until: datetime | None = None) -> list[tuple[datetime, datetime]]:
+    """UTC (start, end) of a series' sessions after the parent's own, at the
+    parent's wall-clock times in the series' timezone"""
+    tz = ZoneInfo(parent.recurrence_timezone or "UTC")
+    start_local = _as_utc(parent.start_time).astimezone(tz)
+    end_local = _as_utc(parent.end_time).astimezone(tz)
+    rule = series_rule(parent, until)
+    return [
+        (start, end)
+        for start, end in recurrence.occurrences(rule, start_local.time(), end_local.time(), tz)
+        if start > _as_utc(parent.start_time)
+    ]
+
+
+def _as_utc(dt: datetime) -> datetime:
+    # SQLite hands stored UTC datetimes back naive
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
@@ -0,0 +1,166 @@
+"""Process-local index of check-in tokens to event check-in windows.
+
+A scan only needs the event id, name and open/close times, so they are kept
+here instead of hydrating an Event per request. Unknown tokens are remembered
+in a short-lived negative cache so garbage scans never reach the database.
+Entries expire after CHECKIN_TOKEN_INDEX_TTL_SECONDS, which bounds staleness
+across workers; deletes in this process invalidate immediately. Signed QR
+tokens (app.core.qr_tokens) are indexed by event id instead of token text.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.event import Event
+
+# Negative-cache marker returned by CheckInTokenIndex.get
+UNKNOWN_TOKEN = object()
+
+
+def _as_utc(dt: datetime) -> datetime:
+    # SQLite hands back naive datetimes; stored values are UTC
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
+@dataclass(frozen=True, slots=True)
+class TokenWindow:
+    event_id: int
+    name: str
+    opens_at: datetime
+    closes_at: datetime
+
+    @classmethod
+    def from_row(cls, event_id: int, name: str, start_time: datetime, end_time: datetime, open_minutes: int):
+        start = _as_utc(start_time)
+        return cls(event_id, name, start - timedelta(minutes=open_minutes), _as_utc(end_time))
+
+    @classmethod
+    def from_event(cls, event: Event) -> "TokenWindow":
+        return cls.from_row(event.id, event.name, event.start_time, event.end_time, event.checkin_open_minutes)
+
+    def is_open(self, now: datetime) -> bool:
+        return self.opens_at <= now <= self.closes_at
+
+
+# Columns TokenWindow.from_row expects, in order
+WINDOW_COLUMNS = (Event.id, Event.name, Event.start_time, Event.end_time, Event.checkin_open_minutes)
+
+
+class CheckInTokenIndex:
+    def __init__(self, maxsize: int, ttl_seconds: float, negative_size: int, negative_ttl_seconds: float):
+        self._windows = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self._unknown = TTLCache(maxsize=negative_size, ttl_seconds=negative_ttl_seconds)
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.preloaded = 0
+
+    def get(self, token: str):
+        """TokenWindow for a known token, UNKNOWN_TOKEN for a cached miss, or None
+        when the index has no answer and the database must be asked.
+        """
+        window = self._windows.get(token)
+        if window is not None:
+            self.hits += 1
+            return window
+        if self._unknown.get(token) is not None:
+            self.negative_hits += 1
+            return UNKNOWN_TOKEN
+        self.misses += 1
+        return None
+
+    def put(self, token: str, window: TokenWindow) -> None:
+        self._unknown.pop(token)
+        self._windows.set(token, window)
+
+    def put_unknown(self, token: str) -> None:
+        self._unknown.set(token, True)
+
+    def lookup(self, db: Session, token: str) -> TokenWindow | None:
+        """Resolve a token through the index, loading just the window columns on a miss"""
+        window = self.get(token)
+        if window is UNKNOWN_TOKEN:
+            return None
+        if window is not None:
+            return window
+        return self.load(db, token)
+
+    def load(self, db: Session, token: str) -> TokenWindow | None:
+        """Read just the window columns for a token and remember the answer"""
+        return self._load(db, token, Event.checkin_token == token)
+
+    def lookup_event(self, db: Session, event_id: int) -> TokenWindow | None:
+        """Resolve the window for an event id (the subject of a signed token)"""
+        key = ("event", event_id)
+        window = self.get(key)
+        if window is UNKNOWN_TOKEN:
+            return None
+        if window is not None:
+            return window
+        return self._load(db, key, Event.id == event_id)
+
+    def _load(self, db: Session, key, condition) -> TokenWindow | None:
+        row = db.execute(select(*WINDOW_COLUMNS).where(condition)).first()
+        if row is None:
+            self.put_unknown(key)
+            return None
+        window = TokenWindow.from_row(*row)
+        self.put(key, window)
+        return window
+
+    def preload(self, db: Session, hours: float, now: datetime | None = None) -> int:
+        """Index events that start within the next ``hours`` and have not ended yet"""
+        now = now or datetime.now(timezone.utc)
+        rows = db.execute(
+            select(Event.checkin_token, *WINDOW_COLUMNS)
+            .where(Event.start_time <= now + timedelta(hours=hours), Event.end_time >= now)
+            .order_by(Event.start_time)
+            .limit(self._windows.maxsize)
+        ).all()
+        for token, *columns in rows:
+            self._windows.set(token, TokenWindow.from_row(*columns))
+        self.preloaded += len(rows)
+        return len(rows)
+
+    def invalidate(self, token: str | None = None, event_ids=None) -> None:
+        """Drop a token and/or every entry for the given event ids"""
+        if token is not None:
+            self._windows.pop(token)
+            self._unknown.pop(token)
+        if event_ids:
+            ids = set(event_ids)
+            self._windows.discard_where(lambda _, window: window.event_id in ids)
+
+    def clear(self) -> None:
+        self._windows.clear()
+        self._unknown.clear()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.preloaded = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "size": len(self._windows),
+            "maxsize": self._windows.maxsize,
+            "unknown_size": len(self._unknown),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self._windows.evictions,
+            "preloaded": self.preloaded,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 4) if lookups else None,
+        }
+
+
+token_index = CheckInTokenIndex(
+    settings.CHECKIN_TOKEN_INDEX_SIZE,
+    settings.CHECKIN_TOKEN_INDEX_TTL_SECONDS,
+    settings.CHECKIN_TOKEN_NEGATIVE_CACHE_SIZE,
+    settings.CHECKIN_TOKEN_NEGATIVE_TTL_SECONDS,
+)
@@ -0,0 +1,103 @@
+"""Microbenchmark: per-request token verification overhead, before vs after routing.
+
+"before" replays the old get_current_user flow with Auth0 configured: fetch the
+JWKS for every request, try RS256 first and fall back to HS256 on failure.
+"after" is app.api.deps.verify_token (alg routing + JWKS cache + decode cache).
+The JWKS is served by a local HTTP stub, so "before" numbers understate a real
+round trip to the Auth0 tenant.
+
+    cd backend && python -m benchmarks.bench_auth [iterations]
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from app.api import deps
+from app.core.security import create_access_token
+
+
+def _start_jwks_stub(jwks: dict):
+    body = json.dumps(jwks).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _legacy_verify(token: str) -> dict:
+    """The pre-routing flow: Auth0 first (fresh JWKS each time), HS256 fallback."""
+    try:
+        jwks = deps._fetch_jwks()
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            raise ValueError("No kid in token")
+        key = next(k for k in jwks["keys"] if k["kid"] == kid)
+        rsa_key = RSAAlgorithm.from_jwk(json.dumps(key))
+        payload = jwt.decode(
+            token, rsa_key, algorithms=["RS256"],
+            audience=deps.settings.AUTH0_AUDIENCE, issuer=f"https://{deps.settings.AUTH0_DOMAIN}/",
+        )
+        return {"email": payload.get("email") or payload.get("sub")}
+    except Exception:
+        return deps.verify_hs256_token(token)
+
+
+def _time(fn, token: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(token)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(iterations: int = 500) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": "bench", "alg": "RS256", "use": "sig"})
+    server = _start_jwks_stub({"keys": [jwk]})
+
+    deps.settings.AUTH0_DOMAIN = "bench.example.com"
+    deps.settings.AUTH0_AUDIENCE = "bench-audience"
+    deps.settings.AUTH0_JWKS_URL = f"http://127.0.0.1:{server.server_port}/jwks.json"
+
+    exp = int(time.time()) + 3600
+    rs256 = jwt.encode(
+        {"sub": "auth0|bench", "email": "bench@example.com", "aud": "bench-audience",
+         "iss": "https://bench.example.com/", "exp": exp},
+        private_key, algorithm="RS256", headers={"kid": "bench"},
+    )
+    hs256 = create_access_token("bench@example.com", deps.settings.SECRET_KEY, 60)
+
+    def after_uncached(token):
+        deps.token_cache.clear()
+        return deps.verify_token(token)
+
+    print(f"{'token':<8}{'before (us)':>14}{'after, cold decode (us)':>26}{'after, cached (us)':>21}")
+    for label, token in (("HS256", hs256), ("RS256", rs256)):
+        before = _time(_legacy_verify, token, iterations)
+        cold = _time(after_uncached, token, iterations)
+        deps.verify_token(token)
+        warm = _time(deps.verify_token, token, iterations)
+        print(f"{label:<8}{before:>14.1f}{cold:>26.1f}{warm:>21.1f}")
+
+    print(f"jwks cache: {deps.jwks_cache.stats()}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,131 @@
+"""Benchmark: per-request check-in transactions vs. burst-mode group commit.
+
+All scans for one event are released at once from a pool of worker threads
+(standing in for the server's request threads). Latency is measured from the
+release to the moment the caller has its result, so it includes queueing.
+In the app the check-in endpoint awaits the group commit on the event loop,
+so waiting scans are not bounded by the server's worker thread pool.
+
+Uses BENCH_DATABASE_URL (e.g. a scratch PostgreSQL database) or a SQLite file
+in /tmp; the schema is created and the tables are truncated per run.
+
+    cd backend && python -m benchmarks.bench_checkin_burst [scans ...]
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+# Audit rows go in the check-in transaction so both paths do the same writes
+os.environ.setdefault("AUDIT_MODE", "transaction")
+
+from sqlalchemy import create_engine, delete, event as sa_event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models.attendance import Attendance  # noqa: E402
+from app.models.audit_log import AuditLog  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.event import Event  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.repositories.attendance_repo import AttendanceRepository, CheckInStatus  # noqa: E402
+from app.services.checkin_batcher import CheckInBatcher, stage_check_in_audit  # noqa: E402
+from app.services.token_index import token_index  # noqa: E402
+
+URL = os.getenv("BENCH_DATABASE_URL", "sqlite:////tmp/bench_checkin.db")
+WORKERS = int(os.getenv("BENCH_WORKERS", "256"))
+MAX_BATCH = int(os.getenv("CHECKIN_BATCH_MAX_SIZE", "200"))
+MAX_WAIT_MS = float(os.getenv("CHECKIN_BATCH_MAX_WAIT_MS", "10"))
+
+
+def _engine():
+    if not URL.startswith("sqlite"):
+        return create_engine(URL, pool_size=WORKERS, max_overflow=0)
+    engine = create_engine(URL, connect_args={"check_same_thread": False, "timeout": 120}, pool_size=WORKERS)
+
+    @sa_event.listens_for(engine, "connect")
+    def _wal(dbapi_conn, _):
+        dbapi_conn.execute("PRAGMA journal_mode=WAL")
+        dbapi_conn.execute("PRAGMA synchronous=FULL")
+
+    return engine
+
+
+def _setup(Session, n: int) -> tuple[str, list[tuple[int, str]]]:
+    with Session() as db:
+        for model in (AuditLog, Attendance, Event, User):
+            db.execute(delete(model))
+        db.execute(insert(User), [{"email": f"s{i}@bench.edu", "name": f"S{i}", "password_hash": ""} for i in range(n)])
+        users = [(u.id, u.email) for u in db.query(User).order_by(User.id)]
+        now = datetime.now(timezone.utc)
+        db.add(Event(
+            name="Bench", location="Arena", start_time=now, end_time=now + timedelta(hours=1),
+            checkin_open_minutes=15, organizer_id=users[0][0], checkin_token="bench-token",
+        ))
+        db.commit()
+    token_index.clear()
+    return "bench-token", users
+
+
+def _per_request(Session, token: str, user: tuple[int, str], now: datetime):
+    repo = AttendanceRepository()
+    with Session() as db:
+        result = repo.check_in(db, token, user[0], now)
+        if result.status is CheckInStatus.CHECKED_IN:
+            stage_check_in_audit(db, user[1], result)
+        db.commit()
+        return result
+
+
+def _run(label: str, scan, users) -> None:
+    gate = threading.Event()
+    latencies: list[float] = []
+    now = datetime.now(timezone.utc)
+
+    def task(user):
+        gate.wait()
+        result = scan(user, now)
+        latencies.append(time.perf_counter() - released)
+        return result.status
+
+    with ThreadPoolExecutor(max_workers=min(WORKERS, len(users))) as pool:
+        futures = [pool.submit(task, u) for u in users]
+        time.sleep(0.2)
+        released = time.perf_counter()
+        gate.set()
+        statuses = [f.result() for f in futures]
+    wall = time.perf_counter() - released
+
+    ok = sum(s is CheckInStatus.CHECKED_IN for s in statuses)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"  {label:<12} {len(users) / wall:>9.0f} scans/s   p50 {p50:>8.1f} ms   p99 {p99:>8.1f} ms   ok {ok}/{len(users)}")
+
+
+def main(sizes: list[int]) -> None:
+    engine = _engine()
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    print(f"{URL.split('://')[0]}, {WORKERS} workers, batch <= {MAX_BATCH}, wait <= {MAX_WAIT_MS} ms")
+
+    for n in sizes:
+        print(f"{n} concurrent scans")
+        token, users = _setup(Session, n)
+        _run("per-request", lambda u, now: _per_request(Session, token, u, now), users)
+
+        token, users = _setup(Session, n)
+        batcher = CheckInBatcher(Session, MAX_BATCH, MAX_WAIT_MS, result_timeout=600)
+
+        def burst(u, now):
+            with Session() as db:
+                return batcher.check_in(db, token, u[0], u[1], now)
+
+        _run("group-commit", burst, users)
+        print(f"  {'':<12} {batcher.stats()['batches']} groups, largest {batcher.stats()['largest_batch']}")
+        batcher.stop()
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [200, 1000, 5000])
@@ -0,0 +1,102 @@
+"""Benchmark: attendance CSV export memory and time to first byte.
+
+Exports an event with ROWS attendances both ways:
+
+- buffered: every (Attendance, User) pair loaded with .all() and joined into
+  one string, as export_csv used to;
+- streamed: the StreamingResponse body, one yield_per batch at a time, as it
+  does now (plain and gzip).
+
+Reports the Python heap peak (tracemalloc) and the time until the first
+chunk is available. Uses BENCH_DATABASE_URL (e.g. a scratch PostgreSQL
+database, where yield_per uses a server-side cursor) or a SQLite file in /tmp.
+
+    cd backend && python -m benchmarks.bench_csv_export [rows]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.events import _attendance_csv
+from app.models.attendance import Attendance
+from app.models.base import Base
+from app.models.event import Event
+from app.models.user import User
+
+URL = os.getenv("BENCH_DATABASE_URL", "sqlite:////tmp/bench_csv_export.db")
+
+
+def _setup(Session, rows: int) -> int:
+    with Session() as db:
+        for model in (Attendance, Event, User):
+            db.execute(delete(model))
+        db.execute(insert(User), [
+            {"email": f"user{i}@bench.edu", "name": f"User {i}", "password_hash": ""} for i in range(rows + 1)
+        ])
+        user_ids = db.execute(select(User.id).order_by(User.id)).scalars().all()
+        start = datetime.now(timezone.utc)
+        event = Event(
+            name="Convocation", location="Spartanburg SC", start_time=start, end_time=start + timedelta(hours=2),
+            checkin_token="bench-csv", organizer_id=user_ids[0],
+        )
+        db.add(event)
+        db.flush()
+        for i in range(0, rows, 10_000):
+            db.execute(insert(Attendance), [
+                {"event_id": event.id, "attendee_id": uid, "checked_in_at": start + timedelta(seconds=n)}
+                for n, uid in enumerate(user_ids[1 + i:1 + i + 10_000], start=i)
+            ])
+        db.commit()
+        return event.id
+
+
+def buffered(db, event: Event):
+    records = (
+        db.query(Attendance, User)
+        .join(User, Attendance.attendee_id == User.id)
+        .filter(Attendance.event_id == event.id)
+        .order_by(Attendance.checked_in_at.asc())
+        .all()
+    )
+    lines = [
+        f"{event.name},{event.location},{att.attendee_id},{usr.name},{usr.email},{att.checked_in_at.isoformat()}"
+        for att, usr in records
+    ]
+    yield ("header\n" + "\n".join(lines) + f"\n\nOrganizer Name:,x\nTotal Attendance:,{len(records)}\n").encode()
+
+
+def main(rows: int) -> None:
+    engine = create_engine(URL)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    event_id = _setup(Session, rows)
+    print(f"{URL.split('://')[0]}, {rows} rows")
+
+    for label, export in (
+        ("buffered", buffered),
+        ("streamed", lambda db, event: _attendance_csv(db, event, "x", False)),
+        ("gzip", lambda db, event: _attendance_csv(db, event, "x", True)),
+    ):
+        with Session() as db:
+            event = db.get(Event, event_id)
+            tracemalloc.start()
+            started = time.perf_counter()
+            first = None
+            size = 0
+            for chunk in export(db, event):
+                first = first or time.perf_counter() - started
+                size += len(chunk)
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        print(f"  {label:<10} peak {peak / 2**20:>8.1f} MiB  first byte {first * 1e3:>8.1f} ms  "
+              f"total {elapsed * 1e3:>8.1f} ms  {size / 2**20:>6.1f} MiB out")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
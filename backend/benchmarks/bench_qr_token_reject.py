@@ -0,0 +1,89 @@
+"""Benchmark: cost of rejecting a bad check-in scan.
+
+Compares signed rotating QR tokens, which are verified and time-checked in
+CPU, with static tokens, which need a database lookup unless the token index
+has already cached the miss. Each case calls AttendanceRepository.check_in the
+way the check-in endpoint does and reports the mean cost per rejected scan.
+
+Uses BENCH_DATABASE_URL (e.g. a scratch PostgreSQL database) or a SQLite file
+in /tmp; the schema is created and the tables are truncated per run.
+
+    cd backend && python -m benchmarks.bench_qr_token_reject [scans]
+"""
+import os
+import secrets
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core import qr_tokens
+from app.core.config import settings
+from app.models.attendance import Attendance
+from app.models.base import Base
+from app.models.event import Event
+from app.models.user import User
+from app.repositories.attendance_repo import AttendanceRepository, CheckInStatus
+from app.services.token_index import token_index
+
+URL = os.getenv("BENCH_DATABASE_URL", "sqlite:////tmp/bench_qr_tokens.db")
+EVENTS = int(os.getenv("BENCH_EVENTS", "10000"))
+
+
+def _setup(Session) -> tuple[int, int]:
+    with Session() as db:
+        for model in (Attendance, Event, User):
+            db.execute(delete(model))
+        db.execute(insert(User), [{"email": "org@bench.edu", "name": "Org", "password_hash": ""}])
+        organizer_id = db.query(User.id).scalar()
+        now = datetime.now(timezone.utc)
+        db.execute(insert(Event), [{
+            "name": f"E{i}", "location": "Hall", "start_time": now + timedelta(minutes=5),
+            "end_time": now + timedelta(hours=1), "checkin_open_minutes": 15,
+            "organizer_id": organizer_id, "checkin_token": secrets.token_urlsafe(16),
+        } for i in range(EVENTS)])
+        db.commit()
+        return db.query(Event.id).first()[0], organizer_id
+
+
+def _run(label: str, Session, tokens: list[str], user_id: int) -> None:
+    repo = AttendanceRepository()
+    now = datetime.now(timezone.utc)
+    with Session() as db:
+        started = time.perf_counter()
+        for token in tokens:
+            result = repo.check_in(db, token, user_id, now)
+            assert result.status in (CheckInStatus.NOT_FOUND, CheckInStatus.NOT_OPEN), result
+        elapsed = time.perf_counter() - started
+        db.rollback()
+    print(f"  {label:<32} {elapsed / len(tokens) * 1e6:>9.1f} us/scan   {len(tokens) / elapsed:>10.0f} scans/s")
+
+
+def main(n: int) -> None:
+    engine = create_engine(URL)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    event_id, user_id = _setup(Session)
+    print(f"{URL.split('://')[0]}, {EVENTS} events, {n} rejected scans per case")
+
+    now = datetime.now(timezone.utc)
+    secret, rotation = settings.QR_TOKEN_SECRET, settings.QR_TOKEN_ROTATION_SECONDS
+    valid, _ = qr_tokens.issue(event_id, now, now + timedelta(hours=1), now, secret, rotation)
+    stale, _ = qr_tokens.issue(event_id, now, now + timedelta(hours=1), now - timedelta(hours=1), secret, rotation)
+    payload = valid.rpartition(".")[0]
+
+    token_index.clear()
+    forged = [f"{payload}.{secrets.token_urlsafe(16)}" for _ in range(n)]
+    _run("signed, forged signature", Session, forged, user_id)
+    _run("signed, expired rotation", Session, [stale] * n, user_id)
+
+    token_index.clear()
+    garbage = [secrets.token_urlsafe(16) for _ in range(n)]
+    _run("static, unknown (db lookup)", Session, garbage, user_id)
+    _run("static, unknown (negative cache)", Session, garbage, user_id)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
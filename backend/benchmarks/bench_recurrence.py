@@ -0,0 +1,58 @@
+"""Benchmark: expanding a recurrence rule into session dates.
+
+Expands YEARS-long Mon/Wed/Fri rules with a few exclusion ranges, both ways:
+
+- day walk: test every calendar day between the first and last date, as
+  create_event's get_dates_between used to;
+- engine: RecurrenceEngine.dates, cold (a fresh rule each time) and memoized
+  (the same rule again).
+
+    cd backend && python -m benchmarks.bench_recurrence [years] [repeats]
+"""
+import sys
+import time
+from datetime import date, timedelta
+
+from app.services.recurrence import RecurrenceEngine, RecurrenceRule, parse_exclusions
+
+EXCLUSIONS = parse_exclusions(["2026-03-09/2026-03-13", "2026-11-25/2026-11-27", "2026-12-21/2027-01-01"])
+
+
+def day_walk(rule: RecurrenceRule) -> list[date]:
+    out, day = [], rule.start
+    while day <= rule.until:
+        if day.weekday() in rule.weekdays and not any(a <= day <= b for a, b in rule.exclusions):
+            out.append(day)
+        day += timedelta(days=1)
+    return out
+
+
+def main(years: int, repeats: int) -> None:
+    start = date(2026, 1, 5)
+    rules = [
+        RecurrenceRule((0, 2, 4), start, start + timedelta(days=365 * years + i), 1, EXCLUSIONS)
+        for i in range(repeats)
+    ]
+    engine = RecurrenceEngine(repeats)
+    assert day_walk(rules[0]) == list(engine.dates(rules[0]))
+    engine.clear()
+    print(f"{years} year rule, {len(engine.dates(rules[0]))} dates, {repeats} expansions")
+    engine.clear()
+
+    for label, expand in (
+        ("day walk", day_walk),
+        ("cold", engine.dates),
+        ("memoized", lambda rule: engine.dates(rules[0])),
+    ):
+        started = time.perf_counter()
+        for rule in rules:
+            expand(rule)
+        elapsed = time.perf_counter() - started
+        print(f"  {label:<10} {elapsed * 1e6 / repeats:>10.1f} us/rule")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 4,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    )
@@ -0,0 +1,97 @@
+"""Benchmark: creating a recurring series with its members.
+
+Times the writes create_event makes for a series of SESSIONS sessions and
+MEMBERS members, both ways:
+
+- per row: a create() (add, flush, refresh) per session and an add_member()
+  flush per member on every session, as create_event used to;
+- bulk: members attached once to the parent and every session inserted by
+  one multi-row INSERT ... RETURNING, as it does now.
+
+Uses BENCH_DATABASE_URL (e.g. a scratch PostgreSQL database) or a SQLite file
+in /tmp; the schema is created and the tables are truncated per run.
+
+    cd backend && python -m benchmarks.bench_series_create [sessions] [members]
+"""
+import os
+import secrets
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.event import Event
+from app.models.event_member import EventMember
+from app.models.user import User
+from app.repositories.event_member_repo import EventMemberRepository
+from app.repositories.event_repo import EventRepository
+
+URL = os.getenv("BENCH_DATABASE_URL", "sqlite:////tmp/bench_series_create.db")
+
+event_repo = EventRepository()
+member_repo = EventMemberRepository()
+
+
+def _setup(Session, members: int) -> tuple[int, list[int]]:
+    with Session() as db:
+        for model in (EventMember, Event, User):
+            db.execute(delete(model))
+        db.execute(insert(User), [
+            {"email": f"user{i}@bench.edu", "name": f"User {i}", "password_hash": ""}
+            for i in range(members + 1)
+        ])
+        db.commit()
+        ids = db.execute(select(User.id).order_by(User.id)).scalars().all()
+        return ids[0], ids[1:]
+
+
+def _session(organizer_id: int, start: datetime, parent_id: int | None = None) -> dict:
+    return dict(
+        name="Series", location="Hall", start_time=start, end_time=start + timedelta(hours=1),
+        checkin_open_minutes=15, checkin_token=secrets.token_urlsafe(16), organizer_id=organizer_id,
+        recurring=True, weekdays=["Mon", "Wed", "Fri"], parent_id=parent_id,
+    )
+
+
+def per_row(db, organizer_id: int, member_ids: list[int], starts: list[datetime]) -> None:
+    parent = event_repo.create(db, **_session(organizer_id, starts[0]))
+    for member_id in member_ids:
+        member_repo.add_member(db, parent.id, member_id)
+    for start in starts[1:]:
+        child = event_repo.create(db, **_session(organizer_id, start, parent.id))
+        for member_id in member_ids:
+            member_repo.add_member(db, child.id, member_id)
+
+
+def bulk(db, organizer_id: int, member_ids: list[int], starts: list[datetime]) -> None:
+    parent = event_repo.create(db, **_session(organizer_id, starts[0]))
+    member_repo.add_members(db, parent.id, member_ids)
+    event_repo.create_sessions(db, [_session(organizer_id, start, parent.id) for start in starts[1:]])
+
+
+def main(sessions: int, members: int) -> None:
+    engine = create_engine(URL)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    organizer_id, member_ids = _setup(Session, members)
+    print(f"{URL.split('://')[0]}, {sessions} sessions, {members} members")
+
+    first = datetime.now(timezone.utc) + timedelta(days=1)
+    starts = [first + timedelta(days=2 * i) for i in range(sessions)]
+    for label, create in (("per row", per_row), ("bulk", bulk)):
+        with Session() as db:
+            started = time.perf_counter()
+            create(db, organizer_id, member_ids, starts)
+            db.commit()
+            elapsed = time.perf_counter() - started
+        print(f"  {label:<10} {elapsed * 1e3:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 80,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+    )
@@ -1,18 +1,27 @@
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from app.main import app
-from app.api.deps import get_db
+from app.api.deps import get_db, jwks_cache, token_cache, principal_cache
 from app.models.base import Base
 from app.models.user import User, UserRole
 from app.models.user_role import UserRoleAssignment
 from app.core.security import get_password_hash
+from app.services.profile_writer import profile_writer
+from app.services.audit_sink import audit_sink
+from app.services.token_index import token_index
+from app.services.checkin_batcher import checkin_batcher
+from app.services.attendance_stream import attendance_broker
+from app.services.recurrence import recurrence
+from app.services.event_deleter import event_deleter
 
 # Simple test database
 SQLITE_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLITE_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+event_deleter.session_factory = TestingSessionLocal
 
 @pytest.fixture
 def db():
@@ -83,11 +92,55 @@ def setup_test_db():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def reset_auth_caches():
+    """Process-wide caches and queues must not leak between tests."""
+    jwks_cache.clear()
+    token_cache.clear()
+    principal_cache.clear()
+    profile_writer.clear()
+    audit_sink.clear()
+    token_index.clear()
+    checkin_batcher.clear()
+    attendance_broker.clear()
+    recurrence.clear()
+    event_deleter.clear()
+    yield
+    jwks_cache.clear()
+    token_cache.clear()
+    principal_cache.clear()
+    profile_writer.clear()
+    audit_sink.clear()
+    token_index.clear()
+    checkin_batcher.clear()
+    attendance_broker.clear()
+    recurrence.clear()
+    event_deleter.clear()
+
+
 @pytest.fixture
 def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def count_queries():
+    """``with count_queries() as statements:`` records the SQL run on the test engine"""
+    @contextmanager
+    def _count():
+        statements: list[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return _count
+
+
 @pytest.fixture
 def token_organizer(client):
     res = client.post("/api/v1/auth/login", json={"email": "grayj@wofford.edu", "password": "grayj"})
@@ -25,4 +25,246 @@ def test_create_event_and_checkin(client: TestClient, token_organizer: str, toke
 
     hs = {"Authorization": f"Bearer {token_student}"}
     rc = client.post("/api/v1/events/checkin", json={"event_token": ev["checkin_token"]}, headers=hs)
-    assert rc.status_code == 200
\ No newline at end of file
+    assert rc.status_code == 200
+
+def test_checkin_duplicate_is_rejected(client: TestClient, token_organizer: str, token_student: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=-5))) + timedelta(minutes=5)
+    r = client.post("/api/v1/events/", json={
+        "name": "Lecture",
+        "location": "Hall",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+        "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+        "timezone": "America/New_York"
+    }, headers=h)
+    ev = r.json()
+
+    hs = {"Authorization": f"Bearer {token_student}"}
+    first = client.post("/api/v1/events/checkin", json={"event_token": ev["checkin_token"]}, headers=hs)
+    assert first.status_code == 200
+    assert first.json()["event_id"] == ev["id"]
+
+    second = client.post("/api/v1/events/checkin", json={"event_token": ev["checkin_token"]}, headers=hs)
+    assert second.status_code == 400
+    assert "already checked in" in second.text
+
+
+def test_checkin_outside_window(client: TestClient, token_organizer: str, token_student: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=-5))) + timedelta(days=2)
+    r = client.post("/api/v1/events/", json={
+        "name": "Later",
+        "location": "Hall",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+        "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+        "timezone": "America/New_York"
+    }, headers=h)
+    ev = r.json()
+
+    hs = {"Authorization": f"Bearer {token_student}"}
+    rc = client.post("/api/v1/events/checkin", json={"event_token": ev["checkin_token"]}, headers=hs)
+    assert rc.status_code == 400
+    assert "not open" in rc.text
+
+
+def test_checkin_after_event_deleted(client: TestClient, token_organizer: str, token_student: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=-5))) + timedelta(minutes=5)
+    r = client.post("/api/v1/events/", json={
+        "name": "Cancelled",
+        "location": "Hall",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+        "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+        "timezone": "America/New_York"
+    }, headers=h)
+    ev = r.json()
+
+    hs = {"Authorization": f"Bearer {token_student}"}
+    # Resolving the token puts it in the check-in token index
+    assert client.get(f"/api/v1/events/by-token/{ev['checkin_token']}", headers=hs).status_code == 200
+    assert client.delete(f"/api/v1/events/{ev['id']}", headers=h).status_code == 202
+
+    rc = client.post("/api/v1/events/checkin", json={"event_token": ev["checkin_token"]}, headers=hs)
+    assert rc.status_code == 404
+
+
+def test_checkin_burst_mode(monkeypatch, client: TestClient, token_organizer: str, token_student: str):
+    from app.core.config import settings
+    from app.services.checkin_batcher import checkin_batcher
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(settings, "CHECKIN_BURST_MODE", True)
+    monkeypatch.setattr(checkin_batcher, "session_factory", TestingSessionLocal)
+
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=-5))) + timedelta(minutes=5)
+    ev = client.post("/api/v1/events/", json={
+        "name": "Burst",
+        "location": "Arena",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+        "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+        "timezone": "America/New_York"
+    }, headers=h).json()
+
+    hs = {"Authorization": f"Bearer {token_student}"}
+    first = client.post("/api/v1/events/checkin", json={"event_token": ev["checkin_token"]}, headers=hs)
+    assert first.status_code == 200
+    assert first.json()["event_id"] == ev["id"]
+    second = client.post("/api/v1/events/checkin", json={"event_token": ev["checkin_token"]}, headers=hs)
+    assert second.status_code == 400
+    assert checkin_batcher.stats()["items"] == 2
+
+
+def test_checkin_burst_mode_busy_is_503(monkeypatch, client: TestClient, token_organizer: str, token_student: str):
+    import queue
+    from app.core.config import settings
+    from app.services.checkin_batcher import checkin_batcher
+
+    monkeypatch.setattr(settings, "CHECKIN_BURST_MODE", True)
+    # No writer: queued check-ins are never committed
+    monkeypatch.setattr(checkin_batcher, "_ensure_started", lambda: None)
+    monkeypatch.setattr(checkin_batcher, "_queue", queue.Queue(maxsize=1))
+    monkeypatch.setattr(checkin_batcher, "result_timeout", 0.1)
+
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=-5))) + timedelta(minutes=5)
+    ev = client.post("/api/v1/events/", json={
+        "name": "Burst",
+        "location": "Arena",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+        "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+        "timezone": "America/New_York"
+    }, headers=h).json()
+
+    hs = {"Authorization": f"Bearer {token_student}"}
+    stalled = client.post("/api/v1/events/checkin", json={"event_token": ev["checkin_token"]}, headers=hs)
+    assert stalled.status_code == 503
+    assert stalled.headers["Retry-After"] == "1"
+    full = client.post("/api/v1/events/checkin", json={"event_token": ev["checkin_token"]}, headers=hs)
+    assert full.status_code == 503
+    assert checkin_batcher.stats()["rejected"] == 1
+
+
+def test_checkin_with_rotating_qr_token(client: TestClient, token_organizer: str, token_student: str):
+    from app.core import qr_tokens
+    from app.core.config import settings
+    from app.services.token_index import token_index
+
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=-5))) + timedelta(minutes=5)
+    ev = client.post("/api/v1/events/", json={
+        "name": "Rotating",
+        "location": "Lab",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+        "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+        "timezone": "America/New_York"
+    }, headers=h).json()
+
+    hs = {"Authorization": f"Bearer {token_student}"}
+    # Only the organizer (or an admin) can display the rotating code
+    assert client.get(f"/api/v1/events/{ev['id']}/qr-token", headers=hs).status_code == 403
+    r = client.get(f"/api/v1/events/{ev['id']}/qr-token", headers=h)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["rotation_seconds"] == settings.QR_TOKEN_ROTATION_SECONDS
+    token = body["token"]
+    assert qr_tokens.is_signed(token)
+
+    rt = client.get(f"/api/v1/events/by-token/{token}", headers=hs)
+    assert rt.status_code == 200
+    assert rt.json()["id"] == ev["id"]
+    # The static token is not revealed to someone holding a rotating one
+    assert rt.json()["checkin_token"] == token
+
+    # A forged token is rejected in CPU: the index is never consulted
+    forged = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+    misses = token_index.stats()["misses"]
+    assert client.post("/api/v1/events/checkin", json={"event_token": forged}, headers=hs).status_code == 404
+    assert token_index.stats()["misses"] == misses
+
+    rc = client.post("/api/v1/events/checkin", json={"event_token": token}, headers=hs)
+    assert rc.status_code == 200
+    assert rc.json()["event_id"] == ev["id"]
+    dup = client.post("/api/v1/events/checkin", json={"event_token": token}, headers=hs)
+    assert dup.status_code == 400
+
+    # Static tokens keep working alongside the signed ones
+    assert client.get(f"/api/v1/events/by-token/{ev['checkin_token']}", headers=hs).status_code == 200
+
+
+def test_checkin_with_expired_qr_token(client: TestClient, token_organizer: str, token_student: str):
+    from app.core import qr_tokens
+    from app.core.config import settings
+
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=-5))) + timedelta(minutes=5)
+    ev = client.post("/api/v1/events/", json={
+        "name": "Screenshot",
+        "location": "Lab",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+        "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+        "timezone": "America/New_York"
+    }, headers=h).json()
+
+    now = datetime.now(timezone.utc)
+    old, _ = qr_tokens.issue(
+        ev["id"], now - timedelta(hours=1), now + timedelta(hours=2),
+        now - timedelta(seconds=3 * settings.QR_TOKEN_ROTATION_SECONDS),
+        settings.QR_TOKEN_SECRET, settings.QR_TOKEN_ROTATION_SECONDS,
+    )
+    hs = {"Authorization": f"Bearer {token_student}"}
+    assert client.get(f"/api/v1/events/by-token/{old}", headers=hs).status_code == 404
+    rc = client.post("/api/v1/events/checkin", json={"event_token": old}, headers=hs)
+    assert rc.status_code == 400
+
+
+def test_attendance_stream_requires_organizer(client: TestClient, token_organizer: str, token_student: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=-5))) + timedelta(minutes=5)
+    ev = client.post("/api/v1/events/", json={
+        "name": "Streamed",
+        "location": "Hall",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+        "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+        "timezone": "America/New_York"
+    }, headers=h).json()
+
+    hs = {"Authorization": f"Bearer {token_student}"}
+    assert client.get(f"/api/v1/events/{ev['id']}/attendance/stream", headers=hs).status_code == 403
+    assert client.get("/api/v1/events/999999/attendance/stream", headers=h).status_code == 404
+
+
+def test_attendees_since_cursor_returns_only_new_checkins(client: TestClient, token_organizer: str, token_student: str, token_admin: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=-5))) + timedelta(minutes=5)
+    ev = client.post("/api/v1/events/", json={
+        "name": "Roster",
+        "location": "Hall",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+        "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+        "timezone": "America/New_York"
+    }, headers=h).json()
+    url = f"/api/v1/events/{ev['id']}/attendees"
+
+    empty = client.get(url, headers=h)
+    assert empty.json() == []
+    assert "x-next-cursor" not in empty.headers
+
+    hs = {"Authorization": f"Bearer {token_student}"}
+    assert client.post("/api/v1/events/checkin", json={"event_token": ev["checkin_token"]}, headers=hs).status_code == 200
+    full = client.get(url, headers=h)
+    assert [a["attendee_name"] for a in full.json()] == ["Collin Martin"]
+    cursor = full.headers["x-next-cursor"]
+
+    # Nothing new: empty delta, same cursor
+    idle = client.get(url, params={"since": cursor}, headers=h)
+    assert idle.json() == []
+    assert idle.headers["x-next-cursor"] == cursor
+
+    ha = {"Authorization": f"Bearer {token_admin}"}
+    assert client.post("/api/v1/events/checkin", json={"event_token": ev["checkin_token"]}, headers=ha).status_code == 200
+    delta = client.get(url, params={"since": cursor}, headers=h)
+    assert [a["attendee_name"] for a in delta.json()] == ["Admin User"]
+    assert delta.headers["x-next-cursor"] != cursor
+
+    assert client.get(url, params={"since": "not-a-cursor"}, headers=h).status_code == 400
@@ -39,4 +39,46 @@ def test_export_csv_forbidden(client, token_student):
     # Try to export as attendee (should be forbidden)
     headers = {"Authorization": f"Bearer {token_student}"}
     r = client.get("/api/v1/events/1/attendance.csv", headers=headers)
-    assert r.status_code in (403, 404)  # 404 if event doesn't exist, 403 if forbidden
\ No newline at end of file
+    assert r.status_code in (403, 404)  # 404 if event doesn't exist, 403 if forbidden
+
+def test_csv_export_streams_batches_with_footer_and_gzip(monkeypatch, client: TestClient, token_organizer: str):
+    import csv, io, zlib
+    from sqlalchemy import insert
+    from app.core.config import settings
+    from app.models.attendance import Attendance
+    from app.models.user import User
+    from tests.conftest import TestingSessionLocal
+
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    ev = client.post("/api/v1/events/", json={
+        "name": 'Lab "A", Section 2',
+        "location": "Spartanburg SC",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+        "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+        "timezone": "UTC",
+    }, headers=h).json()
+    with TestingSessionLocal() as db:
+        db.execute(insert(User), [
+            {"email": f"s{i}@wofford.edu", "name": f"Student, {i}", "password_hash": ""} for i in range(23)
+        ])
+        user_ids = [u.id for u in db.query(User).filter(User.email.like("s%@wofford.edu")).order_by(User.id)]
+        db.execute(insert(Attendance), [
+            {"event_id": ev["id"], "attendee_id": uid, "checked_in_at": start + timedelta(seconds=i)}
+            for i, uid in enumerate(user_ids)
+        ])
+        db.commit()
+    monkeypatch.setattr(settings, "CSV_EXPORT_YIELD_PER", 5)
+
+    plain = client.get(f"/api/v1/events/{ev['id']}/attendance.csv", headers={**h, "Accept-Encoding": "identity"})
+    assert plain.status_code == 200 and "content-encoding" not in plain.headers
+    rows = list(csv.reader(io.StringIO(plain.text)))
+    assert rows[0][0] == "Event Name" and len(rows) == 1 + 23 + 3
+    assert rows[1][:4] == ['Lab "A", Section 2', "Spartanburg, SC", str(user_ids[0]), "Student, 0"]
+    assert [r[2] for r in rows[1:24]] == [str(uid) for uid in user_ids]
+    assert rows[-3:] == [[], ["Organizer Name:", "John Gray"], ["Total Attendance:", "23"]]
+
+    with client.stream("GET", f"/api/v1/events/{ev['id']}/attendance.csv", headers={**h, "Accept-Encoding": "gzip"}) as r:
+        assert r.headers["content-encoding"] == "gzip"
+        body = b"".join(r.iter_raw())
+    assert zlib.decompress(body, wbits=31).decode() == plain.text
@@ -0,0 +1,89 @@
+import secrets
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.event_member import EventMember
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+STUDENT = "martincs@wofford.edu"
+
+
+def _add_series(past: int, upcoming: int, attended: int, threshold: int | None = None) -> int:
+    """A series the student belongs to: ``past`` + ``upcoming`` sessions (the parent
+    is the first past one), of which the first ``attended`` were attended"""
+    now = datetime.now(timezone.utc)
+    with TestingSessionLocal() as db:
+        organizer = db.query(User).filter(User.email == "grayj@wofford.edu").one()
+        student = db.query(User).filter(User.email == STUDENT).one()
+        starts = [now - timedelta(days=past - i) for i in range(past)]
+        starts += [now + timedelta(days=i + 1) for i in range(upcoming)]
+        events = [
+            Event(name="Series", location="Room", start_time=start, end_time=start + timedelta(hours=1),
+                  checkin_token=secrets.token_urlsafe(16), organizer_id=organizer.id, recurring=True,
+                  attendance_threshold=threshold)
+            for start in starts
+        ]
+        db.add(events[0])
+        db.flush()
+        for child in events[1:]:
+            child.parent_id = events[0].id
+        db.add_all(events[1:])
+        db.add(EventMember(event_id=events[0].id, user_id=student.id))
+        db.flush()
+        db.add_all(Attendance(event_id=e.id, attendee_id=student.id, checked_in_at=e.start_time)
+                   for e in events[:attended])
+        db.commit()
+        return events[0].id
+
+
+def test_my_events_summaries(client: TestClient, token_student: str):
+    h = {"Authorization": f"Bearer {token_student}"}
+    first = _add_series(past=4, upcoming=2, attended=3)
+    second = _add_series(past=5, upcoming=1, attended=1, threshold=2)
+
+    r = client.get("/api/v1/events/attendee/my-events", headers=h)
+    assert r.status_code == 200
+    summaries = {e["parent"]["id"]: e for e in r.json()["events"]}
+    assert (summaries[first]["attended"], summaries[first]["missed"], summaries[first]["flagged"]) == (3, 1, False)
+    assert (summaries[second]["attended"], summaries[second]["missed"], summaries[second]["flagged"]) == (1, 4, True)
+    assert summaries[first]["total_past_sessions"] == 4
+    assert summaries[first]["next_session"] is not None
+
+
+def test_attendee_event_details(client: TestClient, token_student: str, token_organizer: str):
+    parent_id = _add_series(past=3, upcoming=2, attended=2)
+
+    r = client.get(f"/api/v1/events/attendee/event/{parent_id}", headers={"Authorization": f"Bearer {token_student}"})
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["attended"], body["missed"], body["total_past_sessions"]) == (2, 1, 3)
+    assert [s["attended"] for s in body["past_sessions"]] == [True, False]
+    assert [s["attended"] for s in body["upcoming_sessions"]] == [False, False]
+
+    r = client.get(f"/api/v1/events/attendee/event/{parent_id}", headers={"Authorization": f"Bearer {token_organizer}"})
+    assert r.status_code == 403
+
+
+def test_attendee_views_query_count_is_constant(client: TestClient, token_student: str, count_queries):
+    h = {"Authorization": f"Bearer {token_student}"}
+    short = _add_series(past=2, upcoming=1, attended=1)
+    client.get("/api/v1/events/attendee/my-events", headers=h)  # warm the principal cache
+
+    with count_queries() as small_list:
+        client.get("/api/v1/events/attendee/my-events", headers=h)
+    with count_queries() as small_detail:
+        client.get(f"/api/v1/events/attendee/event/{short}", headers=h)
+
+    long = _add_series(past=30, upcoming=30, attended=20)
+    _add_series(past=10, upcoming=10, attended=5)
+    with count_queries() as large_list:
+        r = client.get("/api/v1/events/attendee/my-events", headers=h)
+    assert len(r.json()["events"]) == 3
+    with count_queries() as large_detail:
+        r = client.get(f"/api/v1/events/attendee/event/{long}", headers=h)
+    assert r.json()["attended"] == 20
+
+    assert len(large_list) == len(small_list) < 5
+    assert len(large_detail) == len(small_detail) < 5
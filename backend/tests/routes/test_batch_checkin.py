@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+
+def _create_event(client, token, name="Kiosk Event", start_in=timedelta(minutes=5)):
+    start = datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=-5))) + start_in
+    r = client.post("/api/v1/events/", json={
+        "name": name,
+        "location": "Gym",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+        "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+        "timezone": "America/New_York"
+    }, headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 200
+    return r.json()
+
+
+def _user_id(email):
+    db = TestingSessionLocal()
+    try:
+        return db.query(User).filter(User.email == email).one().id
+    finally:
+        db.close()
+
+
+def test_batch_checkin_statuses(client: TestClient, token_organizer: str):
+    ev = _create_event(client, token_organizer)
+    now = datetime.now(timezone.utc).isoformat()
+    collin = _user_id("martincs@wofford.edu")
+    records = [
+        {"event_token": ev["checkin_token"], "attendee_id": collin, "scanned_at": now},
+        {"event_token": ev["checkin_token"], "email": "podrebarackc@wofford.edu", "scanned_at": now},
+        {"event_token": ev["checkin_token"], "attendee_id": collin, "scanned_at": now},
+        {"event_token": ev["checkin_token"], "email": "nobody@wofford.edu", "scanned_at": now},
+        {"event_token": "no-such-token", "attendee_id": collin, "scanned_at": now},
+        {"event_token": ev["checkin_token"], "email": "gammahja@wofford.edu",
+         "scanned_at": (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()},
+    ]
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    r = client.post("/api/v1/events/checkin/batch", json={"records": records}, headers=h)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["statuses"] == ["checked_in", "checked_in", "duplicate", "unknown_user", "not_found", "not_open"]
+    assert body["counts"]["checked_in"] == 2
+
+    # Re-uploading the same scans is idempotent
+    again = client.post("/api/v1/events/checkin/batch", json={"records": records[:2]}, headers=h).json()
+    assert again["statuses"] == ["duplicate", "duplicate"]
+    attendees = client.get(f"/api/v1/events/{ev['id']}/attendees", headers=h).json()
+    assert len(attendees) == 2
+
+
+def test_batch_checkin_only_own_events(client: TestClient, token_organizer: str, token_admin: str):
+    ev = _create_event(client, token_admin, name="Admin Event")
+    now = datetime.now(timezone.utc).isoformat()
+    records = [{"event_token": ev["checkin_token"], "email": "martincs@wofford.edu", "scanned_at": now}]
+
+    r = client.post("/api/v1/events/checkin/batch", json={"records": records},
+                    headers={"Authorization": f"Bearer {token_organizer}"})
+    assert r.json()["statuses"] == ["forbidden"]
+
+    r = client.post("/api/v1/events/checkin/batch", json={"records": records},
+                    headers={"Authorization": f"Bearer {token_admin}"})
+    assert r.json()["statuses"] == ["checked_in"]
+
+
+def test_batch_checkin_requires_organizer(client: TestClient, token_student: str):
+    r = client.post("/api/v1/events/checkin/batch", json={"records": []},
+                    headers={"Authorization": f"Bearer {token_student}"})
+    assert r.status_code == 403
@@ -8,7 +8,7 @@ def _auth_header(token_admin: str) -> dict[str, str]:
     return {"Authorization": f"Bearer {token_admin}"}
 
 
-@patch("app.api.v1.users.AuditLogRepository.log_audit")
+@patch("app.api.v1.users.AuditLogRepository.add_audit")
 def test_user_actions_require_comment_when_not_testing(mock_audit, client: TestClient, token_admin: str):
     # Ensure TESTING is disabled and enforcement is enabled for this test
     prev_testing = os.environ.get("TESTING")
@@ -60,7 +60,7 @@ def test_user_actions_require_comment_when_not_testing(mock_audit, client: TestC
             os.environ["ENFORCE_COMMENT"] = prev_enforce
 
 
-@patch("app.api.v1.events.AuditLogRepository.log_audit")
+@patch("app.api.v1.events.AuditLogRepository.add_audit")
 def test_event_delete_requires_comment_when_not_testing(mock_audit, client: TestClient, token_admin: str):
     # Ensure TESTING is disabled and enforcement is enabled for this test
     prev_testing = os.environ.get("TESTING")
@@ -95,9 +95,9 @@ def test_event_delete_requires_comment_when_not_testing(mock_audit, client: Test
         r_delete_no_comment = client.delete(f"/api/v1/events/{event_id}", headers=h)
         assert r_delete_no_comment.status_code == 400
 
-        # Delete with comment -> should pass (200)
+        # Delete with comment -> accepted (202)
         r_delete_with_comment = client.delete(f"/api/v1/events/{event_id}?comment=Removing%20event", headers=h)
-        assert r_delete_with_comment.status_code == 200
+        assert r_delete_with_comment.status_code == 202
     finally:
         # Restore environment to avoid leaking to other tests
         if prev_testing is None:
@@ -0,0 +1,46 @@
+import secrets
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from app.models.event import Event
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+
+def _add_series(organizer_email: str, sessions: int, solo: bool = False) -> None:
+    now = datetime.now(timezone.utc)
+    with TestingSessionLocal() as db:
+        organizer = db.query(User).filter(User.email == organizer_email).one()
+
+        def event(start, **kw):
+            return Event(name="Series", location="Room", start_time=start, end_time=start + timedelta(hours=1),
+                         checkin_token=secrets.token_urlsafe(16), organizer_id=organizer.id, **kw)
+
+        first = now - timedelta(days=7)
+        parent = event(first, recurring=not solo)
+        db.add(parent)
+        db.flush()
+        for week in range(1, sessions):
+            db.add(event(first + timedelta(weeks=week), recurring=True, parent_id=parent.id))
+        db.commit()
+
+
+def test_dashboard_query_count_is_constant(client: TestClient, token_organizer: str, count_queries):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    client.get("/api/v1/events/dashboard/events", headers=h)  # warm the principal cache
+
+    _add_series("grayj@wofford.edu", sessions=4)
+    _add_series("grayj@wofford.edu", sessions=1, solo=True)
+    with count_queries() as small:
+        r = client.get("/api/v1/events/dashboard/events", headers=h)
+    assert r.status_code == 200
+
+    for _ in range(10):
+        _add_series("grayj@wofford.edu", sessions=15)
+    with count_queries() as large:
+        r = client.get("/api/v1/events/dashboard/events", headers=h)
+    assert r.status_code == 200
+
+    groups = [g for g in r.json()["upcoming"] + r.json()["past"] if g["type"] == "recurring_group"]
+    assert len(groups) == 11
+    assert sorted(len(g["group"]["children"]) for g in groups) == [3] + [14] * 10
+    assert len(large) == len(small) <= 2
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select, update
+from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.event_member import EventMember
+from app.models.user import User
+from app.repositories.attendance_repo import AttendanceRepository, CheckInStatus
+from app.services.event_deleter import INCLUDE_DELETED, event_deleter
+from tests.conftest import TestingSessionLocal
+
+
+def _create_series(client, headers, weeks: int = 2, lazy: bool = False) -> dict:
+    start = datetime(2031, 1, 6, 9, 0)  # a Monday
+    with TestingSessionLocal() as db:
+        member_ids = [u.id for u in db.query(User).filter(User.email != "grayj@wofford.edu")]
+    r = client.post("/api/v1/events/", json={
+        "name": "Seminar",
+        "location": "Library",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=1)).isoformat(),
+        "recurring": True,
+        "weekdays": ["Mon", "Wed", "Fri"],
+        "end_date": (start + timedelta(weeks=weeks, days=-1)).strftime("%Y-%m-%d"),
+        "timezone": "America/New_York",
+        "member_ids": member_ids,
+        "lazy_sessions": lazy,
+    }, headers=headers)
+    assert r.status_code == 200
+    return r.json()
+
+
+def _series_ids(parent_id: int) -> list[int]:
+    with TestingSessionLocal() as db:
+        return db.execute(
+            select(Event.id).where((Event.id == parent_id) | (Event.parent_id == parent_id)),
+            execution_options={INCLUDE_DELETED: True},
+        ).scalars().all()
+
+
+def _attend_all(event_ids: list[int]) -> int:
+    with TestingSessionLocal() as db:
+        user_ids = db.execute(select(User.id)).scalars().all()
+        now = datetime.now(timezone.utc)
+        db.execute(insert(Attendance), [
+            {"event_id": e, "attendee_id": u, "checked_in_at": now} for e in event_ids for u in user_ids
+        ])
+        db.commit()
+    return len(event_ids) * len(user_ids)
+
+
+def _remaining(model, event_ids) -> int:
+    with TestingSessionLocal() as db:
+        column = Event.id if model is Event else model.event_id
+        return db.execute(
+            select(func.count()).select_from(model).where(column.in_(event_ids)),
+            execution_options={INCLUDE_DELETED: True},
+        ).scalar()
+
+
+def test_series_delete_hides_at_once_and_purges_in_chunks(monkeypatch, client: TestClient, token_organizer: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    parent = _create_series(client, h)
+    ids = _series_ids(parent["id"])
+    attendances = _attend_all(ids)
+    # Hold the worker back to observe the soft-deleted state
+    monkeypatch.setattr(event_deleter, "_ensure_started", lambda: None)
+    monkeypatch.setattr(event_deleter, "chunk_size", 7)
+
+    r = client.delete(f"/api/v1/events/{parent['id']}", headers=h)
+    assert r.status_code == 202
+    body = r.json()
+    assert body["events"] == len(ids) == 6
+
+    # Hidden from every view before anything is purged
+    assert client.get(f"/api/v1/events/{ids[-1]}", headers=h).status_code == 404
+    assert client.get(f"/api/v1/events/{parent['id']}/family", headers=h).status_code == 404
+    assert client.get("/api/v1/events/dashboard/events", headers=h).json() == {"upcoming": [], "past": []}
+    assert client.delete(f"/api/v1/events/{parent['id']}", headers=h).status_code == 404
+    assert _remaining(Attendance, ids) == attendances
+    assert client.get(f"/api/v1/events/delete-jobs/{body['job_id']}", headers=h).json()["status"] == "queued"
+
+    job = event_deleter.get(body["job_id"])
+    event_deleter.run(job)
+    status = client.get(f"/api/v1/events/delete-jobs/{body['job_id']}", headers=h).json()
+    assert status["status"] == "done"
+    assert status["deleted"] == {"attendances": attendances, "members": 6, "events": 6}
+    assert event_deleter.stats()["chunks"] >= attendances // 7
+    assert _remaining(Attendance, ids) == _remaining(EventMember, ids) == _remaining(Event, ids) == 0
+
+
+def test_session_delete_runs_in_background(client: TestClient, token_organizer: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    parent = _create_series(client, h)
+    session_id = _series_ids(parent["id"])[2]
+    _attend_all([session_id])
+
+    r = client.delete(f"/api/v1/events/{session_id}", headers=h)
+    assert r.status_code == 202 and r.json()["events"] == 1
+    assert event_deleter.wait(r.json()["job_id"], timeout=10)
+    assert _remaining(Attendance, [session_id]) == _remaining(Event, [session_id]) == 0
+    assert len(_series_ids(parent["id"])) == 5
+    assert client.get("/api/v1/events/delete-jobs/unknown", headers=h).status_code == 404
+
+
+def test_lazy_session_delete_excludes_its_date(client: TestClient, token_organizer: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    parent = _create_series(client, h, lazy=True)
+    r = client.post(f"/api/v1/events/{parent['id']}/sessions", json={"start_time": "2031-01-08T14:00:00Z"}, headers=h)
+    assert r.status_code == 200
+
+    assert client.delete(f"/api/v1/events/{r.json()['id']}", headers=h).status_code == 202
+    with TestingSessionLocal() as db:
+        assert db.get(Event, parent["id"]).recurrence_exclusions == ["2031-01-08"]
+    family = client.get(f"/api/v1/events/{parent['id']}/family", headers=h).json()
+    starts = [c["start_time"] for c in family["past_children"] + family["upcoming_children"]]
+    assert not [s for s in starts if s.startswith("2031-01-08")]
+
+
+def test_resume_purges_events_left_soft_deleted(client: TestClient, token_organizer: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    parent = _create_series(client, h, weeks=1)
+    ids = _series_ids(parent["id"])
+    with TestingSessionLocal() as db:
+        assert sorted(event_deleter.mark_deleted(db, Event.id.in_(ids))) == sorted(ids)
+        db.commit()
+        assert db.get(Event, parent["id"]) is None
+
+    job = event_deleter.resume()
+    assert event_deleter.wait(job.id, timeout=10)
+    assert job.events == len(ids) and _remaining(Event, ids) == 0
+    assert event_deleter.resume() is None
+
+
+def test_check_in_rejected_once_event_is_soft_deleted():
+    now = datetime.now(timezone.utc)
+    repo = AttendanceRepository()
+    with TestingSessionLocal() as db:
+        first, second = db.execute(select(User.id).limit(2)).scalars().all()
+        event = Event(name="Soon gone", location="Hall", start_time=now, end_time=now + timedelta(hours=1),
+                      organizer_id=first, checkin_token="soon-gone")
+        db.add(event)
+        db.commit()
+        assert repo.check_in(db, "soon-gone", first, now).status is CheckInStatus.CHECKED_IN
+        db.commit()
+        # Marked deleted by another process, so this one's token index is stale
+        db.execute(update(Event).where(Event.id == event.id).values(deleted_at=now))
+        db.commit()
+
+        assert repo.check_in(db, "soon-gone", second, now).status is CheckInStatus.NOT_FOUND
+        assert repo.check_in(db, "soon-gone", first, now).status is CheckInStatus.NOT_FOUND
+        assert _remaining(Attendance, [event.id]) == 1
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from fastapi.testclient import TestClient
+from app.models.event import Event
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+NY = ZoneInfo("America/New_York")
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def _create(client, headers, lazy: bool, end_date=True, name="Daily") -> tuple[dict, datetime]:
+    """A daily series that started 14 days ago, with today's session 30 minutes out"""
+    soon = (datetime.now(NY) + timedelta(minutes=30)).replace(second=0, microsecond=0, tzinfo=None)
+    first = soon - timedelta(days=14)
+    with TestingSessionLocal() as db:
+        student = db.query(User).filter(User.email == "martincs@wofford.edu").one()
+    payload = {
+        "name": name,
+        "location": "Library",
+        "start_time": first.isoformat(),
+        "end_time": (first + timedelta(hours=1)).isoformat(),
+        "recurring": True,
+        "weekdays": DAYS,
+        "end_date": (soon + timedelta(days=6)).strftime("%Y-%m-%d") if end_date else None,
+        "timezone": "America/New_York",
+        "member_ids": [student.id],
+        "lazy_sessions": lazy,
+    }
+    r = client.post("/api/v1/events/", json=payload, headers=headers)
+    assert r.status_code == 200
+    return r.json(), soon
+
+
+def _family(client, headers, parent_id):
+    r = client.get(f"/api/v1/events/{parent_id}/family", headers=headers)
+    assert r.status_code == 200
+    return r.json()
+
+
+def test_lazy_series_renders_like_an_eager_one(client: TestClient, token_organizer: str, token_student: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    lazy, soon = _create(client, h, lazy=True)
+    eager, _ = _create(client, h, lazy=False, name="Daily eager")
+    assert lazy["lazy_sessions"] is True
+
+    with TestingSessionLocal() as db:
+        assert db.query(Event).filter(Event.parent_id == lazy["id"]).count() == 0
+
+    lazy_family, eager_family = _family(client, h, lazy["id"]), _family(client, h, eager["id"])
+    for key in ("past_children", "upcoming_children"):
+        assert [c["start_time"] for c in lazy_family[key]] == [c["start_time"] for c in eager_family[key]]
+    assert lazy_family["total_past_sessions"] == eager_family["total_past_sessions"] == 14
+    assert lazy_family["members"][0]["missed"] == 14
+
+    # Only today's session, whose check-in window opens within the lead time, was written
+    due, *later = lazy_family["upcoming_children"]
+    assert due["id"] is not None and due["checkin_token"]
+    assert all(c["id"] is None and c["checkin_token"] is None for c in later + lazy_family["past_children"])
+    with TestingSessionLocal() as db:
+        rows = db.query(Event).filter(Event.parent_id == lazy["id"]).all()
+        assert [r.id for r in rows] == [due["id"]]
+
+    # Rendering again reuses the written session
+    assert _family(client, h, lazy["id"])["upcoming_children"][0]["id"] == due["id"]
+
+    # Attendee views see the same sessions
+    r = client.get(f"/api/v1/events/attendee/event/{lazy['id']}", headers={"Authorization": f"Bearer {token_student}"})
+    assert r.status_code == 200
+    assert len(r.json()["upcoming_sessions"]) == len(lazy_family["upcoming_children"])
+    assert r.json()["missed"] == 14
+
+    r = client.get("/api/v1/events/dashboard/events", headers=h)
+    group = next(g["group"] for g in r.json()["upcoming"] if g["type"] == "recurring_group" and g["group"]["parent"]["id"] == lazy["id"])
+    assert len(group["children"]) == 20
+
+
+def test_materialize_session_on_demand(client: TestClient, token_organizer: str, token_student: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    lazy, soon = _create(client, h, lazy=True, end_date=False)
+    later = _family(client, h, lazy["id"])["upcoming_children"][3]
+    assert later["id"] is None
+
+    r = client.post(f"/api/v1/events/{lazy['id']}/sessions", json={"start_time": later["start_time"]}, headers=h)
+    assert r.status_code == 200
+    session = r.json()
+    assert session["id"] and session["checkin_token"] and session["start_time"] == later["start_time"]
+    again = client.post(f"/api/v1/events/{lazy['id']}/sessions", json={"start_time": later["start_time"]}, headers=h)
+    assert again.json()["id"] == session["id"]
+
+    r = client.get(f"/api/v1/events/by-token/{session['checkin_token']}", headers=h)
+    assert r.status_code == 200 and r.json()["parent_id"] == lazy["id"]
+
+    off_rule = (datetime.fromisoformat(later["start_time"].rstrip("Z")) + timedelta(minutes=5)).isoformat() + "Z"
+    r = client.post(f"/api/v1/events/{lazy['id']}/sessions", json={"start_time": off_rule}, headers=h)
+    assert r.status_code == 400
+    r = client.post(f"/api/v1/events/{lazy['id']}/sessions", json={"start_time": later["start_time"]},
+                    headers={"Authorization": f"Bearer {token_student}"})
+    assert r.status_code == 403
@@ -0,0 +1,10 @@
+from fastapi.testclient import TestClient
+
+
+def test_metrics_admin_only(client: TestClient, token_admin: str, token_student: str):
+    r = client.get("/api/v1/metrics/", headers={"Authorization": f"Bearer {token_admin}"})
+    assert r.status_code == 200
+    assert {"hits", "misses", "fetches"} <= set(r.json()["jwks_cache"])
+
+    r = client.get("/api/v1/metrics/", headers={"Authorization": f"Bearer {token_student}"})
+    assert r.status_code == 403
@@ -41,3 +41,29 @@ def test_checkin_invalid_token(client, token_student):
     assert r.status_code == 404
     assert "Event not found" in r.text
 
+
+
+def test_my_checkins_since_cursor(client: TestClient, token_organizer: str, token_student: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime.now(timezone.utc).astimezone(timezone(timedelta(hours=-5))) + timedelta(minutes=5)
+    tokens = []
+    for name in ("First", "Second"):
+        ev = client.post("/api/v1/events/", json={
+            "name": name,
+            "location": "Hall",
+            "start_time": start.strftime("%Y-%m-%dT%H:%M"),
+            "end_time": (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+            "timezone": "America/New_York"
+        }, headers=h).json()
+        tokens.append(ev["checkin_token"])
+
+    hs = {"Authorization": f"Bearer {token_student}"}
+    client.post("/api/v1/events/checkin", json={"event_token": tokens[0]}, headers=hs)
+    first = client.get("/api/v1/events/my-checkins", headers=hs)
+    assert [c["event_name"] for c in first.json()] == ["First"]
+    cursor = first.headers["x-next-cursor"]
+
+    client.post("/api/v1/events/checkin", json={"event_token": tokens[1]}, headers=hs)
+    delta = client.get("/api/v1/events/my-checkins", params={"since": cursor}, headers=hs)
+    assert [c["event_name"] for c in delta.json()] == ["Second"]
+    assert client.get("/api/v1/events/my-checkins", params={"since": delta.headers["x-next-cursor"]}, headers=hs).json() == []
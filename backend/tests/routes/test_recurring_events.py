@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 
 
 def test_create_recurring_event_generates_children(client: TestClient, token_organizer: str):
@@ -72,4 +73,85 @@ def test_create_recurring_event_missing_fields(client, token_organizer):
         "timezone": "America/New_York"
     }
     r = client.post("/api/v1/events/", json=payload, headers=headers)
-    assert r.status_code == 200
\ No newline at end of file
+    assert r.status_code == 200
+
+def test_create_series_bulk_inserts_sessions_and_members(client: TestClient, token_organizer: str, count_queries):
+    from app.models.event import Event
+    from app.models.event_member import EventMember
+    from app.models.user import User
+    from tests.conftest import TestingSessionLocal
+
+    headers = {"Authorization": f"Bearer {token_organizer}"}
+    with TestingSessionLocal() as db:
+        member_ids = [u.id for u in db.query(User).filter(User.email != "grayj@wofford.edu").limit(3)]
+
+    def create(weeks: int) -> dict:
+        start = datetime(2031, 1, 6, 9, 0)  # a Monday
+        payload = {
+            "name": f"Series {weeks}w",
+            "location": "Library",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=1)).isoformat(),
+            "recurring": True,
+            "weekdays": ["Mon", "Wed", "Fri"],
+            "end_date": (start + timedelta(weeks=weeks, days=-1)).strftime("%Y-%m-%d"),
+            "timezone": "America/New_York",
+            "member_ids": member_ids + member_ids[:1],  # duplicates are ignored
+        }
+        r = client.post("/api/v1/events/", json=payload, headers=headers)
+        assert r.status_code == 200
+        return r.json()
+
+    create(1)  # warm the principal cache
+    with count_queries() as short:
+        create(2)
+    with count_queries() as long:
+        parent = create(12)
+    assert len(long) == len(short)
+
+    with TestingSessionLocal() as db:
+        children = db.query(Event).filter(Event.parent_id == parent["id"]).order_by(Event.start_time).all()
+        assert len(children) == 12 * 3 - 1
+        assert len({c.checkin_token for c in children}) == len(children)
+        # DST starts on 2031-03-09: sessions stay at 9:00 New York time
+        assert {c.start_time.replace(tzinfo=timezone.utc).astimezone(ZoneInfo("America/New_York")).hour for c in children} == {9}
+        members = db.query(EventMember).filter(EventMember.event_id.in_([parent["id"]] + [c.id for c in children])).all()
+        assert sorted(m.user_id for m in members) == sorted(member_ids)
+        assert all(m.event_id == parent["id"] for m in members)
+        assert db.get(Event, parent["id"]).member_count == 3
+
+
+def test_create_series_with_interval_and_exclusions(client: TestClient, token_organizer: str):
+    from app.models.event import Event
+    from tests.conftest import TestingSessionLocal
+
+    headers = {"Authorization": f"Bearer {token_organizer}"}
+    start = datetime(2031, 9, 2, 10, 0)  # a Tuesday
+    payload = {
+        "name": "Biweekly Lab",
+        "location": "Science Center",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=2)).isoformat(),
+        "recurring": True,
+        "weekdays": ["Tue"],
+        "end_date": "2031-11-30",
+        "timezone": "America/New_York",
+        "interval_weeks": 2,
+        "exclude_dates": ["2031-10-14", "2031-11-20/2031-11-30"],
+    }
+    r = client.post("/api/v1/events/", json=payload, headers=headers)
+    assert r.status_code == 200
+
+    with TestingSessionLocal() as db:
+        children = db.query(Event).filter(Event.parent_id == r.json()["id"]).order_by(Event.start_time).all()
+        ny = ZoneInfo("America/New_York")
+        assert [str(c.start_time.replace(tzinfo=timezone.utc).astimezone(ny).date()) for c in children] == [
+            "2031-09-16", "2031-09-30", "2031-10-28", "2031-11-11",
+        ]
+        # DST ends on 2031-11-02: still 10:00 local
+        assert {c.start_time.replace(tzinfo=timezone.utc).astimezone(ny).hour for c in children} == {10}
+
+    bad = client.post("/api/v1/events/", json={**payload, "exclude_dates": ["2031-10-14/2031-10-01"]}, headers=headers)
+    assert bad.status_code == 400
+    bad = client.post("/api/v1/events/", json={**payload, "weekdays": ["Someday"]}, headers=headers)
+    assert bad.status_code == 400
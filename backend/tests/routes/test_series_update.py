@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from fastapi.testclient import TestClient
+from app.models.event import Event
+from app.services.token_index import token_index
+from tests.conftest import TestingSessionLocal
+
+NY = ZoneInfo("America/New_York")
+
+
+def _create(client, headers, weeks: int = 2, name: str = "Lab", lazy: bool = False) -> int:
+    start = datetime(2031, 3, 3, 9, 0)  # a Monday; DST starts 2031-03-09
+    payload = {
+        "name": name,
+        "location": "Library",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=1)).isoformat(),
+        "recurring": True,
+        "weekdays": ["Mon", "Wed", "Fri"],
+        "end_date": (start + timedelta(weeks=weeks, days=-1)).strftime("%Y-%m-%d"),
+        "timezone": "America/New_York",
+        "lazy_sessions": lazy,
+    }
+    r = client.post("/api/v1/events/", json=payload, headers=headers)
+    assert r.status_code == 200
+    return r.json()["id"]
+
+
+def _sessions(parent_id: int) -> list[Event]:
+    with TestingSessionLocal() as db:
+        return db.query(Event).filter(
+            (Event.id == parent_id) | (Event.parent_id == parent_id)
+        ).order_by(Event.start_time).all()
+
+
+def _local(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc).astimezone(NY)
+
+
+def test_all_scope_retimes_in_place_with_constant_queries(client: TestClient, token_organizer: str, count_queries):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    short, long = _create(client, h, weeks=2), _create(client, h, weeks=8)
+    before = _sessions(long)
+
+    body = {"scope": "all", "start_time": "10:15", "end_time": "11:45", "location": "Science Center"}
+    client.patch(f"/api/v1/events/{short}/series", json=body, headers=h)  # warm the principal cache
+    with count_queries() as few:
+        client.patch(f"/api/v1/events/{short}/series", json=body, headers=h)
+    with count_queries() as many:
+        r = client.patch(f"/api/v1/events/{long}/series", json=body, headers=h)
+    assert r.status_code == 200
+    assert r.json() == {"scope": "all", "updated": 8 * 3}
+    assert len(many) == len(few)
+
+    after = _sessions(long)
+    # Same rows and tokens, at 10:15-11:45 New York time on both sides of DST
+    assert [(e.id, e.checkin_token) for e in after] == [(e.id, e.checkin_token) for e in before]
+    assert [_local(e.start_time).date() for e in after] == [_local(e.start_time).date() for e in before]
+    assert {(_local(e.start_time).time().isoformat(), _local(e.end_time).time().isoformat()) for e in after} == {("10:15:00", "11:45:00")}
+    assert {e.location for e in after} == {"Science Center"}
+
+
+def test_following_and_this_scopes(client: TestClient, token_organizer: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    parent_id = _create(client, h)
+    sessions = _sessions(parent_id)
+    anchor = sessions[3]
+
+    r = client.patch(f"/api/v1/events/{parent_id}/series", json={
+        "scope": "following", "session_id": anchor.id, "checkin_open_minutes": 30,
+    }, headers=h)
+    assert r.json()["updated"] == len(sessions) - 3
+    r = client.patch(f"/api/v1/events/{parent_id}/series", json={
+        "scope": "this", "session_id": sessions[1].id, "name": "Lab (moved)", "start_time": "08:00",
+    }, headers=h)
+    assert r.json()["updated"] == 1
+
+    after = _sessions(parent_id)
+    assert [e.checkin_open_minutes for e in after] == [15, 15, 15] + [30] * (len(sessions) - 3)
+    assert [e.name for e in after] == ["Lab", "Lab (moved)"] + ["Lab"] * (len(sessions) - 2)
+    assert _local(after[1].start_time).hour == 8 and _local(after[1].end_time).hour == 10
+
+
+def test_update_invalidates_cached_check_in_windows(client: TestClient, token_organizer: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    parent_id = _create(client, h)
+    session = _sessions(parent_id)[2]
+    with TestingSessionLocal() as db:
+        assert token_index.lookup(db, session.checkin_token).name == "Lab"
+
+    client.patch(f"/api/v1/events/{parent_id}/series", json={"name": "Renamed"}, headers=h)
+    assert token_index.get(session.checkin_token) is None
+    with TestingSessionLocal() as db:
+        assert token_index.lookup(db, session.checkin_token).name == "Renamed"
+
+
+def test_update_series_rejections(client: TestClient, token_organizer: str, token_student: str):
+    h = {"Authorization": f"Bearer {token_organizer}"}
+    parent_id, other_id = _create(client, h), _create(client, h, name="Other")
+    lazy_id = _create(client, h, lazy=True)
+    url = f"/api/v1/events/{parent_id}/series"
+
+    assert client.patch(url, json={"name": "X"}, headers={"Authorization": f"Bearer {token_student}"}).status_code == 403
+    assert client.patch("/api/v1/events/999999/series", json={"name": "X"}, headers=h).status_code == 404
+    assert client.patch(url, json={"scope": "this", "session_id": other_id, "name": "X"}, headers=h).status_code == 404
+    assert client.patch(url, json={"scope": "this", "name": "X"}, headers=h).status_code == 400
+    assert client.patch(url, json={}, headers=h).status_code == 400
+    assert client.patch(url, json={"start_time": "12:00"}, headers=h).status_code == 400  # ends at 10:00
+    assert client.patch(f"/api/v1/events/{lazy_id}/series", json={"scope": "following", "name": "X"}, headers=h).status_code == 400
+    assert client.patch(f"/api/v1/events/{lazy_id}/series", json={"start_time": "09:30"}, headers=h).status_code == 200
+    assert {e.name for e in _sessions(parent_id)} == {"Lab"}
@@ -1,7 +1,10 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch
-from app.models.user import UserRole
+from app.models.user import User, UserRole
+from tests.conftest import TestingSessionLocal
 
 @pytest.mark.usefixtures("setup_test_db")
 class TestUsersRoutes:
@@ -31,7 +34,7 @@ class TestUsersRoutes:
         r = client.get("/api/v1/users/", headers=h)
         assert r.status_code == 403
 
-    @patch("app.api.v1.users.AuditLogRepository.log_audit")
+    @patch("app.api.v1.users.AuditLogRepository.add_audit")
     def test_create_user(self, mock_audit, client: TestClient, token_admin: str):
         """Admin can create a new user"""
         h = {"Authorization": f"Bearer {token_admin}"}
@@ -47,7 +50,7 @@ class TestUsersRoutes:
         assert data["email"] == "newuser@example.com"
         assert mock_audit.called
 
-    @patch("app.api.v1.users.AuditLogRepository.log_audit")
+    @patch("app.api.v1.users.AuditLogRepository.add_audit")
     def test_promote_and_revoke_organizer(self, mock_audit, client: TestClient, token_admin: str):
         """Admin can promote and revoke organizer role"""
         h = {"Authorization": f"Bearer {token_admin}"}
@@ -66,7 +69,7 @@ class TestUsersRoutes:
         assert r_revoke.status_code == 200
         assert mock_audit.call_count >= 2
 
-    @patch("app.api.v1.users.AuditLogRepository.log_audit")
+    @patch("app.api.v1.users.AuditLogRepository.add_audit")
     def test_delete_user(self, mock_audit, client: TestClient, token_admin: str):
         """Admin can delete a user"""
         h = {"Authorization": f"Bearer {token_admin}"}
@@ -90,4 +93,55 @@ class TestUsersRoutes:
         h = {"Authorization": f"Bearer {token_admin}"}
         payload = {"name": "Admin User", "email": "admin@wofford.edu", "password": "admin", "roles": [UserRole.ADMIN]}
         r = client.post("/api/v1/users/", json=payload, headers=h)
-        assert r.status_code == 400
\ No newline at end of file
+        assert r.status_code == 400
+
+def test_role_change_visible_on_next_request(client: TestClient, token_admin: str, token_student: str):
+    """Cached principals are invalidated when an admin changes a user's roles"""
+    hs = {"Authorization": f"Bearer {token_student}"}
+    me = client.get("/api/v1/users/me", headers=hs).json()
+    assert "organizer" not in me["roles"]
+    assert client.get("/api/v1/events/dashboard/events", headers=hs).status_code == 403
+
+    ha = {"Authorization": f"Bearer {token_admin}"}
+    assert client.post(f"/api/v1/users/{me['id']}/promote", headers=ha).status_code == 200
+    assert "organizer" in client.get("/api/v1/users/me", headers=hs).json()["roles"]
+    assert client.get("/api/v1/events/dashboard/events", headers=hs).status_code == 200
+
+    assert client.post(f"/api/v1/users/{me['id']}/revoke-organizer", headers=ha).status_code == 200
+    assert client.get("/api/v1/events/dashboard/events", headers=hs).status_code == 403
+
+
+def test_concurrent_first_requests_provision_one_user(client: TestClient):
+    """Parallel first requests for a new Auth0 subject all succeed and share one user"""
+    claims = {
+        "email": "newstudent@wofford.edu",
+        "actual_email": "newstudent@wofford.edu",
+        "actual_name": "New Student",
+        "auth0_sub": "auth0|newstudent",
+    }
+    n = 50
+    barrier = threading.Barrier(n, timeout=10)
+
+    def verify(token):
+        # Hold every request until all have verified, so they all miss the lookup together
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+        return claims
+
+    h = {"Authorization": "Bearer first-login"}
+    with patch("app.api.deps.verify_token", side_effect=verify):
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            responses = list(pool.map(lambda _: client.get("/api/v1/users/me", headers=h), range(n)))
+
+    assert [r.status_code for r in responses] == [200] * n
+    assert len({r.json()["id"] for r in responses}) == 1
+
+    db = TestingSessionLocal()
+    try:
+        users = db.query(User).filter(User.auth0_sub == "auth0|newstudent").all()
+        assert len(users) == 1
+        assert users[0].roles() == {UserRole.ATTENDEE}
+    finally:
+        db.close()
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from app.services.attendance_stream import AttendanceBroker, attendance_broker, make_delta
+
+AT = datetime(2025, 3, 1, 15, 0, tzinfo=timezone.utc)
+
+
+def test_deltas_publish_only_after_commit(db):
+    async def scenario():
+        sub = attendance_broker.subscribe(42)
+        attendance_broker.stage(db, attendance_id=1, event_id=42, attendee_id=7, attendee_name="Rolled", checked_in_at=AT)
+        db.rollback()
+        attendance_broker.stage(db, attendance_id=2, event_id=42, attendee_id=8, attendee_name="Kept", checked_in_at=AT)
+        await asyncio.sleep(0)
+        assert sub.queue.empty()
+
+        db.commit()
+        delta = await asyncio.wait_for(sub.queue.get(), 1)
+        assert delta == {
+            "id": 2, "event_id": 42, "attendee_id": 8, "attendee_name": "Kept",
+            "checked_in_at": "2025-03-01T15:00:00Z",
+        }
+        assert sub.queue.empty()
+        attendance_broker.unsubscribe(sub)
+
+    asyncio.run(scenario())
+    assert attendance_broker.stats()["published"] == 1
+
+
+def test_stream_replays_backlog_then_live_deltas():
+    broker = AttendanceBroker(queue_size=10, heartbeat_seconds=0.05, notify=False)
+    disconnected = False
+
+    async def is_disconnected():
+        return disconnected
+
+    async def scenario():
+        nonlocal disconnected
+        sub = broker.subscribe(1)
+        backlog = [make_delta(5, 1, 10, "A", AT), make_delta(6, 1, 11, "B", AT)]
+        stream = broker.stream(sub, 4, 4, {1, 2, 3, 4, 5, 6}, backlog, is_disconnected)
+
+        first = await stream.__anext__()
+        assert first.startswith("retry: 3000") and '"count": 4' in first
+        assert "id: 5\nevent: checkin" in await stream.__anext__()
+        assert '"count": 6' in await stream.__anext__()
+
+        # 6 was already replayed from the database; other events are not ours
+        broker.publish([make_delta(6, 1, 11, "B", AT), make_delta(9, 2, 12, "X", AT), make_delta(7, 1, 12, "C", AT)])
+        live = await stream.__anext__()
+        assert live.startswith("id: 7\n") and '"count": 7' in live
+
+        assert await stream.__anext__() == ": keepalive\n\n"
+        disconnected = True
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+
+    asyncio.run(scenario())
+    assert broker.stats()["streams"] == 0
+
+
+def test_stream_counts_deltas_committed_out_of_order():
+    broker = AttendanceBroker(queue_size=10, heartbeat_seconds=5, notify=False)
+
+    async def scenario():
+        # 98 and 101 were committed at snapshot time; 99 and 100 were not yet
+        sub = broker.subscribe(1)
+        stream = broker.stream(sub, 2, 101, {98, 101}, [], lambda: False)
+        await stream.__anext__()
+        broker.publish([make_delta(101, 1, 11, "B", AT), make_delta(100, 1, 10, "A", AT)])
+        broker.publish([make_delta(100, 1, 10, "A", AT), make_delta(99, 1, 9, "Z", AT), make_delta(102, 1, 12, "C", AT)])
+        live = [await stream.__anext__() for _ in range(3)]
+        assert '"id": 100' in live[0] and '"count": 3' in live[0]
+        assert '"id": 99' in live[1] and '"count": 4' in live[1]
+        assert '"id": 102' in live[2] and '"count": 5' in live[2]
+        # The resume id only moves forward
+        assert [d.split("\n")[0] for d in live] == ["id: 101", "id: 101", "id: 102"]
+        await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_stream_ends_when_subscriber_falls_behind():
+    broker = AttendanceBroker(queue_size=2, heartbeat_seconds=5, notify=False)
+
+    async def scenario():
+        sub = broker.subscribe(1)
+        stream = broker.stream(sub, 0, 0, set(), [], lambda: False)
+        await stream.__anext__()
+        broker.publish([make_delta(i, 1, i, None, AT) for i in range(1, 4)])
+        await asyncio.sleep(0)
+        # The client reconnects with Last-Event-ID and resumes from the database
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+
+    asyncio.run(scenario())
+    assert broker.stats()["overflows"] == 1
@@ -0,0 +1,105 @@
+import pytest
+from app.models.audit_log import AuditLog
+from app.repositories.audit_log_repo import AuditLogRepository
+from app.services import audit_sink as audit_sink_module
+from app.services.audit_sink import AuditSink
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def make_sink(monkeypatch):
+    """Install a fresh sink as the process-wide one so commit hooks reach it"""
+    def _make(mode, max_queue=100, batch_size=10):
+        sink = AuditSink(TestingSessionLocal, mode, max_queue, batch_size, flush_interval=0.05)
+        monkeypatch.setattr(audit_sink_module, "audit_sink", sink)
+        monkeypatch.setattr("app.repositories.audit_log_repo.audit_sink", sink)
+        return sink
+    return _make
+
+
+def _audit_count(db, action):
+    db.expire_all()
+    return db.query(AuditLog).filter(AuditLog.action == action).count()
+
+
+def test_transaction_mode_commits_with_caller(db, make_sink):
+    sink = make_sink("transaction")
+    log = AuditLogRepository.add_audit(db, action="TX", user_email="a@example.com")
+    assert isinstance(log, AuditLog)
+    db.commit()
+    assert _audit_count(db, "TX") == 1
+    assert sink.stats()["queue_depth"] == 0
+
+
+def test_async_mode_queues_on_commit_and_flushes_in_batches(db, make_sink):
+    sink = make_sink("async", batch_size=10)
+    for i in range(25):
+        assert AuditLogRepository.add_audit(db, action="ASYNC", user_email=f"u{i}@example.com") is None
+    assert sink.stats()["queue_depth"] == 0  # nothing released before commit
+    db.commit()
+    assert sink.stats()["queue_depth"] == 25
+    assert _audit_count(db, "ASYNC") == 0
+
+    assert sink.flush() == 25
+    stats = sink.stats()
+    assert stats["batches"] == 3
+    assert stats["written"] == 25
+    assert stats["queue_depth"] == 0
+    assert stats["last_batch_lag_seconds"] is not None
+    assert _audit_count(db, "ASYNC") == 25
+    assert db.query(AuditLog).filter(AuditLog.action == "ASYNC").first().timestamp is not None
+
+
+def test_rolled_back_audits_are_discarded(db, make_sink):
+    sink = make_sink("async")
+    AuditLogRepository.add_audit(db, action="RB", user_email="a@example.com")
+    db.rollback()
+    db.commit()
+    assert sink.stats()["enqueued"] == 0
+
+
+def test_drop_mode_counts_overflow(db, make_sink):
+    sink = make_sink("drop", max_queue=3)
+    for _ in range(5):
+        AuditLogRepository.add_audit(db, action="DROP", user_email="a@example.com")
+    db.commit()
+    stats = sink.stats()
+    assert stats["queue_depth"] == 3
+    assert stats["dropped"] == 2
+    assert _audit_count(db, "DROP") == 0
+
+
+def test_async_mode_overflow_writes_inline(db, make_sink):
+    sink = make_sink("async", max_queue=3)
+    for _ in range(5):
+        AuditLogRepository.add_audit(db, action="FULL", user_email="a@example.com")
+    db.commit()
+    assert sink.stats()["inline_writes"] == 2
+    assert _audit_count(db, "FULL") == 2
+    sink.flush()
+    assert _audit_count(db, "FULL") == 5
+
+
+def test_stop_flushes_queue(db, make_sink):
+    sink = make_sink("async", batch_size=1000)
+    sink.start()
+    AuditLogRepository.add_audit(db, action="STOP", user_email="a@example.com")
+    db.commit()
+    sink.stop()
+    assert sink.stats()["queue_depth"] == 0
+    assert _audit_count(db, "STOP") == 1
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        AuditSink(TestingSessionLocal, "sometimes", 10, 10, 1)
+
+
+def test_savepoint_rollback_keeps_outer_audits(db, make_sink):
+    sink = make_sink("async")
+    AuditLogRepository.add_audit(db, action="OUTER", user_email="a@example.com")
+    with pytest.raises(RuntimeError):
+        with db.begin_nested():
+            raise RuntimeError("inner failure")
+    db.commit()
+    assert sink.stats()["enqueued"] == 1
@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from sqlalchemy import update
+import pytest
+from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.user import User
+from app.repositories.attendance_repo import CheckInStatus
+from app.services.checkin_batcher import CheckInBatcher
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def batcher():
+    b = CheckInBatcher(TestingSessionLocal, max_batch=50, max_wait_ms=50)
+    yield b
+    b.stop()
+
+
+@pytest.fixture
+def open_event(db):
+    organizer = db.query(User).first()
+    now = datetime.now(timezone.utc)
+    event = Event(
+        name="Burst",
+        location="Arena",
+        start_time=now,
+        end_time=now + timedelta(hours=1),
+        checkin_open_minutes=15,
+        organizer_id=organizer.id,
+        checkin_token="burst-token",
+    )
+    db.add(event)
+    db.commit()
+    db.refresh(event)
+    return event
+
+
+def _users(db, n):
+    users = [User(email=f"burst{i}@example.com", name=f"B{i}", password_hash="") for i in range(n)]
+    db.add_all(users)
+    db.commit()
+    return [(u.id, u.email) for u in users]
+
+
+def test_concurrent_check_ins_commit_in_groups(db, batcher, open_event):
+    users = _users(db, 30)
+    now = datetime.now(timezone.utc)
+
+    def scan(user):
+        session = TestingSessionLocal()
+        try:
+            return batcher.check_in(session, "burst-token", user[0], user[1], now)
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=30) as pool:
+        results = list(pool.map(scan, users))
+
+    assert all(r.status is CheckInStatus.CHECKED_IN for r in results)
+    assert len({r.attendance_id for r in results}) == 30
+    stats = batcher.stats()
+    assert stats["items"] == 30
+    assert stats["batches"] < 30
+    db.expire_all()
+    assert db.query(Attendance).filter(Attendance.event_id == open_event.id).count() == 30
+
+
+def test_repeat_scan_in_same_group_is_duplicate(db, batcher, open_event):
+    (user_id, email), = _users(db, 1)
+    now = datetime.now(timezone.utc)
+
+    def scan(_):
+        session = TestingSessionLocal()
+        try:
+            return batcher.check_in(session, "burst-token", user_id, email, now)
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        statuses = sorted(r.status.value for r in pool.map(scan, range(3)))
+    assert statuses == ["checked_in", "duplicate", "duplicate"]
+
+
+def test_rejections_are_not_queued(db, batcher, open_event):
+    later = datetime.now(timezone.utc) + timedelta(days=1)
+    assert batcher.check_in(db, "nope", 1, "a@example.com", later).status is CheckInStatus.NOT_FOUND
+    assert batcher.check_in(db, "burst-token", 1, "a@example.com", later).status is CheckInStatus.NOT_OPEN
+    assert batcher.stats()["items"] == 0
+
+
+def test_failed_group_falls_back_to_single_inserts(db, batcher, open_event, monkeypatch):
+    (user_id, email), = _users(db, 1)
+    # Break the group insert only; the per-request path is unaffected
+    monkeypatch.setattr("app.services.checkin_batcher.dialect_insert", MagicMock(side_effect=RuntimeError("boom")))
+
+    result = batcher.check_in(db, "burst-token", user_id, email, datetime.now(timezone.utc))
+    assert result.status is CheckInStatus.CHECKED_IN
+    assert batcher.stats()["fallbacks"] == 1
+
+
+def test_group_skips_events_deleted_after_indexing(db, batcher, open_event):
+    (first, first_email), (second, second_email) = _users(db, 2)
+    now = datetime.now(timezone.utc)
+    assert batcher.check_in(db, "burst-token", first, first_email, now).status is CheckInStatus.CHECKED_IN
+    # Soft-deleted by another process: this one's token index still has the window
+    db.execute(update(Event).where(Event.id == open_event.id).values(deleted_at=now))
+    db.commit()
+
+    assert batcher.check_in(db, "burst-token", second, second_email, now).status is CheckInStatus.NOT_FOUND
+    assert db.query(Attendance).filter(Attendance.attendee_id == second).count() == 0
@@ -0,0 +1,54 @@
+from app.core.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_set_and_hit_rate():
+    cache = TTLCache(maxsize=10)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # a is now most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_and_explicit_expiry():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl_seconds=30, clock=clock)
+    cache.set("ttl", "x")
+    cache.set("exp", "y", expires_at=clock.now + 5)
+    clock.now += 10
+    assert cache.get("ttl") == "x"
+    assert cache.get("exp") is None
+    clock.now += 30
+    assert cache.get("ttl") is None
+    assert len(cache) == 0
+
+
+def test_pop_and_discard_where():
+    cache = TTLCache(maxsize=10)
+    for i in range(5):
+        cache.set(i, i * 10)
+    assert cache.pop(0) == 0
+    assert cache.pop(0, "gone") == "gone"
+    assert cache.discard_where(lambda k, v: v >= 30) == 2
+    assert len(cache) == 2
@@ -4,6 +4,9 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models.user import User, UserRole
+from app.core.security import create_access_token
+from app.core.principal import Principal
+from app.services.profile_writer import profile_writer
 
 
 class DummyUser(User):
@@ -41,14 +44,11 @@ def test_get_db_yields_and_closes():
 # --------------------------
 # Test get_current_user
 # --------------------------
-@patch("app.api.deps.verify_hs256_token")
-@patch("app.api.deps.verify_auth0_token")
+@patch("app.api.deps.verify_token")
 @patch("app.api.deps.UserRepository")
-def test_get_current_user_valid(mock_user_repo_class, mock_verify_auth0, mock_verify_hs256, mock_db):
+def test_get_current_user_valid(mock_user_repo_class, mock_verify_token, mock_db):
     token = "fake-token"
-    # Simulate Auth0 validation failing so code falls back to HS256
-    mock_verify_auth0.side_effect = ValueError("Auth0 not available")
-    mock_verify_hs256.return_value = {"email": "test@example.com"}
+    mock_verify_token.return_value = {"email": "test@example.com"}
 
     # Create a user instance with required attributes
     user_instance = DummyUser()
@@ -61,32 +61,26 @@ def test_get_current_user_valid(mock_user_repo_class, mock_verify_auth0, mock_ve
 
     user = deps.get_current_user(db=mock_db, token=token)
     assert user == user_instance
-    mock_verify_hs256.assert_called_once()
+    mock_verify_token.assert_called_once_with(token)
     mock_repo_instance.get_by_email.assert_called_once_with(mock_db, "test@example.com")
 
 
-@patch("app.api.deps.verify_hs256_token")
-@patch("app.api.deps.verify_auth0_token")
-def test_get_current_user_invalid_token(mock_verify_auth0, mock_verify_hs256, mock_db):
+@patch("app.api.deps.verify_token")
+def test_get_current_user_invalid_token(mock_verify_token, mock_db):
     token = "invalid-token"
-    # Auth0 validation fails, HS256 validation also fails
-    mock_verify_auth0.side_effect = ValueError("Auth0 not available")
-    mock_verify_hs256.side_effect = ValueError("Invalid HS256 token")
+    mock_verify_token.side_effect = ValueError("Invalid HS256 token")
     with pytest.raises(HTTPException) as exc:
         deps.get_current_user(db=mock_db, token=token)
     assert exc.value.status_code == 401
     assert "Invalid token" in exc.value.detail
 
 
-@patch("app.api.deps.verify_hs256_token")
-@patch("app.api.deps.verify_auth0_token")
+@patch("app.api.deps.verify_token")
 @patch("app.api.deps.UserRepository")
-def test_get_current_user_user_not_found(mock_user_repo_class, mock_verify_auth0, mock_verify_hs256, mock_db):
+def test_get_current_user_user_not_found(mock_user_repo_class, mock_verify_token, mock_db):
     """Test that a new user is auto-provisioned when not found (Auth0 behavior)"""
     token = "fake-token"
-    # Force fallback to HS256
-    mock_verify_auth0.side_effect = ValueError("Auth0 not available")
-    mock_verify_hs256.return_value = {"email": "notfound@example.com"}
+    mock_verify_token.return_value = {"email": "notfound@example.com"}
 
     # Create a new user that will be "created"
     new_user = DummyUser()
@@ -95,19 +89,19 @@ def test_get_current_user_user_not_found(mock_user_repo_class, mock_verify_auth0
 
     # Mock the UserRepository instance
     mock_repo_instance = MagicMock()
-    mock_repo_instance.get_by_email.return_value = None  # User not found
-    mock_repo_instance.create.return_value = new_user  # User gets created
+    # Not found, then read back after the provisioning upsert
+    mock_repo_instance.get_by_email.side_effect = [None, new_user]
+    mock_repo_instance.provision.return_value = 1
     mock_user_repo_class.return_value = mock_repo_instance
 
     # Should auto-provision user instead of raising exception
     user = deps.get_current_user(db=mock_db, token=token)
 
     # Verify user was created
-    assert user is not None
-    assert user.email == "notfound@example.com"
-    mock_repo_instance.create.assert_called_once()
-    mock_db.commit.assert_called()
-    mock_db.refresh.assert_called_once_with(new_user)
+    assert user is new_user
+    mock_repo_instance.provision.assert_called_once()
+    mock_repo_instance.create.assert_not_called()
+    mock_db.commit.assert_called_once()
 
 
 # --------------------------
@@ -145,22 +139,28 @@ def test_get_current_user_auth0_updates_email_and_name(monkeypatch, mock_db):
         "auth0_sub": "auth0|abc123",
     }
 
-    with patch("app.api.deps.verify_auth0_token", return_value=auth0_payload):
+    with patch("app.api.deps.verify_token", return_value=auth0_payload):
         # existing user stored with auth0| prefixed email (legacy auto-provisioned)
         existing = MagicMock()
+        existing.id = 11
         existing.email = "auth0|abc123"
         existing.name = "auth0|abc123"
         existing.auth0_sub = None
 
         mock_repo = MagicMock()
+        mock_repo.get_by_auth0_sub.return_value = None
         mock_repo.get_by_email.return_value = existing
         with patch("app.api.deps.UserRepository", return_value=mock_repo):
             user = deps.get_current_user(db=mock_db, token=token)
 
-    assert user.email == "real@example.com"
-    assert user.name == "Real Name"
-    mock_db.commit.assert_called()
-    mock_db.refresh.assert_called_once_with(existing)
+    # Profile backfill is queued for the write-behind flush, not committed inline
+    assert user is existing
+    assert profile_writer.pending(11) == {
+        "email": "real@example.com",
+        "name": "Real Name",
+        "auth0_sub": "auth0|abc123",
+    }
+    mock_db.commit.assert_not_called()
 
 
 def test_get_current_user_auth0_improves_display_name(monkeypatch, mock_db):
@@ -175,21 +175,21 @@ def test_get_current_user_auth0_improves_display_name(monkeypatch, mock_db):
         "auth0_sub": "auth0|deadbeef",
     }
 
-    with patch("app.api.deps.verify_auth0_token", return_value=auth0_payload):
+    with patch("app.api.deps.verify_token", return_value=auth0_payload):
         existing = MagicMock()
+        existing.id = 12
         existing.email = "auth0|deadbeef"
         existing.name = "auth0|deadbeef"
         existing.auth0_sub = None
 
         mock_repo = MagicMock()
-        mock_repo.get_by_email.return_value = existing
+        mock_repo.get_by_auth0_sub.return_value = existing
         with patch("app.api.deps.UserRepository", return_value=mock_repo):
             user = deps.get_current_user(db=mock_db, token=token)
 
-    # Should have improved name (actual_name present), and committed/refreshed
-    assert user.name == "Nice Name"
-    mock_db.commit.assert_called()
-    mock_db.refresh.assert_called_once_with(existing)
+    # Should queue the improved name (actual_name present) without committing
+    assert profile_writer.pending(12) == {"name": "Nice Name", "auth0_sub": "auth0|deadbeef"}
+    mock_db.commit.assert_not_called()
 
 
 def test_get_current_user_adds_auth0_sub_when_missing(monkeypatch, mock_db):
@@ -204,20 +204,21 @@ def test_get_current_user_adds_auth0_sub_when_missing(monkeypatch, mock_db):
         "auth0_sub": "auth0|feedface",
     }
 
-    with patch("app.api.deps.verify_auth0_token", return_value=auth0_payload):
+    with patch("app.api.deps.verify_token", return_value=auth0_payload):
         existing = MagicMock()
+        existing.id = 13
         existing.email = "someone@example.com"
         existing.name = "Someone"
         existing.auth0_sub = None
 
         mock_repo = MagicMock()
+        mock_repo.get_by_auth0_sub.return_value = None
         mock_repo.get_by_email.return_value = existing
         with patch("app.api.deps.UserRepository", return_value=mock_repo):
-            user = deps.get_current_user(db=mock_db, token=token)
+            deps.get_current_user(db=mock_db, token=token)
 
-    assert user.auth0_sub == "auth0|feedface"
-    mock_db.commit.assert_called()
-    mock_db.refresh.assert_called_once_with(existing)
+    assert profile_writer.pending(13) == {"auth0_sub": "auth0|feedface"}
+    mock_db.commit.assert_not_called()
 
 
 def test_get_current_user_no_auth0_uses_hs256(monkeypatch, mock_db):
@@ -225,9 +226,9 @@ def test_get_current_user_no_auth0_uses_hs256(monkeypatch, mock_db):
     monkeypatch.setattr(deps.settings, "AUTH0_DOMAIN", "")
     monkeypatch.setattr(deps.settings, "AUTH0_AUDIENCE", "")
 
-    token = "hs256-token"
+    token = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.e30.sig"
 
-    with patch("app.api.deps.verify_hs256_token", return_value={"email": "local@example.com"}):
+    with patch.dict(deps.TOKEN_VERIFIERS, {"HS256": lambda t, h: {"email": "local@example.com"}}):
         user_inst = DummyUser()
         user_inst.email = "local@example.com"
         mock_repo = MagicMock()
@@ -263,9 +264,9 @@ def test_fetch_jwks_network_error(monkeypatch):
 
 
 # --------------------------
-# Test _get_rsa_key_from_jwks
+# Test _get_rsa_key
 # --------------------------
-def test_get_rsa_key_from_jwks_found(monkeypatch):
+def test_get_rsa_key_found(monkeypatch):
     token = "eyJhbGciOiJSUzI1NiIsImtpZCI6ImtleTEifQ.payload.signature"
     jwks = {
         "keys": [
@@ -278,51 +279,52 @@ def test_get_rsa_key_from_jwks_found(monkeypatch):
             }
         ]
     }
-    
-    with patch("app.api.deps.jwt.get_unverified_header", return_value={"kid": "key1"}):
-        with patch("app.api.deps.RSAAlgorithm.from_jwk") as mock_from_jwk:
-            mock_rsa_key = MagicMock()
-            mock_from_jwk.return_value = mock_rsa_key
-            result = deps._get_rsa_key_from_jwks(jwks, token)
-    
+
+    with patch("app.api.deps._fetch_jwks", return_value=jwks):
+        with patch("app.api.deps.jwt.get_unverified_header", return_value={"kid": "key1"}):
+            with patch("app.api.deps.RSAAlgorithm.from_jwk") as mock_from_jwk:
+                mock_rsa_key = MagicMock()
+                mock_from_jwk.return_value = mock_rsa_key
+                result = deps._get_rsa_key(token)
+
     assert result == mock_rsa_key
 
 
-def test_get_rsa_key_from_jwks_no_kid_in_token(monkeypatch):
+def test_get_rsa_key_no_kid_in_token(monkeypatch):
     token = "invalid.token.format"
-    jwks = {"keys": []}
-    
+
     with patch("app.api.deps.jwt.get_unverified_header", return_value={}):
         with pytest.raises(ValueError, match="No kid in token"):
-            deps._get_rsa_key_from_jwks(jwks, token)
+            deps._get_rsa_key(token)
 
 
-def test_get_rsa_key_from_jwks_invalid_token_header(monkeypatch):
+def test_get_rsa_key_invalid_token_header(monkeypatch):
     token = "invalid.token"
-    jwks = {"keys": []}
-    
+
     with patch("app.api.deps.jwt.get_unverified_header", side_effect=Exception("Bad header")):
         with pytest.raises(ValueError, match="Invalid token header"):
-            deps._get_rsa_key_from_jwks(jwks, token)
+            deps._get_rsa_key(token)
 
 
-def test_get_rsa_key_from_jwks_no_matching_key():
+def test_get_rsa_key_no_matching_key():
     token = "eyJhbGciOiJSUzI1NiIsImtpZCI6Im5vbWF0Y2gifQ.payload.signature"
     jwks = {"keys": [{"kid": "other_key", "kty": "RSA"}]}
-    
-    with patch("app.api.deps.jwt.get_unverified_header", return_value={"kid": "nomatch"}):
-        with pytest.raises(ValueError, match="No matching JWK"):
-            deps._get_rsa_key_from_jwks(jwks, token)
 
+    with patch("app.api.deps._fetch_jwks", return_value=jwks):
+        with patch("app.api.deps.RSAAlgorithm.from_jwk", return_value=MagicMock()):
+            with patch("app.api.deps.jwt.get_unverified_header", return_value={"kid": "nomatch"}):
+                assert deps._get_rsa_key(token) is None
 
-def test_get_rsa_key_from_jwks_jwk_parse_error():
+
+def test_get_rsa_key_jwk_parse_error():
     token = "eyJhbGciOiJSUzI1NiIsImtpZCI6ImJhZCJ9.payload.signature"
     jwks = {"keys": [{"kid": "bad", "kty": "INVALID"}]}
 
-    with patch("app.api.deps.jwt.get_unverified_header", return_value={"kid": "bad"}):
-        # Simulate RSAAlgorithm.from_jwk failing
-        with patch("app.api.deps.RSAAlgorithm.from_jwk", side_effect=Exception("Bad JWK")):
-            result = deps._get_rsa_key_from_jwks(jwks, token)
+    with patch("app.api.deps._fetch_jwks", return_value=jwks):
+        with patch("app.api.deps.jwt.get_unverified_header", return_value={"kid": "bad"}):
+            # Simulate RSAAlgorithm.from_jwk failing
+            with patch("app.api.deps.RSAAlgorithm.from_jwk", side_effect=Exception("Bad JWK")):
+                result = deps._get_rsa_key(token)
 
     assert result is None
 
@@ -413,38 +415,40 @@ def test_verify_hs256_token_decode_error(monkeypatch):
 # --------------------------
 # Test get_current_user edge cases and Auth0 fallback
 # --------------------------
-def test_get_current_user_auth0_fails_falls_back_to_hs256(monkeypatch, mock_db):
-    """Test that when Auth0 validation fails, we fall back to HS256"""
+def test_get_current_user_hs256_token_skips_auth0(monkeypatch, mock_db):
+    """HS256 tokens are routed straight to the HS256 verifier even when Auth0 is configured"""
     monkeypatch.setattr(deps.settings, "AUTH0_DOMAIN", "tenant.auth0.com")
     monkeypatch.setattr(deps.settings, "AUTH0_AUDIENCE", "audience")
-    
-    token = "some-token"
-    
-    with patch("app.api.deps.verify_auth0_token", side_effect=ValueError("Auth0 failed")):
-        with patch("app.api.deps.verify_hs256_token", return_value={"email": "fallback@example.com"}):
+    monkeypatch.setattr(deps.settings, "SECRET_KEY", "test-secret")
+
+    token = create_access_token("fallback@example.com", "test-secret", 5)
+    auth0_verifier = MagicMock(side_effect=AssertionError("Auth0 path must not run"))
+
+    with patch.dict(deps.TOKEN_VERIFIERS, {"RS256": auth0_verifier}):
+        with patch("app.api.deps._fetch_jwks", side_effect=AssertionError("JWKS must not be fetched")):
             user_inst = DummyUser()
             user_inst.email = "fallback@example.com"
             mock_repo = MagicMock()
             mock_repo.get_by_email.return_value = user_inst
-            
+
             with patch("app.api.deps.UserRepository", return_value=mock_repo):
                 user = deps.get_current_user(db=mock_db, token=token)
-    
+
     assert user.email == "fallback@example.com"
+    auth0_verifier.assert_not_called()
 
 
-def test_get_current_user_both_auth_methods_fail(monkeypatch, mock_db):
-    """Test that HTTPException is raised when both Auth0 and HS256 fail"""
+def test_get_current_user_verification_fails(monkeypatch, mock_db):
+    """Test that HTTPException is raised when the routed verifier rejects the token"""
     monkeypatch.setattr(deps.settings, "AUTH0_DOMAIN", "tenant.auth0.com")
     monkeypatch.setattr(deps.settings, "AUTH0_AUDIENCE", "audience")
-    
+
     token = "bad-token"
-    
-    with patch("app.api.deps.verify_auth0_token", side_effect=ValueError("Auth0 failed")):
-        with patch("app.api.deps.verify_hs256_token", side_effect=ValueError("HS256 failed")):
-            with pytest.raises(HTTPException) as exc:
-                deps.get_current_user(db=mock_db, token=token)
-    
+
+    with patch("app.api.deps.verify_token", side_effect=ValueError("Invalid token header")):
+        with pytest.raises(HTTPException) as exc:
+            deps.get_current_user(db=mock_db, token=token)
+
     assert exc.value.status_code == 401
 
 
@@ -455,22 +459,20 @@ def test_get_current_user_auto_provision_extracts_name_from_email(monkeypatch, m
     
     token = "token"
     
-    with patch("app.api.deps.verify_hs256_token", return_value={"email": "newuser@company.com"}):
+    with patch("app.api.deps.verify_token", return_value={"email": "newuser@company.com"}):
         new_user = DummyUser()
         new_user.email = "newuser@company.com"
         new_user.name = "newuser"
         
         mock_repo = MagicMock()
-        mock_repo.get_by_email.return_value = None  # Not found
-        mock_repo.create.return_value = new_user
+        mock_repo.get_by_email.side_effect = [None, new_user]  # Not found, then provisioned
         
         with patch("app.api.deps.UserRepository", return_value=mock_repo):
             user = deps.get_current_user(db=mock_db, token=token)
     
     # Name should be extracted from email (part before @)
-    assert mock_repo.create.called
-    call_args = mock_repo.create.call_args
-    assert "newuser" in str(call_args).lower() or call_args.kwargs.get("name") == "newuser"
+    assert mock_repo.provision.called
+    assert mock_repo.provision.call_args.kwargs["name"] == "newuser"
 
 
 def test_get_current_user_auto_provision_auth0_id_fallback(monkeypatch, mock_db):
@@ -486,19 +488,22 @@ def test_get_current_user_auto_provision_auth0_id_fallback(monkeypatch, mock_db)
         "auth0_sub": "auth0|abc123def456"
     }
     
-    with patch("app.api.deps.verify_auth0_token", return_value=auth0_payload):
+    with patch("app.api.deps.verify_token", return_value=auth0_payload):
         new_user = DummyUser()
         new_user.email = "auth0|abc123def456"
         
         mock_repo = MagicMock()
+        mock_repo.get_by_auth0_sub.side_effect = [None, new_user]
         mock_repo.get_by_email.return_value = None
-        mock_repo.create.return_value = new_user
         
         with patch("app.api.deps.UserRepository", return_value=mock_repo):
             user = deps.get_current_user(db=mock_db, token=token)
     
     # Should have created a user
-    assert mock_repo.create.called
+    assert user is new_user
+    call_kwargs = mock_repo.provision.call_args.kwargs
+    assert call_kwargs["name"] == "User_abc123de"
+    assert call_kwargs["auth0_sub"] == "auth0|abc123def456"
 
 
 def test_get_current_user_existing_user_email_update_from_auth0(monkeypatch, mock_db):
@@ -515,20 +520,22 @@ def test_get_current_user_existing_user_email_update_from_auth0(monkeypatch, moc
     }
     
     existing = DummyUser()
+    existing.id = 14
     existing.email = "auth0|oldid"
     existing.name = "auth0|oldid"
     existing.auth0_sub = None
     
-    with patch("app.api.deps.verify_auth0_token", return_value=auth0_payload):
+    with patch("app.api.deps.verify_token", return_value=auth0_payload):
         mock_repo = MagicMock()
+        mock_repo.get_by_auth0_sub.return_value = None
         mock_repo.get_by_email.return_value = existing
         
         with patch("app.api.deps.UserRepository", return_value=mock_repo):
             user = deps.get_current_user(db=mock_db, token=token)
     
-    # Should have updated existing user
-    assert mock_db.commit.called
-    assert mock_db.refresh.called
+    # Update is deferred to the write-behind queue
+    assert profile_writer.pending(14)["email"] == "user@example.com"
+    assert not mock_db.commit.called
 
 
 def test_require_any_role_multiple_roles_user_has_one():
@@ -545,4 +552,142 @@ def test_require_any_role_multiple_roles_user_has_none():
     dep = deps.require_any_role(UserRole.ADMIN, UserRole.ORGANIZER)
     with pytest.raises(HTTPException) as exc:
         dep(current_user=user)
-    assert exc.value.status_code == 403
\ No newline at end of file
+    assert exc.value.status_code == 403
+
+# --------------------------
+# Test verify_token dispatch and decode cache
+# --------------------------
+def test_verify_token_dispatches_by_alg(monkeypatch):
+    monkeypatch.setattr(deps.settings, "SECRET_KEY", "test-secret")
+    token = create_access_token("local@example.com", "test-secret", 5)
+    hs256 = MagicMock(return_value={"email": "local@example.com"})
+    rs256 = MagicMock()
+
+    with patch.dict(deps.TOKEN_VERIFIERS, {"HS256": hs256, "RS256": rs256}):
+        assert deps.verify_token(token) == {"email": "local@example.com"}
+
+    hs256.assert_called_once()
+    assert hs256.call_args.args[1]["alg"] == "HS256"
+    rs256.assert_not_called()
+
+
+def test_verify_token_rejects_unknown_alg():
+    token = "eyJhbGciOiJub25lIn0.e30."  # {"alg": "none"}
+    with pytest.raises(ValueError, match="Unsupported token algorithm"):
+        deps.verify_token(token)
+
+
+def test_verify_token_rejects_garbage():
+    with pytest.raises(ValueError, match="Invalid token header"):
+        deps.verify_token("not-a-jwt")
+
+
+def test_verify_token_caches_until_exp(monkeypatch):
+    monkeypatch.setattr(deps.settings, "SECRET_KEY", "test-secret")
+    token = create_access_token("cached@example.com", "test-secret", 5)
+
+    with patch("app.api.deps.jwt.get_unverified_header", wraps=deps.jwt.get_unverified_header) as header:
+        first = deps.verify_token(token)
+        second = deps.verify_token(token)
+
+    assert first == second == {"email": "cached@example.com"}
+    assert header.call_count == 1
+    assert deps.token_cache.stats()["hits"] == 1
+
+
+def test_verify_token_does_not_cache_failures(monkeypatch):
+    monkeypatch.setattr(deps.settings, "SECRET_KEY", "test-secret")
+    token = create_access_token("x@example.com", "other-secret", 5)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            deps.verify_token(token)
+    assert len(deps.token_cache) == 0
+
+
+# --------------------------
+# Test get_current_principal and the principal cache
+# --------------------------
+def _db_user(user_id=7, email="p@example.com", roles=(UserRole.ATTENDEE,)):
+    user = MagicMock()
+    user.id = user_id
+    user.email = email
+    user.name = "Pat"
+    user.auth0_sub = None
+    user.roles.return_value = set(roles)
+    return user
+
+
+def test_get_current_principal_loads_once_then_caches(mock_db):
+    mock_repo = MagicMock()
+    mock_repo.get_by_email.return_value = _db_user()
+
+    with patch("app.api.deps.verify_token", return_value={"email": "p@example.com"}):
+        with patch("app.api.deps.UserRepository", return_value=mock_repo):
+            first = deps.get_current_principal(db=mock_db, token="t")
+            second = deps.get_current_principal(db=mock_db, token="t")
+
+    assert first is second
+    assert first.id == 7
+    assert first.roles() == frozenset({UserRole.ATTENDEE})
+    mock_repo.get_by_email.assert_called_once()
+
+
+def test_invalidate_principal_forces_reload(mock_db):
+    mock_repo = MagicMock()
+    mock_repo.get_by_email.side_effect = [
+        _db_user(roles=(UserRole.ATTENDEE,)),
+        _db_user(roles=(UserRole.ATTENDEE, UserRole.ORGANIZER)),
+    ]
+
+    with patch("app.api.deps.verify_token", return_value={"email": "p@example.com"}):
+        with patch("app.api.deps.UserRepository", return_value=mock_repo):
+            before = deps.get_current_principal(db=mock_db, token="t")
+            deps.invalidate_principal(7)
+            after = deps.get_current_principal(db=mock_db, token="t")
+
+    assert not before.has_role(UserRole.ORGANIZER)
+    assert after.has_role(UserRole.ORGANIZER)
+    assert after.primary_role() == UserRole.ORGANIZER
+
+
+def test_require_any_role_accepts_principal():
+    principal = Principal(id=1, email="a@example.com", name="A", role_set=frozenset({UserRole.ADMIN}))
+    assert deps.require_any_role(UserRole.ADMIN)(current_user=principal) is principal
+    with pytest.raises(HTTPException):
+        deps.require_any_role(UserRole.ORGANIZER)(current_user=principal)
+
+
+def test_get_current_principal_reflects_queued_profile_update(mock_db):
+    stale = _db_user(email="auth0|abc123")
+    stale.name = "auth0|abc123"
+    mock_repo = MagicMock()
+    mock_repo.get_by_auth0_sub.return_value = stale
+    claims = {
+        "email": "real@example.com",
+        "actual_email": "real@example.com",
+        "actual_name": "Real Name",
+        "auth0_sub": "auth0|abc123",
+    }
+
+    with patch("app.api.deps.verify_token", return_value=claims):
+        with patch("app.api.deps.UserRepository", return_value=mock_repo):
+            principal = deps.get_current_principal(db=mock_db, token="t")
+
+    assert principal.email == "real@example.com"
+    assert principal.name == "Real Name"
+    assert principal.auth0_sub == "auth0|abc123"
+    assert profile_writer.stats()["queued_users"] == 1
+    mock_db.commit.assert_not_called()
+
+
+def test_get_current_principal_steady_state_queues_nothing(mock_db):
+    mock_repo = MagicMock()
+    mock_repo.get_by_email.return_value = _db_user()
+
+    with patch("app.api.deps.verify_token", return_value={"email": "p@example.com"}):
+        with patch("app.api.deps.UserRepository", return_value=mock_repo):
+            for _ in range(3):
+                deps.get_current_principal(db=mock_db, token="t")
+
+    assert profile_writer.stats()["deferred"] == 0
+    mock_db.commit.assert_not_called()
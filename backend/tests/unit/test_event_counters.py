@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update
+from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.user import User
+from app.repositories.attendance_repo import AttendanceRepository
+from app.repositories.event_member_repo import EventMemberRepository
+from app.services import event_counters
+
+
+def _event(db, token="counter-token"):
+    organizer = db.query(User).first()
+    now = datetime.now(timezone.utc)
+    event = Event(name="Counted", location="Hall", start_time=now, end_time=now + timedelta(hours=1),
+                  organizer_id=organizer.id, checkin_token=token)
+    db.add(event)
+    db.commit()
+    return event
+
+
+def _counts(db, event):
+    db.expire_all()
+    return event.attendance_count, event.member_count
+
+
+def test_writers_maintain_counters(db):
+    event = _event(db)
+    users = db.query(User).limit(3).all()
+    members = EventMemberRepository()
+    members.add_member(db, event.id, users[0].id)
+    members.add_member(db, event.id, users[1].id)
+    members.remove_member(db, event.id, users[0].id)
+    members.remove_member(db, event.id, users[0].id)  # already gone: no change
+
+    repo = AttendanceRepository()
+    assert repo.check_in(db, "counter-token", users[2].id, datetime.now(timezone.utc)).attendance_id is not None
+    repo.check_in(db, "counter-token", users[2].id, datetime.now(timezone.utc))  # duplicate
+    db.commit()
+    assert _counts(db, event) == (1, 1)
+
+
+def test_release_user_decrements_before_cascade(db):
+    event = _event(db)
+    user = db.query(User).filter(User.email == "martincs@wofford.edu").one()
+    EventMemberRepository().add_member(db, event.id, user.id)
+    AttendanceRepository().check_in(db, "counter-token", user.id, datetime.now(timezone.utc))
+    db.commit()
+    assert _counts(db, event) == (1, 1)
+
+    event_counters.release_user(db, user.id)
+    db.commit()
+    assert _counts(db, event) == (0, 0)
+
+
+def test_reconcile_fixes_only_drifted_rows(db):
+    event = _event(db)
+    other = _event(db, "other-token")
+    user = db.query(User).first()
+    db.add(Attendance(event_id=event.id, attendee_id=user.id, checked_in_at=datetime.now(timezone.utc)))
+    db.execute(update(Event).where(Event.id == other.id).values(member_count=7))
+    db.commit()
+
+    assert event_counters.reconcile(db) == 2
+    db.commit()
+    assert _counts(db, event) == (1, 0)
+    assert _counts(db, other) == (0, 0)
+    assert event_counters.reconcile(db) == 0
+
+
+def test_postgres_check_in_statement_bumps_counter(monkeypatch):
+    from sqlalchemy.dialects import postgresql
+
+    sql = str(AttendanceRepository()._check_in_statement("tok", 1, datetime.now(timezone.utc))
+              .compile(dialect=postgresql.dialect()))
+    assert "UPDATE events SET attendance_count=(events.attendance_count +" in sql
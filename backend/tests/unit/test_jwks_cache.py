@@ -0,0 +1,162 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from app.api import deps
+
+
+def _make_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_key, jwk
+
+
+@pytest.fixture
+def jwks_server(monkeypatch):
+    """Local HTTP stub standing in for the Auth0 JWKS endpoint."""
+    state = {"keys": [], "requests": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                state["requests"] += 1
+            body = json.dumps({"keys": state["keys"]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(deps.settings, "AUTH0_DOMAIN", "tenant.example.com")
+    monkeypatch.setattr(deps.settings, "AUTH0_AUDIENCE", "audience")
+    monkeypatch.setattr(deps.settings, "AUTH0_JWKS_URL", f"http://127.0.0.1:{server.server_port}/.well-known/jwks.json")
+    try:
+        yield state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _token(private_key, kid, sub="auth0|abc"):
+    return jwt.encode(
+        {"sub": sub, "email": "cached@example.com", "aud": "audience", "iss": "https://tenant.example.com/"},
+        private_key,
+        algorithm="RS256",
+        headers={"kid": kid},
+    )
+
+
+def test_jwks_fetched_once_then_served_from_cache(jwks_server):
+    private_key, jwk = _make_key("k1")
+    jwks_server["keys"] = [jwk]
+    token = _token(private_key, "k1")
+
+    for _ in range(5):
+        assert deps.verify_auth0_token(token)["email"] == "cached@example.com"
+
+    assert jwks_server["requests"] == 1
+    stats = deps.jwks_cache.stats()
+    assert stats["fetches"] == 1
+    assert stats["misses"] == 1
+    assert stats["hits"] == 4
+
+
+def test_unknown_kid_triggers_refetch(jwks_server, monkeypatch):
+    old_key, old_jwk = _make_key("old")
+    jwks_server["keys"] = [old_jwk]
+    deps.verify_auth0_token(_token(old_key, "old"))
+
+    # Tenant rotates keys; the new kid is unknown to the cache
+    new_key, new_jwk = _make_key("new")
+    jwks_server["keys"] = [old_jwk, new_jwk]
+    monkeypatch.setattr(deps.jwks_cache, "min_refresh_seconds", 0)
+    assert deps.verify_auth0_token(_token(new_key, "new"))["auth0_sub"] == "auth0|abc"
+    assert jwks_server["requests"] == 2
+
+
+def test_unknown_kid_refetch_is_rate_limited(jwks_server):
+    private_key, jwk = _make_key("k1")
+    jwks_server["keys"] = [jwk]
+    deps.verify_auth0_token(_token(private_key, "k1"))
+
+    for _ in range(3):
+        with pytest.raises(ValueError, match="No matching JWK"):
+            deps.verify_auth0_token(_token(private_key, "sprayed"))
+    assert jwks_server["requests"] == 1
+
+
+def test_ttl_expiry_refetches(jwks_server, monkeypatch):
+    private_key, jwk = _make_key("k1")
+    jwks_server["keys"] = [jwk]
+    token = _token(private_key, "k1")
+    deps.verify_auth0_token(token)
+
+    monkeypatch.setattr(deps.jwks_cache, "ttl_seconds", 0)
+    deps.verify_auth0_token(token)
+    assert jwks_server["requests"] == 2
+
+
+def test_concurrent_misses_single_flight(jwks_server):
+    private_key, jwk = _make_key("k1")
+    jwks_server["keys"] = [jwk]
+    token = _token(private_key, "k1")
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        results = list(pool.map(lambda _: deps.verify_auth0_token(token), range(40)))
+
+    assert all(r["email"] == "cached@example.com" for r in results)
+    assert jwks_server["requests"] == 1
+    assert deps.jwks_cache.stats()["fetches"] == 1
+
+
+def test_fetch_failure_serves_previous_keys(jwks_server, monkeypatch):
+    private_key, jwk = _make_key("k1")
+    jwks_server["keys"] = [jwk]
+    token = _token(private_key, "k1")
+    deps.verify_auth0_token(token)
+
+    monkeypatch.setattr(deps.jwks_cache, "ttl_seconds", 0)
+    monkeypatch.setattr(deps.settings, "AUTH0_JWKS_URL", "http://127.0.0.1:1/unreachable")
+    assert deps.verify_auth0_token(token)["email"] == "cached@example.com"
+
+
+def test_fetch_failure_backs_off_after_expiry(jwks_server, monkeypatch):
+    private_key, jwk = _make_key("k1")
+    jwks_server["keys"] = [jwk]
+    token = _token(private_key, "k1")
+    deps.verify_auth0_token(token)
+
+    # Keys expired and the tenant is down: one failed fetch, then stale keys without refetching
+    calls = []
+
+    def failing_fetch():
+        calls.append(1)
+        raise ValueError("JWKS fetch failed")
+
+    monkeypatch.setattr(deps.jwks_cache, "ttl_seconds", 0)
+    monkeypatch.setattr(deps, "_fetch_jwks", failing_fetch)
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(lambda _: deps.verify_auth0_token(token), range(20)))
+
+    assert all(r["email"] == "cached@example.com" for r in results)
+    assert len(calls) == 1
+    assert deps.jwks_cache.stats()["failures"] == 1
+
+    # Once the back-off passes the tenant is tried again
+    monkeypatch.setattr(deps.jwks_cache, "min_refresh_seconds", 0)
+    deps.verify_auth0_token(token)
+    assert len(calls) == 2
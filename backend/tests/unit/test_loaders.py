@@ -0,0 +1,45 @@
+from app.models.user import User
+from app.repositories.loaders import BatchLoader, Loaders
+
+
+def _batched(statements):
+    # User rows bring their role assignments along with a selectin query
+    return [s for s in statements if "FROM user_roles" not in s]
+
+
+def test_loads_are_batched_into_one_query(db, count_queries):
+    user_ids = [u.id for u in db.query(User).limit(4).all()]
+    db.expire_all()
+
+    loaders = Loaders(db)
+    with count_queries() as statements:
+        users = loaders.users.load_many(user_ids + user_ids[:1])
+        assert statements == []
+        assert [d.value.id for d in users] == user_ids + user_ids[:1]
+    assert len(_batched(statements)) == 1
+
+    with count_queries() as statements:
+        assert loaders.users.load(user_ids[0]).value is loaders.users.get(user_ids[0])
+    assert _batched(statements) == []  # memoized
+    assert loaders.users.batches == 1
+
+
+def test_missing_keys_resolve_to_default(db):
+    loaders = Loaders(db)
+    assert loaders.users.load(999999).value is None
+    assert BatchLoader(db, lambda db, keys: {}, 0).get(999999) == 0
+
+
+def test_primed_keys_are_not_queried(db):
+    calls = []
+
+    def batch(db, keys):
+        calls.append(keys)
+        return {k: k * 10 for k in keys}
+
+    loader = BatchLoader(db, batch)
+    loader.prime(1, "cached")
+    one, two, three = loader.load_many([1, 2, 3])
+    assert (one.value, two.value, three.value) == ("cached", 20, 30)
+    assert calls == [[2, 3]]
+    assert loader.batches == 1
@@ -0,0 +1,59 @@
+from app.models.user import User
+from app.services.profile_writer import ProfileWriteBehind
+from tests.conftest import TestingSessionLocal
+
+
+def test_submit_coalesces_per_user():
+    writer = ProfileWriteBehind(TestingSessionLocal, flush_interval=60)
+    writer.submit(1, {"name": "A"})
+    writer.submit(1, {"email": "a@example.com"})
+    writer.submit(2, {"name": "B"})
+    writer.submit(3, {})  # nothing to write
+
+    assert writer.pending(1) == {"name": "A", "email": "a@example.com"}
+    stats = writer.stats()
+    assert stats["queued_users"] == 2
+    assert stats["deferred"] == 3
+    assert stats["coalesced"] == 1
+
+
+def test_flush_writes_rows(db):
+    user = db.query(User).filter_by(email="martincs@wofford.edu").first()
+    writer = ProfileWriteBehind(TestingSessionLocal, flush_interval=60)
+    writer.submit(user.id, {"name": "Collin M."})
+    writer.submit(user.id, {"auth0_sub": "auth0|collin"})
+
+    assert writer.flush() == 1
+    db.expire_all()
+    refreshed = db.get(User, user.id)
+    assert refreshed.name == "Collin M."
+    assert refreshed.auth0_sub == "auth0|collin"
+    assert writer.stats()["queued_users"] == 0
+    assert writer.stats()["written"] == 1
+    assert writer.flush() == 0
+
+
+def test_flush_isolates_failing_rows(db):
+    users = db.query(User).order_by(User.id).limit(2).all()
+    writer = ProfileWriteBehind(TestingSessionLocal, flush_interval=60)
+    # Taking another account's email violates the unique constraint
+    writer.submit(users[0].id, {"email": users[1].email})
+    writer.submit(users[1].id, {"name": "Renamed"})
+
+    assert writer.flush() == 1
+    stats = writer.stats()
+    assert stats["failed"] == 1
+    assert stats["written"] == 1
+    db.expire_all()
+    assert db.get(User, users[1].id).name == "Renamed"
+
+
+def test_stop_flushes_remaining(db):
+    user = db.query(User).filter_by(email="gammahja@wofford.edu").first()
+    writer = ProfileWriteBehind(TestingSessionLocal, flush_interval=0.05)
+    writer.start()
+    writer.submit(user.id, {"name": "Joel G."})
+    writer.stop()
+
+    db.expire_all()
+    assert db.get(User, user.id).name == "Joel G."
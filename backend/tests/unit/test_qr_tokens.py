@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+from app.core import qr_tokens
+
+SECRET = "qr-test-secret"
+ROTATION = 30
+NOW = datetime(2025, 3, 1, 15, 0, 10, tzinfo=timezone.utc)
+
+
+def _issue(now=NOW, secret=SECRET):
+    return qr_tokens.issue(7, NOW - timedelta(minutes=15), NOW + timedelta(hours=1), now, secret, ROTATION)
+
+
+def test_issue_and_decode_round_trip():
+    token, expires_at = _issue()
+    assert qr_tokens.is_signed(token)
+    claims = qr_tokens.decode(token, SECRET)
+    assert claims.event_id == 7
+    assert claims.epoch == int(NOW.timestamp()) // ROTATION
+    assert claims.is_current(NOW, ROTATION)
+    assert claims.is_open(NOW)
+    # Accepted for the rest of this epoch and the next one
+    assert expires_at == datetime.fromtimestamp((claims.epoch + 2) * ROTATION, timezone.utc)
+
+
+def test_static_tokens_are_not_signed():
+    assert not qr_tokens.is_signed("Zq3x_Kd9-f2bL1mN0pQrSg")
+
+
+def test_tampered_or_foreign_tokens_do_not_decode():
+    token, _ = _issue()
+    payload, _, signature = token.rpartition(".")
+    # Point the token at another event while keeping the signature
+    forged = payload.replace("q1.7.", "q1.8.", 1) + "." + signature
+    assert qr_tokens.decode(forged, SECRET) is None
+    assert qr_tokens.decode(token, "another-secret") is None
+    assert qr_tokens.decode("q1.garbage", SECRET) is None
+    assert qr_tokens.decode("q1.", SECRET) is None
+    # Junk scans with non-ASCII characters are rejected, not a TypeError
+    assert qr_tokens.decode(payload + ".é" + signature[1:], SECRET) is None
+    assert qr_tokens.decode(payload.replace("q1.7.", "q1.7é.", 1) + "." + signature, SECRET) is None
+
+
+def test_rotation_window():
+    token, _ = _issue()
+    claims = qr_tokens.decode(token, SECRET)
+    # The previous epoch is still accepted to cover a scan racing the rotation
+    assert claims.is_current(NOW + timedelta(seconds=ROTATION), ROTATION)
+    assert not claims.is_current(NOW + timedelta(seconds=2 * ROTATION), ROTATION)
+    # Tokens from the future are not accepted either
+    assert not claims.is_current(NOW - timedelta(seconds=ROTATION), ROTATION)
+
+
+def test_embedded_window_bounds():
+    token, _ = _issue()
+    claims = qr_tokens.decode(token, SECRET)
+    assert not claims.is_open(NOW - timedelta(minutes=16))
+    assert not claims.is_open(NOW + timedelta(hours=1, seconds=1))
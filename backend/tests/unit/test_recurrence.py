@@ -0,0 +1,81 @@
+from datetime import date, datetime, time, timedelta, timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+import pytest
+from app.services.recurrence import (
+    RecurrenceEngine, RecurrenceRule, parse_exclusions, parse_weekdays, series_occurrences,
+)
+
+NY = ZoneInfo("America/New_York")
+
+
+def _walk(rule: RecurrenceRule) -> list[date]:
+    """Reference: test every calendar day"""
+    out, day = [], rule.start
+    week0 = rule.start - timedelta(days=rule.start.weekday())
+    while day <= rule.until:
+        week = (day - week0).days // 7
+        excluded = any(a <= day <= b for a, b in rule.exclusions)
+        if day.weekday() in rule.weekdays and week % rule.interval == 0 and not excluded:
+            out.append(day)
+        day += timedelta(days=1)
+    return out
+
+
+@pytest.mark.parametrize("weekdays,interval,start", [
+    ((0, 2, 4), 1, date(2026, 1, 7)),   # starts mid-week
+    ((1,), 2, date(2026, 1, 6)),         # every other Tuesday
+    ((5, 6), 3, date(2026, 2, 28)),
+    ((0, 1, 2, 3, 4, 5, 6), 1, date(2027, 12, 30)),
+])
+def test_matches_day_by_day_walk(weekdays, interval, start):
+    exclusions = parse_exclusions(["2026-03-09/2026-03-13", "2026-11-26", "2028-01-01/2028-01-03"])
+    rule = RecurrenceRule(weekdays, start, start + timedelta(days=3 * 365), interval, exclusions)
+    assert list(RecurrenceEngine(16).dates(rule)) == _walk(rule)
+
+
+def test_exclusions_and_parsing():
+    assert parse_weekdays(["Wed", "Monday", "Mon"]) == (0, 2)
+    with pytest.raises(KeyError):
+        parse_weekdays(["Funday"])
+    with pytest.raises(ValueError):
+        parse_exclusions(["2026-03-13/2026-03-09"])
+    # Overlapping and adjacent ranges are merged
+    rule = RecurrenceRule((0, 1, 2, 3, 4), date(2026, 3, 2), date(2026, 3, 20), 1,
+                          parse_exclusions(["2026-03-09/2026-03-11", "2026-03-10/2026-03-12", "2026-03-13"]))
+    dates = RecurrenceEngine(4).dates(rule)
+    assert date(2026, 3, 6) in dates and date(2026, 3, 16) in dates
+    assert not [d for d in dates if date(2026, 3, 9) <= d <= date(2026, 3, 13)]
+    assert RecurrenceEngine(4).dates(RecurrenceRule((0,), date(2026, 3, 2), date(2026, 3, 1))) == ()
+
+
+def test_expansions_are_memoized():
+    engine = RecurrenceEngine(4)
+    rule = RecurrenceRule((0, 3), date(2026, 1, 1), date(2030, 1, 1))
+    assert engine.dates(rule) is engine.dates(RecurrenceRule((0, 3), date(2026, 1, 1), date(2030, 1, 1)))
+    assert engine.stats()["hits"] == 1 and engine.stats()["misses"] == 1
+
+
+def test_occurrences_keep_local_time_across_dst():
+    engine = RecurrenceEngine(4)
+    rule = RecurrenceRule((6,), date(2026, 3, 1), date(2026, 3, 15))  # DST starts 2026-03-08
+    occurrences = engine.occurrences(rule, time(9, 30), time(10, 30), NY)
+    assert [s.astimezone(NY).time() for s, _ in occurrences] == [time(9, 30)] * 3
+    assert [s.hour for s, _ in occurrences] == [14, 13, 13]
+    assert all(s.tzinfo is timezone.utc and e - s == timedelta(hours=1) for s, e in occurrences)
+
+
+def test_series_occurrences_from_parent_event():
+    parent = SimpleNamespace(
+        start_time=datetime(2026, 3, 2, 14, 0),  # Monday 9:00 New York, naive UTC as SQLite returns it
+        end_time=datetime(2026, 3, 2, 15, 0),
+        end_date=datetime(2026, 3, 31, 14, 0, tzinfo=timezone.utc),
+        weekdays=["Mon", "Wed"],
+        recurrence_timezone="America/New_York",
+        recurrence_interval=2,
+        recurrence_exclusions=["2026-03-16/2026-03-20"],
+    )
+    starts = [s.astimezone(NY) for s, _ in series_occurrences(parent)]
+    assert [s.date() for s in starts] == [date(2026, 3, 4), date(2026, 3, 30)]
+    assert {s.hour for s in starts} == {9}
+    assert [s.date() for s, _ in series_occurrences(parent, datetime(2026, 3, 10, tzinfo=timezone.utc))] == [date(2026, 3, 4)]
@@ -112,4 +112,87 @@ class TestAttendanceRepository:
         assert len(attendances) == 1
         assert isinstance(attendances[0], Attendance)
         assert attendances[0].event is not None
-        assert attendances[0].event.id == event.id
\ No newline at end of file
+        assert attendances[0].event.id == event.id
+    def test_check_in_statuses(self, db: Session, repo):
+        from datetime import timedelta
+        from app.repositories.attendance_repo import CheckInStatus
+
+        user = User(email="checkin@example.com", name="Checker", password_hash="dummy")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+
+        now = datetime.now(timezone.utc)
+        event = Event(
+            name="Window Event",
+            location="Test Location",
+            start_time=now + timedelta(minutes=5),
+            end_time=now + timedelta(hours=1),
+            checkin_open_minutes=15,
+            organizer_id=user.id,
+            checkin_token="window-token"
+        )
+        db.add(event)
+        db.commit()
+        db.refresh(event)
+
+        assert repo.check_in(db, "missing-token", user.id, now).status is CheckInStatus.NOT_FOUND
+        assert repo.check_in(db, "window-token", user.id, now - timedelta(hours=1)).status is CheckInStatus.NOT_OPEN
+
+        first = repo.check_in(db, "window-token", user.id, now)
+        assert first.status is CheckInStatus.CHECKED_IN
+        assert first.event_id == event.id
+        assert first.event_name == "Window Event"
+        assert first.attendance_id is not None
+
+        again = repo.check_in(db, "window-token", user.id, now)
+        assert again.status is CheckInStatus.DUPLICATE
+        assert again.attendance_id is None
+        db.commit()
+        assert repo.count_for_event(db, event.id) == 1
+
+    def test_check_in_statement_is_single_upsert_on_postgres(self, repo):
+        from sqlalchemy.dialects import postgresql
+
+        sql = str(repo._check_in_statement("tok", 1, datetime.now(timezone.utc)).compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (event_id, attendee_id) DO NOTHING" in sql
+        assert "RETURNING attendances.id" in sql
+        assert sql.count("INSERT INTO") == 1
+
+    def test_check_in_answers_from_token_index_without_db(self, repo):
+        from datetime import timedelta
+        from unittest.mock import MagicMock
+        from app.repositories.attendance_repo import CheckInStatus
+        from app.services.token_index import token_index, TokenWindow
+
+        now = datetime.now(timezone.utc)
+        token_index.put("ended", TokenWindow(1, "Ended", now - timedelta(hours=2), now - timedelta(hours=1)))
+        token_index.put_unknown("bogus")
+        db = MagicMock()
+
+        assert repo.check_in(db, "ended", 5, now).status is CheckInStatus.NOT_OPEN
+        assert repo.check_in(db, "bogus", 5, now).status is CheckInStatus.NOT_FOUND
+        db.execute.assert_not_called()
+
+    def test_stream_snapshot_resumes_after_id(self, db: Session, repo):
+        users = [User(email=f"stream{i}@example.com", name=f"Streamer {i}", password_hash="dummy") for i in range(3)]
+        db.add_all(users)
+        db.commit()
+        now = datetime.now(timezone.utc)
+        event = Event(name="Streamed", location="Hall", start_time=now, end_time=now,
+                      organizer_id=users[0].id, checkin_token="stream-token")
+        db.add(event)
+        db.commit()
+        rows = [Attendance(event_id=event.id, attendee_id=u.id, checked_in_at=now) for u in users]
+        db.add_all(rows)
+        db.commit()
+
+        ids = {r.id for r in rows}
+        count, last_id, counted, backlog = repo.stream_snapshot(db, event.id, None)
+        assert (count, last_id, counted, backlog) == (3, rows[2].id, ids, [])
+
+        count, last_id, counted, backlog = repo.stream_snapshot(db, event.id, rows[0].id)
+        assert count == 1
+        assert last_id == rows[0].id
+        assert counted == ids
+        assert [(r.id, r.name) for r in backlog] == [(rows[1].id, "Streamer 1"), (rows[2].id, "Streamer 2")]
@@ -185,3 +185,44 @@ class TestEventMemberRepository:
         assert len(members) == 2
         assert any(m.user_id == user1.id for m in members)
         assert any(m.user_id == user2.id for m in members)
+
+    def test_member_attendance_for_series(self, db: Session, repo, users_and_event):
+        user1, user2, user3, parent = users_and_event
+        children = [
+            Event(name="Child", location="Location", start_time=datetime.now(timezone.utc),
+                  end_time=datetime.now(timezone.utc), organizer_id=user3.id,
+                  checkin_token=f"child_{i}", parent_id=parent.id)
+            for i in range(2)
+        ]
+        other = Event(name="Other", location="Location", start_time=datetime.now(timezone.utc),
+                      end_time=datetime.now(timezone.utc), organizer_id=user3.id, checkin_token="other")
+        db.add_all(children + [other])
+        db.commit()
+        repo.add_member(db, parent.id, user1.id)
+        repo.add_member(db, parent.id, user2.id)
+        now = datetime.now(timezone.utc)
+        db.add_all([
+            Attendance(event_id=parent.id, attendee_id=user1.id, checked_in_at=now),
+            Attendance(event_id=children[0].id, attendee_id=user1.id, checked_in_at=now),
+            Attendance(event_id=other.id, attendee_id=user2.id, checked_in_at=now),
+        ])
+        db.commit()
+        parent_id = parent.id
+        db.expunge_all()
+
+        rows = repo.member_attendance_for_series(db, parent_id)
+        counts = {m.user.email: attended for m, attended in rows}
+        assert counts == {"user1@test.com": 2, "user2@test.com": 0}
+
+    def test_add_members_bulk(self, db: Session, repo, users_and_event):
+        user1, user2, user3, event = users_and_event
+        repo.add_member(db, event.id, user1.id)
+        db.commit()
+
+        added = repo.add_members(db, event.id, [user1.id, user2.id, user3.id, user2.id])
+        db.commit()
+        assert sorted(added) == sorted([user2.id, user3.id])
+        assert {m.user_id for m in repo.list_members(db, event.id)} == {user1.id, user2.id, user3.id}
+        db.refresh(event)
+        assert event.member_count == 3
+        assert repo.add_members(db, event.id, []) == []
@@ -67,3 +67,19 @@ class TestUserRepository:
         assert repo.delete(db, user.id) is True
         assert repo.delete(db, 999999) is False
 
+
+    def test_provision_creates_user_with_attendee_role(self, db, repo):
+        user_id = repo.provision(db, email="fresh@example.com", name="fresh", auth0_sub="auth0|fresh")
+        db.commit()
+        assert user_id is not None
+        user = repo.get_by_auth0_sub(db, "auth0|fresh")
+        assert user.id == user_id
+        assert user.roles() == {UserRole.ATTENDEE}
+
+    def test_provision_conflict_is_noop(self, db, repo, create_user):
+        user = create_user(email="taken@example.com")
+        assert repo.provision(db, email="taken@example.com", name="dup") is None
+        db.commit()
+        assert len([u for u in repo.list(db, limit=1000) if u.email == "taken@example.com"]) == 1
+        db.refresh(user)
+        assert user.name == "Test User"
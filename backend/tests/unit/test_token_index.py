@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+import pytest
+from app.models.event import Event
+from app.models.user import User
+from app.services.token_index import CheckInTokenIndex, TokenWindow, UNKNOWN_TOKEN
+
+
+@pytest.fixture
+def index():
+    return CheckInTokenIndex(maxsize=100, ttl_seconds=300, negative_size=100, negative_ttl_seconds=60)
+
+
+@pytest.fixture
+def make_event(db):
+    organizer = db.query(User).first()
+
+    def _make(token, start_in=timedelta(minutes=5), length=timedelta(hours=1)):
+        start = datetime.now(timezone.utc) + start_in
+        event = Event(
+            name=f"Event {token}",
+            location="Hall",
+            start_time=start,
+            end_time=start + length,
+            checkin_open_minutes=15,
+            organizer_id=organizer.id,
+            checkin_token=token,
+        )
+        db.add(event)
+        db.commit()
+        db.refresh(event)
+        return event
+    return _make
+
+
+def test_lookup_loads_once_then_hits(db, index, make_event):
+    event = make_event("tok-a")
+    window = index.lookup(db, "tok-a")
+    assert window.event_id == event.id
+    assert window.name == "Event tok-a"
+    assert window.closes_at - window.opens_at == timedelta(hours=1, minutes=15)
+
+    # Second lookup is answered from memory
+    assert index.lookup(MagicMock(), "tok-a") == window
+    stats = index.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_unknown_tokens_are_negatively_cached(db, index):
+    assert index.lookup(db, "garbage") is None
+    no_db = MagicMock()
+    assert index.lookup(no_db, "garbage") is None
+    no_db.execute.assert_not_called()
+    assert index.get("garbage") is UNKNOWN_TOKEN
+    assert index.stats()["negative_hits"] == 2
+
+
+def test_preload_indexes_upcoming_window_only(db, index, make_event):
+    soon = make_event("soon", start_in=timedelta(hours=2))
+    make_event("later", start_in=timedelta(days=3))
+    make_event("over", start_in=timedelta(hours=-3))
+
+    assert index.preload(db, hours=24) == 1
+    assert index.get("soon").event_id == soon.id
+    assert index.get("later") is None
+    assert index.get("over") is None
+
+
+def test_lru_eviction_bounds_size(db, make_event):
+    index = CheckInTokenIndex(maxsize=2, ttl_seconds=300, negative_size=10, negative_ttl_seconds=60)
+    for token in ("t1", "t2", "t3"):
+        make_event(token)
+        index.lookup(db, token)
+    stats = index.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert index.get("t1") is None
+
+
+def test_invalidate_by_event_id(index):
+    now = datetime.now(timezone.utc)
+    index.put("x", TokenWindow(7, "X", now, now + timedelta(hours=1)))
+    index.put("y", TokenWindow(8, "Y", now, now + timedelta(hours=1)))
+    index.invalidate(event_ids=[7])
+    assert index.get("x") is None
+    assert index.get("y").event_id == 8
+
+
+def test_put_clears_negative_entry(index):
+    now = datetime.now(timezone.utc)
+    index.put_unknown("late")
+    index.put("late", TokenWindow(1, "Late", now, now + timedelta(hours=1)))
+    assert index.get("late").event_id == 1
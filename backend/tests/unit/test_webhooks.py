@@ -101,3 +101,30 @@ def test_auth0_user_deleted_delete_raises_and_rolls_back(monkeypatch):
 
     assert exc.value.status_code == 500
     mock_db.rollback.assert_called_once()
+
+
+def test_auth0_user_deleted_releases_event_counters(db):
+    from datetime import datetime, timedelta, timezone
+    from app.models.event import Event
+    from app.models.user import User
+    from app.repositories.attendance_repo import AttendanceRepository
+    from app.repositories.event_member_repo import EventMemberRepository
+
+    organizer = db.query(User).filter(User.email == "grayj@wofford.edu").one()
+    user = db.query(User).filter(User.email == "martincs@wofford.edu").one()
+    user.auth0_sub = "auth0|martincs"
+    now = datetime.now(timezone.utc)
+    event = Event(name="Counted", location="Hall", start_time=now, end_time=now + timedelta(hours=1),
+                  organizer_id=organizer.id, checkin_token="webhook-token")
+    db.add(event)
+    db.commit()
+    EventMemberRepository().add_member(db, event.id, user.id)
+    AttendanceRepository().check_in(db, "webhook-token", user.id, now)
+    db.commit()
+
+    payload = webhooks.Auth0UserDeletedPayload(auth0_sub="auth0|martincs")
+    result = asyncio.run(webhooks.auth0_user_deleted(payload, MagicMock(), db=db))
+
+    assert result["status"] == "success"
+    db.expire_all()
+    assert (event.attendance_count, event.member_count) == (0, 0)
@@ -8,7 +8,7 @@ export function setTokenProvider(fn: (() => Promise<string | null>) | null) {
   tokenProvider = fn
 }
 
-export async function fetchJson<T>(path: string, opts: RequestInit = {}): Promise<T> {
+async function request(path: string, opts: RequestInit = {}): Promise<Response> {
   // attempt to obtain token from provider first
   let token: string | null = null
   
@@ -39,6 +39,17 @@ export async function fetchJson<T>(path: string, opts: RequestInit = {}): Promis
     console.debug('[client] response body on error:', msg)
     throw new Error(msg || res.statusText)
   }
+  return res
+}
+
+export async function fetchJson<T>(path: string, opts: RequestInit = {}): Promise<T> {
+  const res = await request(path, opts)
   const contentType = res.headers.get('content-type') || ''
   return contentType.includes('application/json') ? res.json() : (await res.text() as any)
 }
+
+// One page of a cursor-paged listing; nextCursor is null on the last page
+export async function fetchPage<T>(path: string, opts: RequestInit = {}): Promise<{ items: T[]; nextCursor: string | null }> {
+  const res = await request(path, opts)
+  return { items: await res.json(), nextCursor: res.headers.get('X-Next-Cursor') }
+}
@@ -1,4 +1,4 @@
-import { fetchJson } from './client'
+import { fetchJson, fetchPage } from './client'
 import type { DashboardEventsResponse, EventOut, EventFamilyResponse } from '../types'
 
 
@@ -21,8 +21,17 @@ export async function getEventFamily(parentId: number): Promise<EventFamilyRespo
 
 
 
+// The admin listing is paged; follow X-Next-Cursor until the last page
 export async function getAllEvents(): Promise<EventOut[]> {
-  return fetchJson<EventOut[]>('/v1/events/');
+  const events: EventOut[] = [];
+  let cursor: string | null = null;
+  do {
+    const query: string = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+    const page: { items: EventOut[]; nextCursor: string | null } = await fetchPage<EventOut>(`/v1/events/?limit=500${query}`);
+    events.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return events;
 }
 export async function getByToken(token: string): Promise<EventOut> { return fetchJson(`/v1/events/by-token/${token}`) }
 // Check-in to event using token is probably not being used
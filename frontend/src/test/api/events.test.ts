@@ -90,6 +90,16 @@ describe('Events API functions', () => {
         expect(result).toEqual(mockEvents)
     })
 
+    it('follows the cursor across pages of all events', async () => {
+        const firstPage = { ...createMockResponse([{ id: 3 }, { id: 2 }]), headers: new Headers({ 'content-type': 'application/json', 'X-Next-Cursor': 'abc=' }) }
+        mockFetch.mockResolvedValueOnce(firstPage)
+        mockFetch.mockResolvedValueOnce(createMockResponse([{ id: 1 }]))
+
+        const result = await getAllEvents()
+        expect(result).toEqual([{ id: 3 }, { id: 2 }, { id: 1 }])
+        expect(mockFetch).toHaveBeenLastCalledWith(expect.stringContaining('/v1/events/?limit=500&cursor=abc%3D'), expect.anything())
+    })
+
     it('fetches event by token successfully', async () => {
         const mockEvent = { id: 1, name: 'Event by Token' }
         mockFetch.mockResolvedValueOnce(createMockResponse(mockEvent))